@@ -0,0 +1,588 @@
+# builds/benchmark.py
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from components.models import Manufacturer, Stock
+from components.resolver import COMPONENT_MODELS, component_name_expression
+from components.stock_index import StockIndex, stock_index
+from components.versioning import touch_components
+from fps_data.models import FPSData
+from fps_data.prediction import FPSPredictor, fps_predictor
+from games.models import Game
+from .factories import (
+    FIXTURES_DIR,
+    PROJECT_DIR,
+    TRACK_PREFIX,
+    FPSDataFactory,
+    GameFactory,
+    OrderFactory,
+    OrderItemFactory,
+    StockFactory,
+    UserFactory,
+    benchmark_image,
+    component_factory,
+    fake,
+    load_prototypes,
+)
+from .models import Build, Order, OrderItem, ReturnRequest
+
+DEFAULT_COMPONENTS = 10000  # Компонентов в каталоге (поровну на тип).
+DEFAULT_USERS = 5000  # Покупателей.
+DEFAULT_GAMES = 50  # Игр.
+DEFAULT_ORDERS = 1000000  # Заказов.
+DEFAULT_FPS_ROWS = 200000  # Замеров FPS.
+DEFAULT_REPEAT = 5  # Повторов каждого URL после первого («холодного») запроса.
+DEFAULT_THRESHOLD = 0.2  # Допустимый рост p50 при сравнении запусков (доля).
+
+BATCH_SIZE = 5000  # Размер пакета bulk_create.
+ITEMS_PER_ORDER = (1, 4)  # Число позиций в заказе (от, до).
+MEASURED_COMPONENTS = 300  # Процессоров и видеокарт с замерами FPS: замеряют популярное железо, а не весь каталог.
+BENCHMARK_BUILDS = 20  # Сборок пользователя, от имени которого выполняются запросы.
+BENCHMARK_STAFF = 'bench_staff'  # Сотрудник, от имени которого выполняются запросы.
+SETTINGS_FACTORS = {'low': 1.6, 'medium': 1.25, 'high': 1.0, 'ultra': 0.75}  # Множитель FPS настроек графики.
+
+BENCHMARK_DATABASE_SETTING = 'BENCHMARK_DATABASE'  # Настройка True: база по умолчанию - отдельная база для замеров.
+BENCHMARK_NAMESPACES = ('components', 'builds', 'games', 'users')  # Приложения, URL которых измеряются.
+UNSAFE_URLS = {
+    'users:logout',
+    'components:replenish_stock_item',
+    'components:reduce_stock_item',
+    'builds:remove_from_cart',
+    'builds:employee_order_complete',
+}  # GET запросы, которые меняют данные: не измеряются.
+
+
+def _bulk(model, objects):
+    """bulk_create пакетами BATCH_SIZE: сигналы post_save не вызываются, производные данные пересчитываются отдельно."""
+    return model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+
+
+class BenchmarkDatabaseError(Exception):
+    """База по умолчанию не отмечена как база для замеров."""
+
+
+def ensure_benchmark_database(confirmed=False):
+    """
+    Проверяет, что замеры не пишут в рабочую базу.
+
+    Заполнение и замеры создают миллион заказов, пересчитывают производные
+    таблицы и заводят сотрудника-суперпользователя, поэтому запускаются только
+    с отдельными настройками (BENCHMARK_DATABASE = True) или в режиме DEBUG
+    с явным подтверждением (confirmed, флаг --yes команд).
+    """
+    if getattr(settings, BENCHMARK_DATABASE_SETTING, False):
+        return
+    if settings.DEBUG and confirmed:
+        return
+    raise BenchmarkDatabaseError(
+        f"База {settings.DATABASES['default'].get('NAME')!r} не отмечена как база для замеров. "
+        f"Запустите с настройками, где {BENCHMARK_DATABASE_SETTING} = True, "
+        "или при DEBUG = True с флагом --yes."
+    )
+
+
+def _chunks(total, size=BATCH_SIZE):
+    """Размеры пакетов, в сумме дающие total."""
+    while total > 0:
+        yield min(size, total)
+        total -= size
+
+
+def _log(stdout, message):
+    if stdout is not None:
+        stdout.write(message)
+
+
+def load_fixtures(stdout=None):
+    """
+    Загружает производителей и компоненты из фикстур; ошибки отдельных файлов
+    не прерывают загрузку. Компоненты фикстур без изображения получают имя-заглушку,
+    как и сгенерированные: иначе шаблоны списков падают на image.url.
+    """
+    for path in [PROJECT_DIR / 'manufacturers.json', *sorted(FIXTURES_DIR.glob('*.json'))]:
+        try:
+            call_command('loaddata', str(path), verbosity=0)
+        except Exception as error:
+            _log(stdout, f'Фикстура {path.name} не загружена: {error}')
+    for model in COMPONENT_MODELS.values():
+        model.objects.filter(Q(image='') | Q(image__isnull=True)).update(image=benchmark_image(model))
+
+
+def seed_catalog(total, stdout=None):
+    """
+    Компоненты по прототипам из фикстур: total делится поровну между типами.
+
+    Производитель берется из прототипа, если он есть в базе, иначе - любой
+    производитель этого типа (или вообще любой). Типы без прототипов пропускаются.
+    """
+    prototypes = load_prototypes()
+    manufacturers = {}
+    for pk, component_type in Manufacturer.objects.values_list('pk', 'component_type'):
+        manufacturers.setdefault(component_type, []).append(pk)
+    known = {pk for pks in manufacturers.values() for pk in pks}
+    created = {}
+    for component_type, model in COMPONENT_MODELS.items():
+        samples = prototypes.get(model._meta.label_lower)
+        candidates = manufacturers.get(component_type) or sorted(known)
+        if not samples or not candidates:
+            _log(stdout, f'Нет прототипов или производителей для типа {component_type}: пропущен.')
+            continue
+        ComponentFactory = component_factory(model)
+        for size in _chunks(total // len(COMPONENT_MODELS)):
+            components = []
+            for _ in range(size):
+                prototype = random.choice(samples)
+                manufacturer = prototype.get('manufacturer')
+                if manufacturer not in known:
+                    manufacturer = random.choice(candidates)
+                components.append(ComponentFactory.build(prototype=prototype, manufacturer_id=manufacturer))
+            _bulk(model, components)
+            created[component_type] = created.get(component_type, 0) + size
+    return created
+
+
+def seed_stock():
+    """Записи склада для компонентов, у которых их еще нет."""
+    created = 0
+    for component_type, model in COMPONENT_MODELS.items():
+        stocked = set(Stock.objects.filter(component_type=component_type).values_list('component_id', flat=True))
+        missing = [pk for pk in model.objects.values_list('pk', flat=True) if pk not in stocked]
+        _bulk(Stock, [StockFactory.build(component_type=component_type, component_id=pk) for pk in missing])
+        created += len(missing)
+    return created
+
+
+def seed_users(total):
+    UserFactory.reset_sequence(User.objects.filter(username__startswith='bench_user_').count())
+    for size in _chunks(total):
+        _bulk(User, UserFactory.build_batch(size))
+    return total
+
+
+def seed_games(total):
+    _bulk(Game, GameFactory.build_batch(total))
+    return total
+
+
+def _performance(ids):
+    """Случайная логнормальная производительность компонентов: FPS пары - произведение вкладов."""
+    return {pk: random.lognormvariate(0, 0.35) for pk in ids}
+
+
+def seed_fps(total):
+    """
+    Замеры FPS: случайные различные (игра, настройки, процессор, видеокарта)
+    по MEASURED_COMPONENTS процессорам и видеокартам. FPS - произведение базы
+    игры, множителя настроек и вкладов компонентов с шумом, поэтому модель
+    предсказания обучается на реалистичной структуре данных.
+    """
+    cpu_model, gpu_model = COMPONENT_MODELS['cpu'], COMPONENT_MODELS['gpu']
+    cpu_ids = list(cpu_model.objects.values_list('pk', flat=True))
+    gpu_ids = list(gpu_model.objects.values_list('pk', flat=True))
+    games = {pk: random.uniform(60, 240) for pk in Game.objects.values_list('pk', flat=True)}
+    if not cpu_ids or not gpu_ids or not games:
+        return 0
+    cpus = _performance(random.sample(cpu_ids, min(MEASURED_COMPONENTS, len(cpu_ids))))
+    gpus = _performance(random.sample(gpu_ids, min(MEASURED_COMPONENTS, len(gpu_ids))))
+    total = min(total, len(games) * len(SETTINGS_FACTORS) * len(cpus) * len(gpus))
+    cpu_keys, gpu_keys, game_keys, settings_keys = list(cpus), list(gpus), list(games), list(SETTINGS_FACTORS)
+    keys = set()
+    while len(keys) < total:
+        keys.add((random.choice(game_keys), random.choice(settings_keys), random.choice(cpu_keys), random.choice(gpu_keys)))
+    keys = list(keys)
+    for start in range(0, total, BATCH_SIZE):
+        rows = []
+        for game, preset, cpu, gpu in keys[start:start + BATCH_SIZE]:
+            avg = games[game] * SETTINGS_FACTORS[preset] * cpus[cpu] * gpus[gpu] * random.uniform(0.95, 1.05)
+            rows.append(
+                FPSDataFactory.build(
+                    game_id=game, settings=preset, cpu_id=cpu, gpu_id=gpu,
+                    min_fps=int(avg * 0.7), avg_fps=int(avg), max_fps=int(avg * 1.3),
+                )
+            )
+        _bulk(FPSData, rows)
+    return total
+
+
+def _catalog_items():
+    """Компоненты для позиций заказов: (тип, ID, «Производитель Модель», цена)."""
+    items = []
+    for component_type, model in COMPONENT_MODELS.items():
+        items.extend(
+            (component_type, pk, name, price)
+            for pk, name, price in model.objects.annotate(name=component_name_expression()).values_list(
+                'pk', 'name', 'price'
+            )
+        )
+    return items
+
+
+def seed_orders(total, stdout=None):
+    """
+    Заказы с позициями пакетами BATCH_SIZE.
+
+    Позиции генерируются до заказа, чтобы сразу записать его сумму. ID заказов
+    берутся из bulk_create, а если СУБД их не возвращает - по трек-номерам.
+    """
+    users = list(User.objects.filter(is_active=True).values_list('pk', 'email'))
+    catalog = _catalog_items()
+    if not users or not catalog:
+        return 0
+    OrderFactory.reset_sequence(Order.objects.filter(track_number__startswith=TRACK_PREFIX).count())
+    created = 0
+    for size in _chunks(total):
+        orders, items = [], []
+        for _ in range(size):
+            user_id, email = random.choice(users)
+            order_items = []
+            for component_type, component_id, name, price in random.sample(catalog, random.randint(*ITEMS_PER_ORDER)):
+                order_items.append(
+                    OrderItemFactory.build(
+                        item=name, price=price, component_type=component_type, component_id=component_id
+                    )
+                )
+            orders.append(
+                OrderFactory.build(
+                    user_id=user_id,
+                    email=email,
+                    total_amount=sum((item.price * item.quantity for item in order_items), Decimal('0')),
+                )
+            )
+            items.append(order_items)
+        orders = _bulk(Order, orders)
+        if orders[0].pk is None:
+            ids = dict(
+                Order.objects.filter(track_number__in=[order.track_number for order in orders]).values_list(
+                    'track_number', 'pk'
+                )
+            )
+            for order in orders:
+                order.pk = ids[order.track_number]
+        for order, order_items in zip(orders, items):
+            for item in order_items:
+                item.order_id = order.pk
+        _bulk(OrderItem, [item for order_items in items for item in order_items])
+        created += size
+        _log(stdout, f'Заказов: {created}/{total}')
+    return created
+
+
+def benchmark_user():
+    """
+    Сотрудник, от имени которого выполняются запросы (создается при первом вызове).
+
+    Пароль непригоден для входа: клиент замеров входит через force_login.
+    """
+    user, created = User.objects.get_or_create(
+        username=BENCHMARK_STAFF,
+        defaults={'email': f'{BENCHMARK_STAFF}@example.com', 'is_staff': True, 'is_superuser': True},
+    )
+    if created or user.has_usable_password():
+        user.set_unusable_password()
+        user.save(update_fields=['password'])
+    return user
+
+
+def seed_builds(user, total=BENCHMARK_BUILDS):
+    """Сборки сотрудника из случайных компонентов (через save(): сигналы считают цену и TDP)."""
+    ids = {
+        component_type: list(model.objects.values_list('pk', flat=True)[:1000])
+        for component_type, model in COMPONENT_MODELS.items()
+    }
+    for _ in range(total):
+        Build.objects.create(
+            user=user,
+            **{
+                f'{component_type}_id': random.choice(pks)
+                for component_type, pks in ids.items()
+                if pks
+            },
+        )
+    return total
+
+
+def rebuild_derived(stdout=None):
+    """Пересчитывает производные данные после bulk_create и сбрасывает кэши процессов."""
+    for command, args in (
+        ('rebuild_search_index', []),
+        ('rebuild_compatibility_graph', []),
+        ('update_popularity', ['--rebuild']),
+        ('reconcile_counters', []),
+    ):
+        _log(stdout, f'Пересчет: {command}')
+        call_command(command, *args, stdout=stdout)
+    touch_components()
+    stock_index.invalidate()
+    fps_predictor.invalidate()
+
+
+def seed(components=DEFAULT_COMPONENTS, users=DEFAULT_USERS, games=DEFAULT_GAMES, orders=DEFAULT_ORDERS,
+         fps_rows=DEFAULT_FPS_ROWS, seed_value=None, derived=True, stdout=None, confirmed=False):
+    """
+    Заполняет базу большим каталогом для замеров производительности.
+
+    Возвращает {что: сколько создано}. Повторный вызов добавляет данные к
+    уже существующим. seed_value делает данные воспроизводимыми. Рабочую базу
+    не трогает (ensure_benchmark_database).
+    """
+    ensure_benchmark_database(confirmed)
+    if seed_value is not None:
+        random.seed(seed_value)
+        fake.seed_instance(seed_value)
+    load_fixtures(stdout)
+    created = {'components': seed_catalog(components, stdout)}
+    created['stock'] = seed_stock()
+    created['users'] = seed_users(users)
+    created['games'] = seed_games(games)
+    created['fps_rows'] = seed_fps(fps_rows)
+    user = benchmark_user()  # До заказов: у сотрудника тоже есть история заказов.
+    created['orders'] = seed_orders(orders, stdout)
+    created['builds'] = seed_builds(user)
+    if derived:
+        rebuild_derived(stdout)
+    return created
+
+
+def _last(model, **filters):
+    return model.objects.filter(**filters).order_by('-pk').values_list('pk', flat=True).first()
+
+
+def _samples(user):
+    """ID объектов для URL с параметрами: последние записи каждой модели (сгенерированные, с изображениями)."""
+    samples = {component_type: _last(model) for component_type, model in COMPONENT_MODELS.items()}
+    samples.update(
+        build=_last(Build, user=user),
+        game=_last(Game),
+        order=_last(Order, is_completed=False),
+        order_item=_last(OrderItem, order__user=user),
+        return_request=_last(ReturnRequest),
+    )
+    return samples
+
+
+URL_PARAMETERS = {
+    'components:add_review': lambda s: ({'pk': s['cpu'], 'component_type': 'cpu'}, {}),
+    'components:component_search': lambda s: ({}, {'q': 'intel'}),
+    'components:stock_list': lambda s: ({}, {'q': 'intel'}),
+    'builds:build_detail': lambda s: ({'pk': s['build']}, {}),
+    'builds:build_edit': lambda s: ({'pk': s['build']}, {}),
+    'builds:build_options': lambda s: ({}, {'cpu': s['cpu']}),
+    'builds:build_optimizer': lambda s: ({}, {'budget': 1500, 'game': s['game']}),
+    'builds:get_compatible_motherboards': lambda s: ({}, {'cpu_id': s['cpu']}),
+    'builds:get_compatible_rams': lambda s: ({}, {'motherboard_id': s['motherboard']}),
+    'builds:get_compatible_cpu': lambda s: ({}, {'motherboard_id': s['motherboard']}),
+    'builds:employee_order_update': lambda s: ({'order_id': s['order']}, {}),
+    'builds:employee_process_return': lambda s: ({'return_request_id': s['return_request']}, {}),
+    'games:game_detail': lambda s: ({'pk': s['game']}, {}),
+    'games:predict_fps': lambda s: ({}, {'cpu': s['cpu'], 'gpu': s['gpu']}),
+    'games:fps_table': lambda s: ({}, {'cpu': s['cpu'], 'gpu': s['gpu']}),
+    'users:create_return_request': lambda s: ({'order_item_id': s['order_item']}, {}),
+}  # Имя URL -> (kwargs, GET параметры) по образцам из _samples.
+
+
+def _detail_parameters(name, samples):
+    """kwargs страниц компонентов '<тип>_detail'."""
+    component_type = name.split(':')[1][:-len('_detail')]
+    return {'pk': samples.get(component_type)}, {}
+
+
+def benchmark_urls(user, namespaces=BENCHMARK_NAMESPACES):
+    """
+    Измеряемые URL: [(имя, путь с GET параметрами)].
+
+    URL с параметрами, для которых в базе нет образца, пропускаются. Одно имя
+    может встречаться у нескольких маршрутов (add_review) - берется первый.
+    """
+    samples = _samples(user)
+    urls, seen = [], set()
+    for resolver in get_resolver().url_patterns:
+        if not isinstance(resolver, URLResolver) or resolver.namespace not in namespaces:
+            continue
+        for pattern in resolver.url_patterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            name = f'{resolver.namespace}:{pattern.name}'
+            if name in UNSAFE_URLS or name in seen:
+                continue
+            seen.add(name)
+            if name in URL_PARAMETERS:
+                kwargs, query = URL_PARAMETERS[name](samples)
+            elif name.endswith('_detail') and name.startswith('components:'):
+                kwargs, query = _detail_parameters(name, samples)
+            else:
+                kwargs, query = {}, {}
+            if None in kwargs.values() or None in query.values():
+                continue
+            url = reverse(name, kwargs=kwargs)
+            urls.append((name, f'{url}?{urlencode(query)}' if query else url))
+    return urls
+
+
+def _percentile(values, share):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * share))]
+
+
+def _timed(call):
+    """(результат, время в мс, число запросов) одного вызова."""
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        result = call()
+        elapsed = (time.perf_counter() - started) * 1000
+    return result, elapsed, len(queries.captured_queries)
+
+
+def _peak_memory(call):
+    """Пиковая память Python (КБ) за вызов: отдельный запуск, tracemalloc замедляет код."""
+    tracemalloc.start()
+    try:
+        call()
+        return round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+    finally:
+        tracemalloc.stop()
+
+
+def measure(name, call, repeat, status=None):
+    """
+    Замер одного вызова: первый («холодный») запуск, repeat повторов и
+    отдельный запуск для памяти. Ошибка записывается в результат.
+    """
+    result = {'name': name}
+    try:
+        response, cold, queries = _timed(call)
+        timings = [_timed(call)[1] for _ in range(repeat)] or [cold]
+        result.update(
+            cold_ms=round(cold, 2),
+            p50_ms=round(_percentile(timings, 0.5), 2),
+            p95_ms=round(_percentile(timings, 0.95), 2),
+            max_ms=round(max(timings), 2),
+            queries=queries,
+            peak_kb=_peak_memory(call),
+        )
+        if status is not None:
+            result['status'] = status(response)
+    except Exception as error:
+        result['error'] = f'{type(error).__name__}: {error}'
+    return result
+
+
+def _client(user):
+    """Клиент с сессией сотрудника; Host - первый из ALLOWED_HOSTS без шаблонов."""
+    hosts = [host for host in settings.ALLOWED_HOSTS if host and '*' not in host and not host.startswith('.')]
+    client = Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+    client.force_login(user)
+    return client
+
+
+def _services():
+    """Сервисы без HTTP: [(имя, вызов)]. Кэши процессов создаются заново, чтобы замерить загрузку."""
+    from components.search import search
+    from .configurator import catalog_options
+    from .dashboard import dashboard_counters
+    from .optimizer import find_builds
+
+    return [
+        ('fps_model', lambda: FPSPredictor().model()),
+        ('stock_index', lambda: StockIndex().in_stock_ids('cpu')),
+        ('catalog_options', catalog_options),
+        ('find_builds', lambda: find_builds(Decimal(1500))),
+        ('dashboard_counters', dashboard_counters),
+        ('search', lambda: search('intel')),
+    ]
+
+
+def table_counts():
+    """Число строк в основных таблицах: объем данных, на котором сделаны замеры."""
+    models = [*COMPONENT_MODELS.values(), Stock, User, Game, FPSData, Order, OrderItem, Build]
+    return {model._meta.label_lower: model.objects.count() for model in models}
+
+
+def run(repeat=DEFAULT_REPEAT, namespaces=BENCHMARK_NAMESPACES, services=True, stdout=None, confirmed=False):
+    """
+    Замеры всех URL приложений и сервисов; результат - словарь для сохранения в JSON.
+
+    Запросы меняют данные (сотрудник, сессии, кэши), поэтому, как и seed(),
+    выполняются только на базе для замеров.
+    """
+    ensure_benchmark_database(confirmed)
+    user = benchmark_user()
+    client = _client(user)
+    report = {
+        'started': datetime.now().isoformat(timespec='seconds'),
+        'vendor': connection.vendor,
+        'repeat': repeat,
+        'counts': table_counts(),
+        'urls': [],
+        'services': [],
+    }
+    for name, url in benchmark_urls(user, namespaces):
+        result = measure(name, lambda: client.get(url), repeat, status=lambda response: response.status_code)
+        result['url'] = url
+        report['urls'].append(result)
+        _log(stdout, format_result(result))
+    if services:
+        for name, call in _services():
+            result = measure(name, call, repeat)
+            report['services'].append(result)
+            _log(stdout, format_result(result))
+    return report
+
+
+def format_result(result):
+    if 'error' in result:
+        return f"{result['name']}: ошибка {result['error']}"
+    status = f" [{result['status']}]" if 'status' in result else ''
+    return (
+        f"{result['name']}{status}: p50 {result['p50_ms']} мс, p95 {result['p95_ms']} мс, "
+        f"первый {result['cold_ms']} мс, запросов {result['queries']}, память {result['peak_kb']} КБ"
+    )
+
+
+def save_report(report, path):
+    Path(path).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def load_report(path):
+    return json.loads(Path(path).read_text(encoding='utf-8'))
+
+
+def compare(previous, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Регрессии между двумя отчетами: [строка], по одной на URL или сервис.
+
+    Регрессия - рост p50 больше чем на threshold, рост числа запросов
+    или новая ошибка.
+    """
+    regressions = []
+    for section in ('urls', 'services'):
+        before = {result['name']: result for result in previous.get(section, [])}
+        for result in current.get(section, []):
+            old = before.get(result['name'])
+            if old is None:
+                continue
+            if 'error' in result:
+                if 'error' not in old:
+                    regressions.append(f"{result['name']}: ошибка {result['error']}")
+                continue
+            if 'error' in old:
+                continue
+            if result['p50_ms'] > old['p50_ms'] * (1 + threshold):
+                regressions.append(f"{result['name']}: p50 {old['p50_ms']} -> {result['p50_ms']} мс")
+            if result['queries'] > old['queries']:
+                regressions.append(f"{result['name']}: запросов {old['queries']} -> {result['queries']}")
+    return regressions
@@ -0,0 +1,134 @@
+# builds/cart.py
+from decimal import Decimal
+
+from django.core.cache import cache
+
+from .models import CartItem
+
+CART_RELATIONS = (
+    'build',
+    'cpu',
+    'gpu',
+    'motherboard',
+    'ram',
+    'storage',
+    'psu',
+    'case',
+    'cooler',
+)  # Связи элемента корзины в порядке проверки: заполнена должна быть ровно одна.
+CART_SELECT_RELATED = ('user', 'build') + tuple(
+    f'{name}__manufacturer' for name in CART_RELATIONS[1:]
+)  # Все товары корзины и их производители загружаются одним запросом.
+
+CART_CACHE_TIMEOUT = 60 * 15  # Время жизни расчета корзины в кэше (секунды).
+CART_VERSION_KEY = 'cart_version:{user_id}'  # Версия корзины пользователя; меняется при изменении корзины.
+PRICES_VERSION_KEY = 'cart_prices_version'  # Версия цен; меняется при изменении компонентов и сборок.
+
+
+def cart_item_product(item):
+    """Возвращает (тип товара, товар) для элемента корзины или (None, None)."""
+    for name in CART_RELATIONS:
+        product = getattr(item, name)
+        if product is not None:
+            return name, product
+    return None, None
+
+
+def cart_item_unit_price(item):
+    """Цена единицы товара в корзине (Decimal)."""
+    product_type, product = cart_item_product(item)
+    if product is None:
+        return Decimal('0')
+    price = product.total_price if product_type == 'build' else product.price
+    return Decimal(price or 0)
+
+
+class CartLine:
+    """Строка расчета корзины."""
+
+    def __init__(self, item):
+        self.item = item  # Элемент корзины с загруженным товаром.
+        self.product_type, self.product = cart_item_product(item)
+        self.unit_price = cart_item_unit_price(item)
+        self.quantity = item.quantity or 1
+        self.total = self.unit_price * self.quantity  # Стоимость строки с учетом количества.
+
+
+class CartSummary:
+    """Расчет корзины пользователя: строки и итоговая сумма."""
+
+    def __init__(self, items):
+        self.lines = [CartLine(item) for item in items]
+        self.total_price = sum((line.total for line in self.lines), Decimal('0'))
+
+    @property
+    def items(self):
+        """Элементы корзины (для шаблонов)."""
+        return [line.item for line in self.lines]
+
+    def __len__(self):
+        return len(self.lines)
+
+
+def _get_version(key):
+    try:
+        return cache.get(key, 0)
+    except Exception:
+        return None  # Кэш недоступен - расчет выполняется без кэширования.
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)  # Ключа еще нет - создаем его без срока жизни.
+    except Exception:
+        pass  # Кэш недоступен - закэшированных расчетов тоже нет.
+
+
+def _cache_key(user_id):
+    cart_version = _get_version(CART_VERSION_KEY.format(user_id=user_id))
+    prices_version = _get_version(PRICES_VERSION_KEY)
+    if cart_version is None or prices_version is None:
+        return None
+    return f'cart_summary:{user_id}:{cart_version}:{prices_version}'
+
+
+def load_cart(user, use_cache=True):
+    """
+    Возвращает CartSummary для пользователя.
+
+    Корзина загружается одним запросом со всеми связями; расчет кэшируется до
+    изменения корзины пользователя или цен. use_cache=False - всегда свежий расчет
+    (оформление заказа).
+    """
+    key = _cache_key(user.pk) if use_cache else None
+    if key is not None:
+        try:
+            summary = cache.get(key)
+        except Exception:
+            summary = None
+        if summary is not None:
+            return summary
+
+    summary = CartSummary(
+        CartItem.objects.filter(user=user)
+        .select_related(*CART_SELECT_RELATED)
+        .order_by('pk')
+    )
+    if key is not None:
+        try:
+            cache.set(key, summary, CART_CACHE_TIMEOUT)
+        except Exception:
+            pass
+    return summary
+
+
+def invalidate_cart(user_id):
+    """Сбрасывает закэшированный расчет корзины пользователя."""
+    _bump_version(CART_VERSION_KEY.format(user_id=user_id))
+
+
+def invalidate_prices():
+    """Сбрасывает закэшированные расчеты всех корзин (изменились цены)."""
+    _bump_version(PRICES_VERSION_KEY)
@@ -0,0 +1,106 @@
+# builds/checkout.py
+from django.db import transaction
+from django.db.models import Case, F, PositiveIntegerField, Q, When
+
+from components.models import Stock
+from components.stock_index import stock_index
+from components.versioning import bump_component_versions
+from .counters import OUT_OF_STOCK, adjust_counters
+from .models import OrderItem
+
+
+class InsufficientStockError(Exception):
+    """Недостаточно товара на складе для оформления заказа."""
+
+    def __init__(self, shortages):
+        self.shortages = shortages  # Список (строка корзины, доступное количество).
+        super().__init__(
+            "Недостаточно товара на складе: "
+            + ", ".join(
+                f"{line.product.manufacturer} {line.product.model} (в наличии {available})"
+                for line, available in shortages
+            )
+        )
+
+
+def _component_lines(lines):
+    """Строки корзины с компонентами (сборки складом не учитываются)."""
+    return [line for line in lines if line.product is not None and line.product_type != 'build']
+
+
+def reserve_stock(lines):
+    """
+    Резервирует складские запасы для строк корзины (CartLine).
+
+    Все затронутые записи Stock блокируются одним select_for_update в порядке
+    (component_type, component_id), поэтому параллельные заказы не взаимоблокируются.
+    Если товара хватает, количество уменьшается одним UPDATE с F()-выражением.
+    Вызывать внутри transaction.atomic().
+    """
+    required = {}  # (component_type, component_id) -> требуемое количество.
+    by_key = {}  # (component_type, component_id) -> строка корзины (для сообщения об ошибке).
+    for line in _component_lines(lines):
+        key = (line.product_type, line.product.pk)
+        required[key] = required.get(key, 0) + line.quantity
+        by_key[key] = line
+    if not required:
+        return
+
+    condition = Q()
+    for component_type, component_id in required:
+        condition |= Q(component_type=component_type, component_id=component_id)
+    stock_rows = {
+        (stock.component_type, stock.component_id): stock
+        for stock in Stock.objects.select_for_update()
+        .filter(condition)
+        .order_by('component_type', 'component_id')
+    }  # Блокируем строки до конца транзакции.
+
+    shortages = []
+    for key, quantity in sorted(required.items()):
+        stock = stock_rows.get(key)
+        available = stock.quantity if stock else 0  # Нет записи в Stock - товара нет в наличии.
+        if quantity > available:
+            shortages.append((by_key[key], available))
+    if shortages:
+        raise InsufficientStockError(shortages)
+
+    Stock.objects.filter(pk__in=[stock.pk for stock in stock_rows.values()]).update(
+        quantity=Case(
+            *[
+                When(pk=stock_rows[key].pk, then=F('quantity') - quantity)
+                for key, quantity in required.items()
+            ],
+            default=F('quantity'),
+            output_field=PositiveIntegerField(),
+        )
+    )  # Списываем все позиции одним запросом.
+    transaction.on_commit(stock_index.invalidate)  # update() не вызывает Stock.save() - сбрасываем индекс явно.
+    transaction.on_commit(
+        lambda: bump_component_versions(required)
+    )  # Наличие в карточках списанных компонентов изменилось. При откате кэши не трогаем.
+    adjust_counters(
+        {OUT_OF_STOCK: sum(1 for key, quantity in required.items() if stock_rows[key].quantity == quantity)}
+    )  # Позиции, списанные до нуля, пополняют счетчик отсутствующих товаров.
+
+
+def create_order_items(order, lines):
+    """
+    Создает позиции заказа для строк корзины одним bulk_create.
+
+    bulk_create не отправляет post_save, поэтому update_stock_on_order_item_create
+    не списывает запасы второй раз: они уже списаны в reserve_stock().
+    """
+    return OrderItem.objects.bulk_create(
+        [
+            OrderItem(
+                order=order,
+                item=str(line.item),  # Название товара на момент заказа.
+                quantity=line.quantity,
+                price=line.unit_price,
+                component_type=line.product_type,
+                component_id=line.product.pk if line.product else None,
+            )
+            for line in lines
+        ]
+    )
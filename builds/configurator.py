@@ -0,0 +1,111 @@
+# builds/configurator.py
+import copy
+
+from django.core.cache import cache
+
+from components.resolver import COMPONENT_MODELS
+from components.stock_index import stock_index
+from components.versioning import components_changed_at
+
+OPTIONS_CONTEXT_NAMES = {
+    'cpu': 'cpus',
+    'gpu': 'gpus',
+    'motherboard': 'motherboards',
+    'ram': 'rams',
+    'storage': 'storages',
+    'psu': 'psus',
+    'case': 'cases',
+    'cooler': 'coolers',
+}  # Тип компонента -> имя списка в контексте шаблонов конфигуратора.
+OPTIONS_CACHE_TIMEOUT = 60 * 60  # Время жизни списков в общем кэше (секунды); изменения компонентов меняют ключ.
+
+_local_components = (None, None)  # (версия компонентов, списки без признака наличия) - последние списки процесса.
+_local_options = (None, None, None)  # (версия компонентов, снимок индекса запасов, списки с признаком наличия).
+
+
+def _load_components():
+    """Загружает списки всех типов: один запрос на тип вместе с производителем."""
+    return {
+        component_type: list(model.objects.select_related('manufacturer'))
+        for component_type, model in COMPONENT_MODELS.items()
+    }
+
+
+def _catalog_components():
+    """
+    Возвращает (версия компонентов, {тип: [компоненты]}) без признака наличия.
+
+    Списки кэшируются в общем кэше и в процессе по версии компонентов: изменения
+    запасов их не сбрасывают. Версия None - общий кэш недоступен.
+    """
+    global _local_components
+    version = components_changed_at()
+    if version is None:
+        return None, _load_components()  # Общий кэш недоступен - без кэширования.
+    local_version, components = _local_components
+    if local_version == version:
+        return version, components
+
+    key = f'configurator_components:{version!r}'
+    try:
+        components = cache.get(key)
+    except Exception:
+        components = None
+    if components is None:
+        components = _load_components()
+        try:
+            cache.set(key, components, OPTIONS_CACHE_TIMEOUT)
+        except Exception:
+            pass
+    _local_components = (version, components)  # Кортеж заменяется целиком - безопасно для потоков.
+    return version, components
+
+
+def _mark_stock(components, quantities):
+    """Копии компонентов с признаком in_stock по снимку индекса запасов."""
+    options = {}
+    for component_type, items in components.items():
+        stocked = quantities.get(component_type, {})
+        marked = []
+        for component in items:
+            component = copy.copy(component)  # Общие списки не меняются: их читают другие потоки.
+            component.in_stock = stocked.get(component.pk, 0) > 0  # Признак наличия для шаблона.
+            marked.append(component)
+        options[component_type] = marked
+    return options
+
+
+def catalog_options():
+    """
+    Возвращает {тип: [компоненты]} для списков конфигуратора.
+
+    Сами компоненты кэшируются по версии компонентов (_catalog_components), а
+    наличие берется из процессного индекса запасов: поставка или продажа не
+    заставляет перечитывать каталог, а только заново отмечает наличие.
+    """
+    global _local_options
+    version, components = _catalog_components()
+    quantities = stock_index.snapshot()
+    local_version, local_quantities, options = _local_options
+    if version is not None and local_version == version and local_quantities is quantities:
+        return options
+
+    options = _mark_stock(components, quantities)
+    if version is not None:
+        _local_options = (version, quantities, options)
+    return options
+
+
+def configurator_context(in_stock_only=False, **extra):
+    """
+    Контекст формы конфигуратора: списки cpus, gpus, ... и дополнительные значения.
+
+    in_stock_only=True оставляет в списках только компоненты в наличии.
+    """
+    context = {}
+    for component_type, components in catalog_options().items():
+        if in_stock_only:
+            components = [component for component in components if component.in_stock]
+        context[OPTIONS_CONTEXT_NAMES[component_type]] = components
+    context.update(extra)
+    return context
@@ -0,0 +1,122 @@
+# builds/counters.py
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from components.models import Stock
+from .models import Order, ReturnRequest
+
+COUNTER_KEY = 'counter:{name}'  # Ключ счетчика в общем кэше (Redis).
+OUT_OF_STOCK = 'out_of_stock'  # Записи Stock с нулевым запасом.
+PENDING_RETURNS = 'pending_returns'  # Запросы на возврат «На рассмотрении».
+OPEN_ORDERS = 'open_orders:{status}'  # Невыданные заказы в статусе status.
+OPEN_ORDER_COUNTERS = {
+    status: OPEN_ORDERS.format(status=status) for status, _ in Order.STATUS_CHOICES
+}  # Статус -> имя счетчика.
+COUNTERS = (OUT_OF_STOCK, PENDING_RETURNS) + tuple(OPEN_ORDER_COUNTERS.values())  # Все счетчики.
+
+
+def _key(name):
+    return COUNTER_KEY.format(name=name)
+
+
+def _count_from_db(names):
+    """Точные значения счетчиков names по базе: не больше одного запроса на модель."""
+    values = {}
+    if OUT_OF_STOCK in names:
+        values[OUT_OF_STOCK] = Stock.objects.filter(quantity=0).count()
+    if PENDING_RETURNS in names:
+        values[PENDING_RETURNS] = ReturnRequest.objects.filter(status='pending').count()
+    if any(name in names for name in OPEN_ORDER_COUNTERS.values()):
+        by_status = dict.fromkeys(OPEN_ORDER_COUNTERS, 0)
+        by_status.update(
+            Order.objects.filter(is_completed=False)
+            .order_by()
+            .values_list('status')
+            .annotate(total=Count('pk'))
+        )
+        for status, name in OPEN_ORDER_COUNTERS.items():
+            if name in names:
+                values[name] = by_status[status]
+    return values
+
+
+def counted_state(instance):
+    """
+    Вклад объекта в счетчики: {имя счетчика: 1}.
+
+    Разность вкладов до и после сохранения дает приращения счетчиков.
+    """
+    if isinstance(instance, Stock):
+        return {OUT_OF_STOCK: 1} if instance.quantity == 0 else {}
+    if isinstance(instance, ReturnRequest):
+        return {PENDING_RETURNS: 1} if instance.status == 'pending' else {}
+    if isinstance(instance, Order):
+        name = OPEN_ORDER_COUNTERS.get(instance.status)
+        return {name: 1} if name and not instance.is_completed else {}
+    return {}
+
+
+def state_delta(old, new):
+    """Приращения счетчиков при переходе от вклада old к вкладу new."""
+    return {
+        name: new.get(name, 0) - old.get(name, 0)
+        for name in old.keys() | new.keys()
+        if new.get(name, 0) != old.get(name, 0)
+    }
+
+
+def _apply(deltas):
+    for name, delta in deltas.items():
+        try:
+            cache.incr(_key(name), delta)  # INCRBY в Redis - атомарно для всех процессов.
+        except ValueError:
+            pass  # Счетчика еще нет: его посчитает по базе первое чтение.
+        except Exception:
+            return  # Кэш недоступен - счетчики будут сверены с базой.
+
+
+def adjust_counters(deltas):
+    """
+    Изменяет счетчики на deltas ({имя: приращение}) после фиксации транзакции.
+
+    При откате транзакции счетчики не меняются; расхождения от сбоев
+    исправляет reconcile_counters.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: _apply(deltas))
+
+
+def read_counters():
+    """
+    Значения всех счетчиков: {имя: значение}, одним MGET.
+
+    Отсутствующие в кэше счетчики считаются по базе и добавляются в кэш.
+    """
+    keys = {_key(name): name for name in COUNTERS}
+    try:
+        cached = cache.get_many(list(keys))
+    except Exception:
+        return _count_from_db(COUNTERS)  # Кэш недоступен - считаем по базе.
+    values = {keys[key]: value for key, value in cached.items()}
+    missing = [name for name in COUNTERS if name not in values]
+    if missing:
+        counted = _count_from_db(missing)
+        for name, value in counted.items():
+            try:
+                cache.add(_key(name), value, None)  # add: не затираем значение, созданное другим процессом.
+            except Exception:
+                pass
+        values.update(counted)
+    return values
+
+
+def reconcile_counters():
+    """Записывает в кэш точные значения всех счетчиков по базе. Возвращает {имя: значение}."""
+    values = _count_from_db(COUNTERS)
+    try:
+        cache.set_many({_key(name): value for name, value in values.items()}, None)
+    except Exception:
+        pass
+    return values
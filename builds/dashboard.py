@@ -0,0 +1,81 @@
+# builds/dashboard.py
+from django.db.models import (
+    DecimalField,
+    F,
+    OuterRef,
+    PositiveIntegerField,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+
+from .counters import OPEN_ORDER_COUNTERS, OUT_OF_STOCK, PENDING_RETURNS, read_counters
+from .models import Order, OrderItem
+
+
+def _item_sum(expression, output_field):
+    """
+    Подзапрос с суммой по позициям заказа.
+
+    Коррелированный подзапрос вместо JOIN + GROUP BY: COUNT(*) пагинации его
+    не содержит, а сумма считается только для заказов текущей страницы.
+    """
+    items = (
+        OrderItem.objects.filter(order=OuterRef('pk'))
+        .order_by()
+        .values('order')
+        .annotate(total=Sum(expression, output_field=output_field))
+        .values('total')
+    )
+    return Coalesce(Subquery(items, output_field=output_field), Value(0), output_field=output_field)
+
+
+def dashboard_orders(is_completed, query=None):
+    """
+    Заказы для страниц сотрудника: текущие (is_completed=False) или выданные.
+
+    Пользователь и запрос на возврат загружаются JOIN'ом, позиции - одним
+    дополнительным запросом на страницу (order.items). Количество товаров
+    (item_count) и их сумма (items_total) считаются в SQL.
+    """
+    orders = (
+        Order.objects.filter(is_completed=is_completed)
+        .select_related('user', 'return_request')
+        .prefetch_related(
+            Prefetch('orderitem_set', queryset=OrderItem.objects.order_by('pk'), to_attr='items')
+        )
+        .annotate(
+            item_count=_item_sum('quantity', PositiveIntegerField()),
+            items_total=_item_sum(
+                F('price') * F('quantity'), DecimalField(max_digits=12, decimal_places=2)
+            ),
+        )
+    )
+    if query:
+        orders = orders.filter(
+            Q(track_number__icontains=query)
+            | Q(user__username__icontains=query)
+            | Q(email__icontains=query)
+        )  # Поиск по трек-номеру, имени пользователя или email.
+    return orders
+
+
+def dashboard_counters():
+    """
+    Счетчики страниц сотрудника одним чтением из общего кэша.
+
+    Возвращает return_request_count, out_of_stock_count и open_order_counts -
+    список (код статуса, название, количество) невыданных заказов.
+    """
+    counters = read_counters()
+    return {
+        'return_request_count': counters[PENDING_RETURNS],
+        'out_of_stock_count': counters[OUT_OF_STOCK],
+        'open_order_counts': [
+            (status, label, counters[OPEN_ORDER_COUNTERS[status]])
+            for status, label in Order.STATUS_CHOICES
+        ],
+    }
@@ -0,0 +1,176 @@
+# builds/factories.py
+import json
+import random
+from decimal import Decimal
+from pathlib import Path
+
+import factory
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from faker import Faker
+
+from components.models import Stock
+from fps_data.models import FPSData
+from games.models import Game
+from .models import Order, OrderItem
+
+PROJECT_DIR = Path(settings.BASE_DIR).parent  # Корень проекта (BASE_DIR - пакет pc_builder).
+FIXTURES_DIR = PROJECT_DIR / 'data'  # Фикстуры каталога - прототипы генерируемых компонентов.
+PRICE_SPREAD = (0.6, 1.8)  # Разброс цены относительно прототипа.
+PAYMENT_METHODS = ('cash', 'card', 'balance')  # Способы оплаты формы оформления заказа.
+GENRES = ('Шутер', 'RPG', 'Стратегия', 'Гонки', 'Симулятор', 'Экшен')
+BENCHMARK_PASSWORD = 'benchmark'  # Пароль сгенерированных пользователей.
+TRACK_PREFIX = 'Z'  # Трек-номера сгенерированных заказов: буква не шестнадцатеричная, совпадений с generate_track_number нет.
+BENCHMARK_IMAGE = 'benchmark.webp'  # Имя изображения компонентов: шаблоны списков требуют image.url.
+
+fake = Faker()  # Генератор названий для Sequence-полей.
+_password_hashes = []  # Хэш пароля считается один раз: make_password намеренно медленный.
+
+
+def _password_hash():
+    if not _password_hashes:
+        _password_hashes.append(make_password(BENCHMARK_PASSWORD))
+    return _password_hashes[0]
+
+
+def load_prototypes():
+    """
+    Прототипы компонентов из data/*.json: {модель: [словарь полей]}, например
+    {'components.cpu': [...]}. Поле manufacturer остается ID из фикстуры.
+
+    Генерируемые компоненты копируют согласованные характеристики прототипа
+    (сокет, тип памяти, форм-фактор), поэтому правила совместимости работают
+    на сгенерированном каталоге так же, как на настоящем.
+    """
+    prototypes = {}
+    for path in sorted(FIXTURES_DIR.glob('*.json')):
+        for row in json.loads(path.read_text(encoding='utf-8')):
+            fields = dict(row['fields'])
+            fields.pop('image', None)
+            prototypes.setdefault(row['model'], []).append(fields)
+    return prototypes
+
+
+class ComponentFactory(factory.django.DjangoModelFactory):
+    """
+    Компонент каталога по прототипу из фикстур.
+
+    Прототип и производитель передаются при создании: component_factory(model).build(
+    prototype=..., manufacturer=...). Название - слово Faker и номер, цена - цена
+    прототипа со случайным множителем.
+    """
+
+    class Meta:
+        abstract = True
+
+    class Params:
+        prototype = factory.LazyFunction(dict)
+
+    model = factory.Sequence(lambda n: f'{fake.word().title()} {n}')
+    price = factory.LazyAttribute(
+        lambda o: (Decimal(o.prototype.get('price', 100)) * Decimal(random.uniform(*PRICE_SPREAD))).quantize(
+            Decimal('0.01')
+        )
+    )
+
+
+def benchmark_image(model):
+    """Имя изображения-заглушки компонентов модели (в каталоге upload_to поля image)."""
+    return f"{model._meta.get_field('image').upload_to}{BENCHMARK_IMAGE}"
+
+
+def component_factory(model):
+    """
+    Фабрика компонентов модели model: поля прототипа копируются как есть, кроме
+    производителя; полям, которых нет в фикстуре, задается значение по умолчанию.
+    """
+    fields = [
+        field
+        for field in model._meta.concrete_fields
+        if field.editable and not field.primary_key and field.name not in ('manufacturer', 'model', 'price', 'image')
+    ]
+    return factory.make_factory(
+        model,
+        FACTORY_CLASS=ComponentFactory,
+        image=benchmark_image(model),
+        **{
+            field.name: factory.LazyAttribute(lambda o, field=field: o.prototype.get(field.name, field.get_default()))
+            for field in fields
+        },
+    )
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = User
+
+    username = factory.Sequence(lambda n: f'bench_user_{n}')
+    first_name = factory.Faker('first_name', locale='ru_RU')
+    last_name = factory.Faker('last_name', locale='ru_RU')
+    email = factory.LazyAttribute(lambda o: f'{o.username}@example.com')
+    password = factory.LazyFunction(_password_hash)
+
+
+class GameFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Game
+
+    title = factory.Sequence(lambda n: f'{fake.catch_phrase()} {n}')
+    genre = factory.Faker('random_element', elements=GENRES)
+    min_ram = factory.Faker('random_element', elements=(4, 8))
+    recommended_ram = factory.Faker('random_element', elements=(8, 16, 32))
+
+
+class OrderFactory(factory.django.DjangoModelFactory):
+    """
+    Заказ за последний год. Трек-номер задается по порядковому номеру с
+    префиксом TRACK_PREFIX: bulk_create не вызывает Order.save(), а случайные
+    номера на миллионе заказов совпадают.
+    """
+
+    class Meta:
+        model = Order
+
+    email = factory.LazyAttribute(lambda o: o.user.email)
+    delivery_option = factory.Faker(
+        'random_element', elements=[code for code, _ in Order.DELIVERY_OPTIONS]
+    )
+    payment_method = factory.Faker('random_element', elements=PAYMENT_METHODS)
+    address = factory.Maybe(
+        factory.LazyAttribute(lambda o: o.delivery_option == 'courier'),
+        yes_declaration=factory.Faker('street_address', locale='ru_RU'),
+        no_declaration=None,
+    )
+    total_amount = Decimal('0')  # Пересчитывается по позициям.
+    order_date = factory.Faker('date_time_between', start_date='-365d', end_date='now')
+    track_number = factory.Sequence(lambda n: f'{TRACK_PREFIX}{n:07X}')
+    is_completed = factory.Faker('boolean', chance_of_getting_true=80)
+    status = factory.LazyAttribute(
+        lambda o: 'completed' if o.is_completed else random.choice([code for code, _ in Order.STATUS_CHOICES[:-1]])
+    )
+
+
+class OrderItemFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = OrderItem
+
+    quantity = factory.Faker('random_element', elements=(1, 1, 1, 2, 3))
+
+
+class StockFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Stock
+
+    quantity = factory.Maybe(
+        factory.Faker('boolean', chance_of_getting_true=5),
+        yes_declaration=0,
+        no_declaration=factory.Faker('random_int', min=1, max=50),
+    )  # Около 5% позиций отсутствуют на складе.
+
+
+class FPSDataFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = FPSData
+
+    settings = factory.Faker('random_element', elements=[code for code, _ in FPSData._meta.get_field('settings').choices])
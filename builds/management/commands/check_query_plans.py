@@ -0,0 +1,45 @@
+# builds/management/commands/check_query_plans.py
+from django.core.management.base import BaseCommand, CommandError
+
+from builds.query_plans import check_plans, hot_paths, measure
+
+
+class Command(BaseCommand):
+    help = (
+        'Проверяет планы частых запросов: сообщает о полных просмотрах таблиц и недостающих '
+        'индексах (MSSQL), по желанию измеряет p50/p95 времени выполнения.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help='Имена проверяемых путей (по умолчанию все).')
+        parser.add_argument('--repeat', type=int, default=0, help='Запусков каждого запроса для замера времени.')
+        parser.add_argument('--plan', action='store_true', help='Выводить полный текст плана.')
+        parser.add_argument('--strict', action='store_true', help='Завершиться с ошибкой, если найдены проблемы.')
+
+    def handle(self, *args, **options):
+        known = {path.name: path for path in hot_paths()}
+        unknown = set(options['paths']) - set(known)
+        if unknown:
+            raise CommandError(f"Неизвестные пути: {', '.join(sorted(unknown))}. Доступны: {', '.join(known)}")
+
+        reports = check_plans(options['paths'])
+        problems = 0
+        for report in reports:
+            ok = not report.scans and not report.missing_indexes
+            problems += not ok
+            status = self.style.SUCCESS('OK') if ok else self.style.WARNING('SCAN')
+            line = f'{status} {report.name} - {report.description}'
+            if options['repeat'] > 0:
+                p50, p95 = measure(known[report.name].queryset, options['repeat'])
+                line += f' (p50 {p50:.2f} мс, p95 {p95:.2f} мс)'
+            self.stdout.write(line)
+            for scan in report.scans:
+                self.stdout.write(f'    просмотр: {scan}')
+            for index in report.missing_indexes:
+                self.stdout.write(f'    недостающий индекс: {index}')
+            if options['plan']:
+                self.stdout.write(report.plan)
+
+        if problems and options['strict']:
+            raise CommandError(f'Запросов с полным просмотром или недостающим индексом: {problems}')
+        self.stdout.write(f'Проверено путей: {len(reports)}, с проблемами: {problems}')
@@ -0,0 +1,13 @@
+# builds/management/commands/recompute_build_prices.py
+from django.core.management.base import BaseCommand
+
+from builds.models import Build
+from builds.pricing import recompute_builds
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает общую стоимость и TDP всех сборок.'
+
+    def handle(self, *args, **options):
+        total = recompute_builds(Build.objects.all())
+        self.stdout.write(self.style.SUCCESS(f'Пересчитано сборок: {total}'))
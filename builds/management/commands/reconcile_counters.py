@@ -0,0 +1,14 @@
+# builds/management/commands/reconcile_counters.py
+from django.core.management.base import BaseCommand
+
+from builds.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Сверяет счетчики панели сотрудника с базой (запускается периодически, например из cron).'
+
+    def handle(self, *args, **options):
+        values = reconcile_counters()
+        for name, value in values.items():
+            self.stdout.write(f'{name}: {value}')
+        self.stdout.write(self.style.SUCCESS(f'Сверено счетчиков: {len(values)}'))
@@ -0,0 +1,70 @@
+# builds/management/commands/run_benchmark.py
+from django.core.management.base import BaseCommand, CommandError
+
+from builds.benchmark import (
+    BENCHMARK_NAMESPACES,
+    DEFAULT_REPEAT,
+    DEFAULT_THRESHOLD,
+    BenchmarkDatabaseError,
+    compare,
+    load_report,
+    run,
+    save_report,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Измеряет время, число запросов и пиковую память для всех URL приложений components, '
+        'builds, games и users и основных сервисов; сохраняет отчет в JSON и сравнивает с прошлым. '
+        'Только для базы замеров: настройка BENCHMARK_DATABASE = True или DEBUG = True и флаг --yes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'namespaces', nargs='*', default=list(BENCHMARK_NAMESPACES),
+            help='Приложения для замеров (по умолчанию все).',
+        )
+        parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help='Повторов каждого URL.')
+        parser.add_argument('--output', help='Файл для отчета JSON.')
+        parser.add_argument('--compare', help='Отчет JSON прошлого запуска для сравнения.')
+        parser.add_argument(
+            '--threshold', type=float, default=DEFAULT_THRESHOLD,
+            help='Допустимый рост p50 при сравнении (доля, 0.2 = 20%%).',
+        )
+        parser.add_argument('--no-services', action='store_true', help='Не измерять сервисы (только URL).')
+        parser.add_argument('--strict', action='store_true', help='Завершиться с ошибкой, если есть регрессии.')
+        parser.add_argument(
+            '--yes', action='store_true',
+            help='Подтвердить запись в базу по умолчанию при DEBUG = True (без настройки BENCHMARK_DATABASE).',
+        )
+
+    def handle(self, *args, **options):
+        unknown = set(options['namespaces']) - set(BENCHMARK_NAMESPACES)
+        if unknown:
+            raise CommandError(
+                f"Неизвестные приложения: {', '.join(sorted(unknown))}. Доступны: {', '.join(BENCHMARK_NAMESPACES)}"
+            )
+        previous = load_report(options['compare']) if options['compare'] else None
+
+        try:
+            report = run(
+                repeat=max(options['repeat'], 0),
+                namespaces=options['namespaces'],
+                services=not options['no_services'],
+                stdout=self.stdout,
+                confirmed=options['yes'],
+            )
+        except BenchmarkDatabaseError as error:
+            raise CommandError(str(error))
+        if options['output']:
+            save_report(report, options['output'])
+            self.stdout.write(f"Отчет сохранен: {options['output']}")
+
+        if previous is not None:
+            regressions = compare(previous, report, options['threshold'])
+            for line in regressions:
+                self.stdout.write(self.style.WARNING(f'    регрессия: {line}'))
+            if regressions and options['strict']:
+                raise CommandError(f'Регрессий: {len(regressions)}')
+            self.stdout.write(f'Регрессий: {len(regressions)}')
@@ -0,0 +1,55 @@
+# builds/management/commands/seed_benchmark.py
+from django.core.management.base import BaseCommand, CommandError
+
+from builds.benchmark import (
+    DEFAULT_COMPONENTS,
+    DEFAULT_FPS_ROWS,
+    DEFAULT_GAMES,
+    DEFAULT_ORDERS,
+    DEFAULT_USERS,
+    BenchmarkDatabaseError,
+    seed,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет базу большим сгенерированным каталогом (компоненты по прототипам из фикстур, '
+        'пользователи, заказы, замеры FPS) для замеров производительности. Только для базы замеров: '
+        'настройка BENCHMARK_DATABASE = True или DEBUG = True и флаг --yes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--components', type=int, default=DEFAULT_COMPONENTS, help='Компонентов (поровну на тип).')
+        parser.add_argument('--users', type=int, default=DEFAULT_USERS, help='Покупателей.')
+        parser.add_argument('--games', type=int, default=DEFAULT_GAMES, help='Игр.')
+        parser.add_argument('--orders', type=int, default=DEFAULT_ORDERS, help='Заказов.')
+        parser.add_argument('--fps-rows', type=int, default=DEFAULT_FPS_ROWS, help='Замеров FPS.')
+        parser.add_argument('--seed', type=int, default=None, help='Начальное значение генератора (воспроизводимые данные).')
+        parser.add_argument(
+            '--skip-derived', action='store_true',
+            help='Не пересчитывать поисковый индекс, граф совместимости, популярность и счетчики.',
+        )
+        parser.add_argument(
+            '--yes', action='store_true',
+            help='Подтвердить запись в базу по умолчанию при DEBUG = True (без настройки BENCHMARK_DATABASE).',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            created = seed(
+                components=options['components'],
+                users=options['users'],
+                games=options['games'],
+                orders=options['orders'],
+                fps_rows=options['fps_rows'],
+                seed_value=options['seed'],
+                derived=not options['skip_derived'],
+                stdout=self.stdout,
+                confirmed=options['yes'],
+            )
+        except BenchmarkDatabaseError as error:
+            raise CommandError(str(error))
+        for name, value in created.items():
+            self.stdout.write(f'{name}: {value}')
+        self.stdout.write(self.style.SUCCESS('База заполнена.'))
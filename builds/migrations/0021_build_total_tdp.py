@@ -0,0 +1,26 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:11
+
+from django.db import migrations, models
+
+
+def recompute_totals(apps, schema_editor):
+    """Заполняет total_price и total_tdp существующих сборок."""
+    from builds.pricing import recompute_builds
+
+    recompute_builds(apps.get_model('builds', 'Build').objects.all())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builds', '0020_remove_cartitem_price_alter_build_total_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='build',
+            name='total_tdp',
+            field=models.PositiveIntegerField(default=0, verbose_name='Общий TDP (Вт)'),
+        ),
+        migrations.RunPython(recompute_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builds', '0021_build_total_tdp'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['is_completed', '-order_date', '-id'], name='builds_order_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='returnrequest',
+            index=models.Index(fields=['status', '-request_date'], name='builds_return_status_idx'),
+        ),
+    ]
@@ -5,6 +5,7 @@ from django.contrib.auth.models import User
 from django.db import models
 import uuid
 
+from .pricing import build_totals
 from components.models import (
     CPU,
     GPU,
@@ -78,7 +79,11 @@ class Build(models.Model):
         verbose_name="Общая стоимость",
         blank=True,
         null=True,
-    )  # Общая стоимость сборки.  Может быть рассчитана автоматически.
+    )  # Общая стоимость сборки. Пересчитывается при сохранении сборки и изменении цен компонентов (builds.pricing).
+    total_tdp = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Общий TDP (Вт)",
+    )  # Суммарный TDP процессора и видеокарты. Поддерживается так же, как total_price.
     cooler = models.ForeignKey(
         Cooler,
         on_delete=models.SET_NULL,
@@ -94,6 +99,14 @@ class Build(models.Model):
             f"Сборка {self.pk} - {self.cpu.model if self.cpu else 'Без CPU'}"
         )  # Возвращает строку, содержащую ID сборки и модель процессора (если он есть).
 
+    def save(self, *args, **kwargs):
+        """Сохраняет сборку, пересчитывая общую стоимость и TDP."""
+        self.total_price, self.total_tdp = build_totals(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'total_price', 'total_tdp'}
+        super().save(*args, **kwargs)
+
     @admin.display(description='Общая стоимость')
     def get_total_price(self):
         """Вычисляет и возвращает общую стоимость сборки."""
@@ -196,52 +209,31 @@ class CartItem(models.Model):
         null=True,
     )
 
+    PRODUCT_LABELS = {
+        'cpu': 'CPU',
+        'gpu': 'GPU',
+        'motherboard': 'Motherboard',
+        'ram': 'RAM',
+        'storage': 'Storage',
+        'psu': 'PSU',
+        'case': 'Case',
+        'cooler': 'Cooler',
+    }  # Префиксы строкового представления для компонентов.
+
     def __str__(self):
         """Строковое представление элемента корзины."""
-        if self.build:
-            return (
-                f"Сборка {self.build.pk} в корзине для "
-                f"{self.user.username}"
-            )
-        elif self.cpu:
-            return (
-                f"CPU {self.cpu.manufacturer} {self.cpu.model} для "
-                f"{self.user.username}"
-            )
-        elif self.gpu:
-            return (
-                f"GPU {self.gpu.manufacturer} {self.gpu.model} для "
-                f"{self.user.username}"
-            )
-        elif self.motherboard:
-            return (
-                f"Motherboard {self.motherboard.manufacturer} "
-                f"{self.motherboard.model} для {self.user.username}"
-            )
-        elif self.ram:
-            return (
-                f"RAM {self.ram.manufacturer} {self.ram.model} для "
-                f"{self.user.username}"
-            )
-        elif self.storage:
-            return (
-                f"Storage {self.storage.manufacturer} {self.storage.model} для "
-                f"{self.user.username}"
-            )
-        elif self.psu:
-            return (
-                f"PSU {self.psu.manufacturer} {self.psu.model} для "
-                f"{self.user.username}"
-            )
-        elif self.case:
+        from .cart import cart_item_product  # Локальный импорт: cart.py импортирует модели.
+
+        product_type, product = cart_item_product(self)
+        if product_type == 'build':
             return (
-                f"Case {self.case.manufacturer} {self.case.model} для "
+                f"Сборка {product.pk} в корзине для "
                 f"{self.user.username}"
             )
-        elif self.cooler:
+        elif product is not None:
             return (
-                f"Cooler {self.cooler.manufacturer} {self.cooler.model} для "
-                f"{self.user.username}"
+                f"{self.PRODUCT_LABELS[product_type]} {product.manufacturer} "
+                f"{product.model} для {self.user.username}"
             )
         else:
             return (
@@ -250,34 +242,9 @@ class CartItem(models.Model):
 
     def get_total_price(self):
         """Вычисляет и возвращает общую стоимость элемента корзины с учетом количества."""
-        try:  # Оборачиваем в try-except для обработки возможных ошибок
-            price = 0
-            if self.build:
-                price = self.build.total_price or 0
-            elif self.cpu:
-                price = self.cpu.price or 0
-            elif self.gpu:
-                price = self.gpu.price or 0
-            elif self.motherboard:
-                price = self.motherboard.price or 0
-            elif self.ram:
-                price = self.ram.price or 0
-            elif self.storage:
-                price = self.storage.price or 0
-            elif self.psu:
-                price = self.psu.price or 0
-            elif self.case:
-                price = self.case.price or 0
-            elif self.cooler:
-                price = self.cooler.price or 0
-
-            quantity = self.quantity or 1
-            total = price * quantity
-            print(f"get_total_price: item={self}, price={price}, quantity={quantity}, total={total}")  # Лог!
-            return total
-        except Exception as e:
-            print(f"Ошибка в get_total_price: {e}")
-            return 0  # Возвращаем 0 в случае ошибки
+        from .cart import cart_item_unit_price
+
+        return cart_item_unit_price(self) * (self.quantity or 1)  # Decimal; связи лучше загрузить через select_related.
 
     class Meta:
         """Метаданные модели элемента корзины."""
@@ -375,6 +342,13 @@ class Order(models.Model):
         verbose_name = "Заказ"  # Название модели в единственном числе.
         verbose_name_plural = "Заказы"  # Название модели во множественном числе.
         ordering = ['-order_date']  # Сортировка заказов по дате в обратном порядке (от новых к старым).
+        indexes = [
+            models.Index(
+                fields=['is_completed', '-order_date', '-id'],
+                name='builds_order_completed_idx',
+            ),
+            models.Index(fields=['order_date'], name='builds_order_date_idx'),
+        ]  # Страницы текущих и выданных заказов: фильтр по is_completed и сортировка без отдельного SORT; заказы последних дней (components.popularity).
 
 
 class OrderItem(models.Model):
@@ -467,3 +441,9 @@ class ReturnRequest(models.Model):
         verbose_name = "Запрос на возврат"  # Название модели в единственном числе.
         verbose_name_plural = "Запросы на возврат"  # Название модели во множественном числе.
         ordering = ['-request_date']  # Сортировка запросов на возврат по дате в обратном порядке (от новых к старым).
+        indexes = [
+            models.Index(
+                fields=['status', '-request_date'],
+                name='builds_return_status_idx',
+            ),
+        ]  # Запросы на возврат по статусу (счетчик «На рассмотрении») от новых к старым.
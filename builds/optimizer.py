@@ -0,0 +1,292 @@
+# builds/optimizer.py
+from bisect import bisect_left, bisect_right, insort
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+
+from components.compatibility import COMPATIBILITY_RULES, supported_form_factors
+from components.versioning import catalog_changed_at
+from fps_data.prediction import FPS_DATA_VERSION_KEY, fps_predictor
+from .configurator import catalog_options
+
+BUDGET_DIGITS = 2  # Значащих цифр в корзине бюджета: 153 000 -> 150 000, бюджеты одной корзины делят кэш.
+DEFAULT_SETTINGS = 'high'  # Настройки графики, если игра задана без настроек.
+DEFAULT_TOP = 3  # Количество сборок в ответе по умолчанию.
+MAX_TOP = 10  # Наибольшее количество сборок в ответе.
+CANDIDATES_PER_RESULT = 4  # Запас кандидатов на одну сборку для финальной проверки правилами.
+OPTIMIZER_CACHE_TIMEOUT = 60 * 60  # Время жизни результатов в кэше (секунды); изменения каталога меняют ключ.
+
+
+def budget_bucket(budget):
+    """Нижняя граница корзины бюджета: подбор для нее не превышает исходный бюджет."""
+    budget = Decimal(budget)
+    step = Decimal(10) ** max(budget.adjusted() - BUDGET_DIGITS + 1, 0)
+    return (budget // step) * step
+
+
+def _available(options, component_type):
+    """Компоненты типа в наличии с известной ценой."""
+    return [
+        component for component in options[component_type]
+        if component.in_stock and component.price is not None
+    ]
+
+
+def _cheapest(components):
+    return min(components, key=lambda component: component.price, default=None)
+
+
+def _cheapest_at_most(components, key):
+    """
+    Функция «самый дешевый компонент с key(component) <= x».
+
+    Компоненты сортируются по key, префиксные минимумы цены ищутся бинарным поиском.
+    """
+    components = sorted(components, key=key)
+    keys = [key(component) for component in components]
+    best = []
+    for component in components:
+        best.append(component if not best or component.price < best[-1].price else best[-1])
+
+    def lookup(value):
+        index = bisect_right(keys, value)
+        return best[index - 1] if index else None
+
+    return lookup
+
+
+def _cheapest_at_least(components, key):
+    """Функция «самый дешевый компонент с key(component) >= x» (суффиксные минимумы цены)."""
+    components = sorted(components, key=key)
+    keys = [key(component) for component in components]
+    best = [None] * len(components)
+    for index in range(len(components) - 1, -1, -1):
+        following = best[index + 1] if index + 1 < len(components) else None
+        component = components[index]
+        best[index] = component if following is None or component.price < following.price else following
+
+    def lookup(value):
+        index = bisect_left(keys, value)
+        return best[index] if index < len(best) else None
+
+    return lookup
+
+
+def _platforms(motherboards, rams, cases):
+    """
+    Самая дешевая платформа (плата, память, корпус) для каждого сокета.
+
+    Условия повторяют правила совместимости: тип памяти платы и частота не выше
+    максимальной, форм-фактор платы среди поддерживаемых корпусом.
+    """
+    ram_lookups = {}
+    for ram in rams:
+        ram_lookups.setdefault(ram.type, []).append(ram)
+    ram_lookups = {
+        ram_type: _cheapest_at_most(items, lambda ram: ram.frequency)
+        for ram_type, items in ram_lookups.items()
+    }
+    case_by_form_factor = {}
+    for case in cases:
+        for form_factor in supported_form_factors(case):
+            current = case_by_form_factor.get(form_factor)
+            if current is None or case.price < current.price:
+                case_by_form_factor[form_factor] = case
+
+    platforms = {}
+    for motherboard in motherboards:
+        lookup = ram_lookups.get(motherboard.ram_type)
+        ram = lookup(motherboard.max_ram_frequency) if lookup else None
+        case = case_by_form_factor.get((motherboard.form_factor or '').strip().lower())
+        if ram is None or case is None:
+            continue
+        total = motherboard.price + ram.price + case.price
+        best = platforms.get(motherboard.socket)
+        if best is None or total < best[0]:
+            platforms[motherboard.socket] = (total, motherboard, ram, case)
+    return platforms
+
+
+def _frontier(costs, effects, depth):
+    """
+    Индексы компонентов, которые дешевле-и-лучше не более чем depth - 1 других.
+
+    Компонент, у которого есть depth доминирующих (не дороже и не слабее),
+    не может войти в depth лучших сборок: замена на любой из доминирующих
+    дает сборку не хуже и не дороже. Поэтому перебор пар ограничивается
+    «глубокой» границей Парето, а не всем каталогом.
+    """
+    order = np.lexsort((-effects, costs))  # По цене, при равной цене - сильнее первыми.
+    seen = []  # Вклады уже просмотренных (не более дорогих) компонентов по возрастанию.
+    kept = []
+    for index in order:
+        if not np.isfinite(costs[index]):
+            break  # Дальше только компоненты без совместимой платформы или блока питания.
+        effect = effects[index]
+        if len(seen) - bisect_left(seen, effect) < depth:
+            kept.append(index)
+        insort(seen, effect)
+    return np.array(kept, dtype=np.int64)
+
+
+def _compatible(components):
+    """Финальная проверка сборки правилами совместимости компонентов."""
+    return all(
+        rule.check(components[rule.first], components[rule.second])
+        for rule in COMPATIBILITY_RULES
+        if components.get(rule.first) is not None and components.get(rule.second) is not None
+    )
+
+
+def _describe(component):
+    return {
+        'id': component.pk,
+        'name': f"{component.manufacturer} {component.model}",
+        'price': str(component.price),
+    }
+
+
+def find_builds(budget, game_id=None, settings=DEFAULT_SETTINGS, top=DEFAULT_TOP):
+    """
+    Лучшие совместимые сборки из компонентов в наличии, не дороже budget.
+
+    Производительность сборки определяют процессор и видеокарта, поэтому
+    остальные слоты заполняются самыми дешевыми совместимыми компонентами:
+    для процессора - платформа его сокета, для видеокарты - самый дешевый
+    достаточный блок питания. Процессоры и видеокарты, которым есть несколько
+    более дешевых и более сильных замен, отбрасываются (_frontier); стоимость и
+    оценка оставшихся пар считаются матрицами NumPy, лучшие пары в бюджете
+    выбираются argpartition.
+    Оценка - средний FPS в игре (fps_data.prediction) или, без игры, относительная
+    производительность пары. Возвращает список словарей, лучшие первыми.
+    """
+    budget = Decimal(budget)
+    options = catalog_options()
+    cpus = _available(options, 'cpu')
+    gpus = _available(options, 'gpu')
+    storage = _cheapest(_available(options, 'storage'))
+    cooler = _cheapest(_available(options, 'cooler'))  # Кулер необязателен: боксовые процессоры.
+    platforms = _platforms(
+        _available(options, 'motherboard'), _available(options, 'ram'), _available(options, 'case')
+    )
+    psu_for = _cheapest_at_least(_available(options, 'psu'), lambda psu: psu.power)
+    if not cpus or not gpus or storage is None:
+        return []
+
+    psus = [psu_for(gpu.tdp) for gpu in gpus]
+    fixed = storage.price + (cooler.price if cooler else 0)
+    cpu_cost = np.array(
+        [
+            float(cpu.price + platforms[cpu.socket][0]) if cpu.socket in platforms else np.inf
+            for cpu in cpus
+        ]
+    )
+    gpu_cost = np.array(
+        [float(gpu.price + psu.price) if psu else np.inf for gpu, psu in zip(gpus, psus)]
+    )
+    model = fps_predictor.model()
+    cpu_effect, gpu_effect = model.effects(
+        np.array([cpu.pk for cpu in cpus]), np.array([gpu.pk for gpu in gpus])
+    )
+    depth = top * CANDIDATES_PER_RESULT
+    cpus_kept = _frontier(cpu_cost, cpu_effect, depth)
+    gpus_kept = _frontier(gpu_cost, gpu_effect, depth)
+    cpus = [cpus[index] for index in cpus_kept]
+    gpus = [gpus[index] for index in gpus_kept]
+    psus = [psus[index] for index in gpus_kept]
+    cost = (
+        cpu_cost[cpus_kept][:, None] + gpu_cost[gpus_kept][None, :] + float(fixed)
+    )  # Полная стоимость каждой пары.
+
+    cpu_ids = np.array([cpu.pk for cpu in cpus], dtype=np.int64)[:, None]
+    gpu_ids = np.array([gpu.pk for gpu in gpus], dtype=np.int64)[None, :]
+    fps = None
+    if game_id is not None:
+        fps = model.predict(game_id, settings, cpu_ids, gpu_ids)
+        if not fps.confidence.any():
+            fps = None  # Замеров для игры нет - оцениваем общую производительность.
+    score = fps.avg_fps if fps is not None else model.performance(cpu_ids, gpu_ids)
+    score = np.where((cost <= float(budget)) & ~np.isnan(score), score, -np.inf)
+
+    feasible = np.flatnonzero(np.isfinite(score))
+    if not len(feasible):
+        return []
+    limit = min(len(feasible), depth)
+    flat_score = score.ravel()[feasible]
+    candidates = feasible[np.argpartition(-flat_score, limit - 1)[:limit]]
+    candidates = candidates[
+        np.lexsort((cost.ravel()[candidates], -score.ravel()[candidates]))
+    ]  # Сначала лучшая оценка, при равной - дешевле.
+
+    results = []
+    for flat_index in candidates:
+        cpu_index, gpu_index = np.unravel_index(flat_index, cost.shape)
+        cpu, gpu, psu = cpus[cpu_index], gpus[gpu_index], psus[gpu_index]
+        _, motherboard, ram, case = platforms[cpu.socket]
+        components = {
+            'cpu': cpu,
+            'gpu': gpu,
+            'motherboard': motherboard,
+            'ram': ram,
+            'storage': storage,
+            'psu': psu,
+            'case': case,
+            'cooler': cooler,
+        }
+        if not _compatible(components):
+            continue
+        results.append(
+            {
+                'components': {
+                    component_type: _describe(component)
+                    for component_type, component in components.items()
+                    if component is not None
+                },
+                'total_price': str(
+                    sum(component.price for component in components.values() if component is not None)
+                ),
+                'score': round(float(score[cpu_index, gpu_index]), 4),
+                'avg_fps': int(fps.avg_fps[cpu_index, gpu_index]) if fps is not None else None,
+                'confidence': (
+                    round(float(fps.confidence[cpu_index, gpu_index]), 2) if fps is not None else None
+                ),
+            }
+        )
+        if len(results) == top:
+            break
+    return results
+
+
+def best_builds(budget, game_id=None, settings=DEFAULT_SETTINGS, top=DEFAULT_TOP):
+    """
+    find_builds для корзины бюджета с кэшированием.
+
+    Ключ включает корзину бюджета, игру, настройки и версии каталога (компоненты
+    и запасы) и замеров FPS, поэтому результаты устаревают вместе с данными.
+    """
+    bucket = budget_bucket(budget)
+    version = catalog_changed_at()
+    key = None
+    if version is not None:
+        try:
+            fps_version = cache.get(FPS_DATA_VERSION_KEY, 0)
+        except Exception:
+            fps_version = None
+        if fps_version is not None:
+            key = f'best_builds:{version!r}:{fps_version}:{bucket}:{game_id}:{settings}:{top}'
+    if key is not None:
+        try:
+            results = cache.get(key)
+        except Exception:
+            results = None
+        if results is not None:
+            return results
+
+    results = find_builds(bucket, game_id, settings, top)
+    if key is not None:
+        try:
+            cache.set(key, results, OPTIMIZER_CACHE_TIMEOUT)
+        except Exception:
+            pass
+    return results
@@ -0,0 +1,103 @@
+# builds/preview.py
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.template.loader import render_to_string
+
+from components.compatibility import incompatibilities, normalize_selection
+from components.resolver import COMPONENT_MODELS
+from components.versioning import components_changed_at
+from .pricing import POWERED_FIELDS
+
+PREVIEW_TEMPLATE = 'builds/build_preview.html'
+PREVIEW_CACHE_TIMEOUT = 60 * 60  # Время жизни предпросмотра в кэше (секунды); изменения компонентов меняют ключ.
+
+
+def preview_cache_key(selection):
+    """
+    Ключ кэша предпросмотра: версия компонентов и отсортированный набор (тип, ID).
+
+    None, если общий кэш недоступен.
+    """
+    version = components_changed_at()
+    if version is None:
+        return None
+    components = ','.join(
+        f'{component_type}={component_id}'
+        for component_type, component_id in sorted(selection.items())
+    )
+    return f'build_preview:{version!r}:{components}'
+
+
+def load_components(selection):
+    """
+    Загружает выбранные компоненты: один запрос на тип с производителем.
+
+    Возвращает {тип: компонент}; если компонент не найден, выбрасывает DoesNotExist его модели.
+    """
+    components = {}
+    for component_type, component_id in selection.items():
+        model = COMPONENT_MODELS[component_type]
+        component = model.objects.select_related('manufacturer').filter(pk=component_id).first()
+        if component is None:
+            raise model.DoesNotExist(f'{component_type} #{component_id} не найден')
+        components[component_type] = component
+    return components
+
+
+def _render_preview(selection):
+    """Рассчитывает и рендерит предпросмотр без кэша."""
+    components = load_components(selection)
+    errors = incompatibilities(selection)
+    total_price = sum(
+        (component.price for component in components.values() if component.price is not None),
+        Decimal('0'),
+    )  # Общая стоимость сборки.
+    wattage = sum(
+        components[component_type].tdp
+        for component_type in POWERED_FIELDS
+        if component_type in components
+    )  # Оценка потребления: TDP процессора и видеокарты.
+    psu = components.get('psu')
+
+    context = {component_type: components.get(component_type) for component_type in COMPONENT_MODELS}
+    context.update(
+        {
+            'total_price': total_price,
+            'error_message': ' '.join(errors) if errors else None,
+        }
+    )
+    return {
+        'html': render_to_string(PREVIEW_TEMPLATE, context),
+        'total_price': str(total_price),
+        'errors': errors,
+        'wattage': wattage,
+        'psu_power': psu.power if psu else None,
+    }
+
+
+def build_preview_data(selection):
+    """
+    Предпросмотр сборки: HTML фрагмент и данные (цена, ошибки, потребление).
+
+    Результат кэшируется в общем кэше по набору компонентов и версии компонентов,
+    поэтому популярные комбинации отдаются без запросов к базе и рендеринга.
+    Если компонент не найден, выбрасывает ObjectDoesNotExist.
+    """
+    selection = normalize_selection(selection)
+    key = preview_cache_key(selection)
+    if key is not None:
+        try:
+            data = cache.get(key)
+        except Exception:
+            data = None
+        if data is not None:
+            return data
+
+    data = _render_preview(selection)
+    if key is not None:
+        try:
+            cache.set(key, data, PREVIEW_CACHE_TIMEOUT)
+        except Exception:
+            pass
+    return data
@@ -0,0 +1,70 @@
+# builds/pricing.py
+from decimal import Decimal
+
+from django.db.models import DecimalField, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+PRICED_FIELDS = (
+    'cpu',
+    'gpu',
+    'motherboard',
+    'ram',
+    'storage',
+    'psu',
+    'case',
+    'cooler',
+)  # Компоненты сборки, цены которых входят в общую стоимость.
+POWERED_FIELDS = ('cpu', 'gpu')  # Компоненты, TDP которых входит в общее потребление.
+
+
+def build_totals(build):
+    """Возвращает (общая стоимость, общий TDP) для сборки по загруженным компонентам."""
+    total_price = Decimal('0')
+    total_tdp = 0
+    for name in PRICED_FIELDS:
+        if getattr(build, f'{name}_id') is None:
+            continue
+        component = getattr(build, name)
+        total_price += component.price or 0
+        if name in POWERED_FIELDS:
+            total_tdp += component.tdp or 0
+    return total_price, total_tdp
+
+
+def _component_value(build_model, name, value_field, output_field):
+    """Коррелированный подзапрос: значение поля компонента сборки или 0, если компонента нет."""
+    component_model = build_model._meta.get_field(name).related_model
+    return Coalesce(
+        Subquery(
+            component_model.objects.filter(pk=OuterRef(f'{name}_id')).values(value_field)[:1]
+        ),
+        Value(0),
+        output_field=output_field,
+    )
+
+
+def totals_expressions(build_model):
+    """Выражения total_price и total_tdp для UPDATE сборок модели build_model."""
+    price_field = DecimalField(max_digits=10, decimal_places=2)
+    total_price = Value(0, output_field=price_field)
+    for name in PRICED_FIELDS:
+        total_price = total_price + _component_value(build_model, name, 'price', price_field)
+    total_tdp = Value(0, output_field=IntegerField())
+    for name in POWERED_FIELDS:
+        total_tdp = total_tdp + _component_value(build_model, name, 'tdp', IntegerField())
+    return {'total_price': total_price, 'total_tdp': total_tdp}
+
+
+def recompute_builds(queryset):
+    """
+    Пересчитывает total_price и total_tdp сборок queryset одним UPDATE.
+
+    Значения берутся подзапросами к таблицам компонентов, поэтому сборки не
+    загружаются в Python. Возвращает количество обновленных сборок.
+    """
+    return queryset.update(**totals_expressions(queryset.model))
+
+
+def builds_using(build_model, component_type, component_ids):
+    """Сборки, в которых используется один из компонентов типа component_type."""
+    return build_model.objects.filter(**{f'{component_type}__in': component_ids})
@@ -0,0 +1,155 @@
+# builds/query_plans.py
+import time
+import xml.etree.ElementTree as ET
+from collections import namedtuple
+
+from django.db import connection
+
+from components.models import CPU, Motherboard, Stock
+from fps_data.models import FPSData
+from users.models import Transaction
+from .models import CartItem, Order, ReturnRequest
+
+SHOWPLAN_NS = '{http://schemas.microsoft.com/sqlserver/2004/07/showplan}'  # Пространство имен XML плана MSSQL.
+MSSQL_SCAN_OPS = ('Table Scan', 'Clustered Index Scan')  # Операторы MSSQL, читающие всю таблицу.
+
+HotPath = namedtuple('HotPath', 'name description queryset')
+PlanReport = namedtuple('PlanReport', 'name description scans missing_indexes plan')
+
+
+def _sample(model, field, default):
+    """Значение поля первой записи модели, чтобы план строился на реальных параметрах."""
+    value = model.objects.order_by().values_list(field, flat=True).first()
+    return default if value is None else value
+
+
+def hot_paths():
+    """Частые запросы приложения: по одному QuerySet на путь, параметры берутся из базы."""
+    stock_type = _sample(Stock, 'component_type', 'cpu')
+    stock_id = _sample(Stock, 'component_id', 1)
+    user_id = _sample(Order, 'user_id', 1)
+    game_id = _sample(FPSData, 'game_id', 1)
+    cpu_id = _sample(FPSData, 'cpu_id', 1)
+    gpu_id = _sample(FPSData, 'gpu_id', 1)
+    socket = _sample(CPU, 'socket', 'AM5')
+    return [
+        HotPath(
+            'stock_lookup', 'Запас компонента',
+            Stock.objects.filter(component_type=stock_type, component_id=stock_id),
+        ),
+        HotPath(
+            'stock_out_of_stock', 'Отсутствующие товары',
+            Stock.objects.filter(quantity=0).order_by('component_type', 'component_id'),
+        ),
+        HotPath(
+            'open_orders', 'Текущие заказы (первая страница)',
+            Order.objects.filter(is_completed=False).order_by('-order_date', '-id')[:10],
+        ),
+        HotPath(
+            'order_history', 'Выданные заказы (первая страница)',
+            Order.objects.filter(is_completed=True).order_by('-order_date', '-id')[:10],
+        ),
+        HotPath(
+            'order_track_number', 'Заказ по трек-номеру',
+            Order.objects.filter(track_number=_sample(Order, 'track_number', 'ABCDEF12')),
+        ),
+        HotPath('cart_items', 'Корзина пользователя', CartItem.objects.filter(user_id=user_id)),
+        HotPath(
+            'user_transactions', 'История транзакций',
+            Transaction.objects.filter(user_id=user_id).order_by('-timestamp')[:20],
+        ),
+        HotPath(
+            'pending_returns', 'Запросы на возврат на рассмотрении',
+            ReturnRequest.objects.filter(status='pending').order_by('-request_date'),
+        ),
+        HotPath(
+            'fps_lookup', 'Замер FPS пары',
+            FPSData.objects.filter(game_id=game_id, settings='high', cpu_id=cpu_id, gpu_id=gpu_id),
+        ),
+        HotPath('cpu_socket', 'Процессоры сокета', CPU.objects.filter(socket=socket)),
+        HotPath('motherboard_socket', 'Материнские платы сокета', Motherboard.objects.filter(socket=socket)),
+    ]
+
+
+def _mssql_plan(sql, params):
+    """План MSSQL (SHOWPLAN_XML): запрос не выполняется."""
+    with connection.cursor() as cursor:
+        cursor.execute('SET SHOWPLAN_XML ON')
+        try:
+            cursor.execute(sql, params)
+            plan = cursor.fetchone()[0]
+        finally:
+            cursor.execute('SET SHOWPLAN_XML OFF')
+    root = ET.fromstring(plan)
+    scans = []
+    for relop in root.iter(f'{SHOWPLAN_NS}RelOp'):
+        if relop.get('PhysicalOp') not in MSSQL_SCAN_OPS:
+            continue
+        table = relop.find(f'.//{SHOWPLAN_NS}Object')
+        scans.append(
+            f"{relop.get('PhysicalOp')} {table.get('Table') if table is not None else '?'}"
+            f" (~{relop.get('EstimateRows')} строк)"
+        )
+    missing = []
+    for index in root.iter(f'{SHOWPLAN_NS}MissingIndex'):
+        columns = [
+            f"{group.get('Usage')}: "
+            + ', '.join(column.get('Name') for column in group.iter(f'{SHOWPLAN_NS}Column'))
+            for group in index.iter(f'{SHOWPLAN_NS}ColumnGroup')
+        ]
+        missing.append(f"{index.get('Table')} ({'; '.join(columns)})")
+    return scans, missing, plan
+
+
+def _sqlite_plan(sql, params):
+    """
+    План SQLite (EXPLAIN QUERY PLAN): полные просмотры таблиц - строки SCAN без индекса.
+
+    Фильтр по BooleanField SQLite получает как "NOT поле", который не использует
+    индекс; в MSSQL это сравнение "= 0" с поиском по индексу.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        details = [row[-1] for row in cursor.fetchall()]
+    scans = [
+        detail for detail in details
+        if detail.startswith('SCAN') and 'INDEX' not in detail and 'CONSTANT ROW' not in detail
+    ]
+    return scans, [], '\n'.join(details)
+
+
+def explain(queryset):
+    """
+    Анализ плана запроса: (полные просмотры таблиц, недостающие индексы, текст плана).
+
+    Для MSSQL используется XML план с рекомендациями оптимизатора (MissingIndexes),
+    для SQLite - EXPLAIN QUERY PLAN; для других СУБД возвращается только текст плана.
+    """
+    sql, params = queryset.query.sql_with_params()
+    if connection.vendor == 'microsoft':
+        return _mssql_plan(sql, params)
+    if connection.vendor == 'sqlite':
+        return _sqlite_plan(sql, params)
+    return [], [], queryset.explain()
+
+
+def check_plans(paths=None):
+    """Отчеты PlanReport по частым запросам (все или с именами из paths)."""
+    reports = []
+    for path in hot_paths():
+        if paths and path.name not in paths:
+            continue
+        scans, missing, plan = explain(path.queryset)
+        reports.append(PlanReport(path.name, path.description, scans, missing, plan))
+    return reports
+
+
+def measure(queryset, repeat):
+    """Время выполнения запроса (мс): (p50, p95) по repeat запускам."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        list(queryset.all())  # all() - новый QuerySet без кэша результатов.
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.95))]
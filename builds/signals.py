@@ -0,0 +1,115 @@
+# builds/signals.py
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+
+from components.models import (
+    CPU,
+    GPU,
+    Motherboard,
+    RAM,
+    Storage,
+    PSU,
+    Case,
+    Cooler,
+    Manufacturer,
+    Stock,
+)
+from .cart import invalidate_cart, invalidate_prices
+from .counters import adjust_counters, counted_state, state_delta
+from .models import Build, CartItem, Order, ReturnRequest
+from .pricing import builds_using, recompute_builds
+
+
+@receiver(post_save, sender=CartItem)
+@receiver(post_delete, sender=CartItem)
+def invalidate_cart_on_item_change(sender, instance, **kwargs):
+    """Сбрасывает расчет корзины пользователя при изменении ее элементов."""
+    invalidate_cart(instance.user_id)
+
+
+@receiver(post_init, sender=Stock)
+@receiver(post_init, sender=ReturnRequest)
+@receiver(post_init, sender=Order)
+def remember_counted_state(sender, instance, **kwargs):
+    """Запоминает вклад загруженного объекта в счетчики панели сотрудника."""
+    instance._counted_state = counted_state(instance) if instance.pk else {}
+
+
+@receiver(post_save, sender=Stock)
+@receiver(post_save, sender=ReturnRequest)
+@receiver(post_save, sender=Order)
+def update_counters_on_save(sender, instance, **kwargs):
+    """Меняет счетчики на разность вкладов объекта до и после сохранения."""
+    state = counted_state(instance)
+    adjust_counters(state_delta(instance._counted_state, state))
+    instance._counted_state = state
+
+
+@receiver(post_delete, sender=Stock)
+@receiver(post_delete, sender=ReturnRequest)
+@receiver(post_delete, sender=Order)
+def update_counters_on_delete(sender, instance, **kwargs):
+    """Вычитает вклад удаленного объекта из счетчиков."""
+    adjust_counters(state_delta(instance._counted_state, {}))
+    instance._counted_state = {}
+
+
+@receiver(post_save, sender=Build)
+@receiver(post_save, sender=CPU)
+@receiver(post_save, sender=GPU)
+@receiver(post_save, sender=Motherboard)
+@receiver(post_save, sender=RAM)
+@receiver(post_save, sender=Storage)
+@receiver(post_save, sender=PSU)
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=Cooler)
+@receiver(post_save, sender=Manufacturer)
+def invalidate_carts_on_price_change(sender, instance, created, **kwargs):
+    """Сбрасывает расчеты корзин при изменении товаров (цены, названия)."""
+    if not created:  # Нового товара еще нет ни в одной корзине.
+        invalidate_prices()
+
+
+@receiver(post_save, sender=CPU)
+@receiver(post_save, sender=GPU)
+@receiver(post_save, sender=Motherboard)
+@receiver(post_save, sender=RAM)
+@receiver(post_save, sender=Storage)
+@receiver(post_save, sender=PSU)
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=Cooler)
+def recompute_builds_on_component_save(sender, instance, created, **kwargs):
+    """Пересчитывает стоимость и TDP сборок с измененным компонентом одним UPDATE."""
+    if not created:  # Новый компонент еще не входит ни в одну сборку.
+        recompute_builds(builds_using(Build, sender._meta.model_name, [instance.pk]))
+
+
+@receiver(pre_delete, sender=CPU)
+@receiver(pre_delete, sender=GPU)
+@receiver(pre_delete, sender=Motherboard)
+@receiver(pre_delete, sender=RAM)
+@receiver(pre_delete, sender=Storage)
+@receiver(pre_delete, sender=PSU)
+@receiver(pre_delete, sender=Case)
+@receiver(pre_delete, sender=Cooler)
+def remember_builds_on_component_delete(sender, instance, **kwargs):
+    """Запоминает сборки с удаляемым компонентом: после удаления ссылка на него обнулится."""
+    instance._affected_build_ids = list(
+        builds_using(Build, sender._meta.model_name, [instance.pk]).values_list('pk', flat=True)
+    )
+
+
+@receiver(post_delete, sender=CPU)
+@receiver(post_delete, sender=GPU)
+@receiver(post_delete, sender=Motherboard)
+@receiver(post_delete, sender=RAM)
+@receiver(post_delete, sender=Storage)
+@receiver(post_delete, sender=PSU)
+@receiver(post_delete, sender=Case)
+@receiver(post_delete, sender=Cooler)
+def recompute_builds_on_component_delete(sender, instance, **kwargs):
+    """Пересчитывает сборки, из которых удален компонент (SET_NULL не вызывает сигналов)."""
+    build_ids = getattr(instance, '_affected_build_ids', None)
+    if build_ids:
+        recompute_builds(Build.objects.filter(pk__in=build_ids))
+        invalidate_prices()  # Сборки в корзинах подешевели.
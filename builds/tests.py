@@ -0,0 +1,598 @@
+import json
+from decimal import Decimal
+from itertools import product
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+from django.core.management import call_command
+from django.db import connection
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from components.models import CPU, GPU, Manufacturer, Motherboard, Stock
+from components.stock_index import stock_index
+from pc_builder.pagination import KeysetPage
+from .benchmark import BenchmarkDatabaseError, benchmark_user, ensure_benchmark_database, seed
+from .cart import CartLine, load_cart
+from .checkout import InsufficientStockError, reserve_stock
+from .configurator import catalog_options
+from .counters import OPEN_ORDER_COUNTERS, OUT_OF_STOCK, PENDING_RETURNS, read_counters, reconcile_counters
+from .models import Build, CartItem, Order, OrderItem, ReturnRequest
+from .optimizer import _frontier, find_builds
+from .preview import build_preview_data, preview_cache_key
+
+
+def create_cpu(model, price='250.00', **fields):
+    manufacturer, _ = Manufacturer.objects.get_or_create(name='AMD', component_type='cpu')
+    values = {'cores': 8, 'frequency': 3.5, 'tdp': 65, 'socket': 'AM4'}
+    values.update(fields)
+    return CPU.objects.create(manufacturer=manufacturer, model=model, price=Decimal(price), **values)
+
+
+def create_gpu(model, price='500.00', **fields):
+    manufacturer, _ = Manufacturer.objects.get_or_create(name='NVIDIA', component_type='gpu')
+    values = {'memory': 8, 'frequency': 2.0, 'tdp': 200, 'interface': 'PCIe x16'}
+    values.update(fields)
+    return GPU.objects.create(manufacturer=manufacturer, model=model, price=Decimal(price), **values)
+
+
+def create_motherboard(model, socket, price='150.00'):
+    manufacturer, _ = Manufacturer.objects.get_or_create(name='ASUS', component_type='motherboard')
+    return Motherboard.objects.create(
+        manufacturer=manufacturer, model=model, form_factor='ATX', socket=socket, chipset='B650', ram_slots=4,
+        ram_type='DDR5', max_ram_frequency=6000, expansion_slots='PCIe x16', price=Decimal(price),
+    )
+
+
+def set_stock(component_type, component, quantity):
+    Stock.objects.update_or_create(
+        component_type=component_type, component_id=component.pk, defaults={'quantity': quantity}
+    )
+
+
+def stock_quantity(component_type, component):
+    return Stock.objects.get(component_type=component_type, component_id=component.pk).quantity
+
+
+class ReserveStockTests(TestCase):
+    """Резервирование склада при оформлении заказа: все позиции или ни одной."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer', 'buyer@example.com', 'password')
+        cls.cpu = create_cpu('Ryzen 5')
+        cls.gpu = create_gpu('RTX 4060')
+
+    def setUp(self):
+        set_stock('cpu', self.cpu, 5)
+        set_stock('gpu', self.gpu, 1)
+
+    def lines(self, cpu_quantity, gpu_quantity):
+        return [
+            CartLine(CartItem.objects.create(user=self.user, cpu=self.cpu, quantity=cpu_quantity)),
+            CartLine(CartItem.objects.create(user=self.user, gpu=self.gpu, quantity=gpu_quantity)),
+        ]
+
+    def test_reserves_every_line(self):
+        with transaction.atomic():
+            reserve_stock(self.lines(2, 1))
+        self.assertEqual(stock_quantity('cpu', self.cpu), 3)
+        self.assertEqual(stock_quantity('gpu', self.gpu), 0)
+
+    def test_shortage_leaves_all_stock_untouched(self):
+        lines = self.lines(2, 3)
+        with self.assertRaises(InsufficientStockError) as raised:
+            with transaction.atomic():
+                reserve_stock(lines)
+        shortages = [(line.product, available) for line, available in raised.exception.shortages]
+        self.assertEqual(shortages, [(self.gpu, 1)])
+        self.assertEqual(stock_quantity('cpu', self.cpu), 5)  # Позиция, которой хватало, тоже не списана.
+        self.assertEqual(stock_quantity('gpu', self.gpu), 1)
+
+    def test_rollback_of_outer_transaction_restores_stock(self):
+        lines = self.lines(2, 1)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                reserve_stock(lines)
+                raise RuntimeError('Ошибка после резервирования (например, при создании заказа)')
+        self.assertEqual(stock_quantity('cpu', self.cpu), 5)
+        self.assertEqual(stock_quantity('gpu', self.gpu), 1)
+
+    def test_caches_reset_only_after_commit(self):
+        with mock.patch('builds.checkout.stock_index') as index, \
+                mock.patch('builds.checkout.bump_component_versions') as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    reserve_stock(self.lines(1, 1))
+                    transaction.set_rollback(True)  # Как при нехватке средств на балансе.
+            index.invalidate.assert_not_called()
+            bump.assert_not_called()
+
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    reserve_stock(self.lines(1, 1))
+                    index.invalidate.assert_not_called()  # До фиксации транзакции кэши не трогаются.
+            index.invalidate.assert_called_once_with()
+            bump.assert_called_once_with({('cpu', self.cpu.pk): 1, ('gpu', self.gpu.pk): 1})
+
+    def test_missing_stock_row_counts_as_zero(self):
+        Stock.objects.filter(component_type='gpu', component_id=self.gpu.pk).delete()
+        with self.assertRaises(InsufficientStockError):
+            with transaction.atomic():
+                reserve_stock(self.lines(1, 1))
+        self.assertEqual(stock_quantity('cpu', self.cpu), 5)
+
+
+class BuildEditTests(TestCase):
+    """Редактирование сборки: итоги пересчитывает Build.save(), а не представление."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('builder', 'builder@example.com', 'password')
+        cls.cpu = create_cpu('Ryzen 5', price='250.00')
+        cls.gpu = create_gpu('RTX 4060', price='500.00')
+        cls.build = Build.objects.create(user=cls.user, cpu=cls.cpu)
+
+    def test_edit_recalculates_totals(self):
+        self.assertEqual(self.build.total_price, Decimal('250.00'))
+        response = self.client.post(
+            f'/builds/{self.build.pk}/edit/', {'cpu': self.cpu.pk, 'gpu': self.gpu.pk}
+        )
+        self.assertEqual(response.status_code, 302)
+        self.build.refresh_from_db()
+        self.assertEqual(self.build.gpu, self.gpu)
+        self.assertEqual(self.build.total_price, Decimal('750.00'))
+        self.assertEqual(self.build.total_tdp, self.cpu.tdp + self.gpu.tdp)
+
+
+class CartCacheTests(TestCase):
+    """Расчет корзины: один запрос, кэш до изменения корзины или цен."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer', password='password')
+        cls.other_user = User.objects.create_user('other', password='password')
+        cls.cpu = create_cpu('Ryzen 5', price='250.00')
+        cls.gpu = create_gpu('RTX 4060', price='300.00')
+        cls.build = Build.objects.create(user=cls.user, cpu=cls.cpu, gpu=cls.gpu)
+        CartItem.objects.create(user=cls.user, cpu=cls.cpu, quantity=2)
+        CartItem.objects.create(user=cls.user, build=cls.build)
+        CartItem.objects.create(user=cls.other_user, gpu=cls.gpu)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cart_is_loaded_once_and_cached(self):
+        with self.assertNumQueries(1):
+            cart = load_cart(self.user)
+        self.assertEqual([line.total for line in cart.lines], [Decimal('500.00'), Decimal('550.00')])
+        self.assertEqual(cart.total_price, Decimal('1050.00'))
+        with self.assertNumQueries(0):
+            self.assertEqual(load_cart(self.user).total_price, Decimal('1050.00'))
+        with self.assertNumQueries(1):
+            load_cart(self.user, use_cache=False)  # Оформление заказа - всегда свежий расчет.
+
+    def test_price_change_resets_cached_carts(self):
+        load_cart(self.user)
+        load_cart(self.other_user)
+        self.cpu.price = Decimal('200.00')
+        self.cpu.save()
+        cart = load_cart(self.user)
+        self.assertEqual([line.unit_price for line in cart.lines], [Decimal('200.00'), Decimal('500.00')])
+        self.assertEqual(cart.total_price, Decimal('900.00'))  # Цена сборки тоже пересчитана.
+
+    def test_cart_change_resets_only_own_cart(self):
+        load_cart(self.user)
+        load_cart(self.other_user)
+        CartItem.objects.filter(user=self.user, cpu=self.cpu).get().delete()
+        self.assertEqual(load_cart(self.user).total_price, Decimal('550.00'))
+        with self.assertNumQueries(0):
+            self.assertEqual(load_cart(self.other_user).total_price, Decimal('300.00'))
+
+
+class BuildPreviewTests(TestCase):
+    """Предпросмотр сборки кэшируется по набору компонентов и версии компонентов."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cpu = create_cpu('Ryzen 5', price='250.00')
+        cls.gpu = create_gpu('RTX 4060', price='300.00')
+
+    def setUp(self):
+        cache.clear()
+
+    def post(self, data):
+        return self.client.post('/builds/build_preview/', json.dumps(data), content_type='application/json')
+
+    def test_cache_key_depends_on_component_set(self):
+        key = preview_cache_key({'cpu': self.cpu.pk, 'gpu': self.gpu.pk})
+        self.assertEqual(preview_cache_key({'gpu': self.gpu.pk, 'cpu': self.cpu.pk}), key)  # Порядок не важен.
+        self.assertNotEqual(preview_cache_key({'cpu': self.cpu.pk}), key)
+        self.assertNotEqual(preview_cache_key({'cpu': self.cpu.pk, 'gpu': self.gpu.pk + 1}), key)
+
+    def test_component_change_changes_cache_key(self):
+        selection = {'cpu': self.cpu.pk, 'gpu': self.gpu.pk}
+        key = preview_cache_key(selection)
+        self.gpu.price = Decimal('280.00')
+        self.gpu.save()
+        self.assertNotEqual(preview_cache_key(selection), key)
+
+    def test_preview_is_cached_until_component_changes(self):
+        selection = {'cpu': str(self.cpu.pk), 'gpu': self.gpu.pk, 'ram': ''}  # Значения из формы приводятся к ID.
+        data = build_preview_data(selection)
+        self.assertEqual((data['total_price'], data['wattage']), ('550.00', self.cpu.tdp + self.gpu.tdp))
+        with self.assertNumQueries(0):
+            self.assertEqual(build_preview_data({'gpu': self.gpu.pk, 'cpu': self.cpu.pk}), data)
+
+        self.cpu.price = Decimal('200.00')
+        self.cpu.save()
+        self.assertEqual(build_preview_data(selection)['total_price'], '500.00')
+
+    def test_preview_view(self):
+        response = self.post({'cpu': self.cpu.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Ryzen 5', response.json()['html'])
+        self.assertEqual(self.post({'cpu': self.cpu.pk + 100}).status_code, 400)
+        response = self.client.post('/builds/build_preview/', 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+def part(pk, price, **fields):
+    """Компонент каталога конфигуратора в наличии (как в builds.configurator.catalog_options)."""
+    return SimpleNamespace(pk=pk, manufacturer='Test', model=f'#{pk}', price=Decimal(price), in_stock=True, **fields)
+
+
+class FakeModel:
+    """Модель FPS с заданными вкладами: производительность пары - сумма вкладов."""
+
+    def __init__(self, cpu_effects, gpu_effects):
+        self.cpu_effects = cpu_effects
+        self.gpu_effects = gpu_effects
+
+    def effects(self, cpu_ids, gpu_ids):
+        return (
+            np.vectorize(self.cpu_effects.get, otypes=[float])(cpu_ids),
+            np.vectorize(self.gpu_effects.get, otypes=[float])(gpu_ids),
+        )
+
+    def performance(self, cpu_ids, gpu_ids):
+        cpu_effect, gpu_effect = self.effects(cpu_ids, gpu_ids)
+        return cpu_effect + gpu_effect
+
+
+class FrontierTests(SimpleTestCase):
+    """Глубокая граница Парето: bisect по вкладам против прямого подсчета доминирующих."""
+
+    def brute_force(self, costs, effects, depth):
+        order = list(np.lexsort((-effects, costs)))
+        return [
+            index for position, index in enumerate(order)
+            if np.isfinite(costs[index])
+            and sum(effects[other] >= effects[index] for other in order[:position]) < depth
+        ]
+
+    def test_matches_brute_force(self):
+        rng = np.random.default_rng(7)
+        for depth in (1, 2, 5):
+            costs = rng.integers(1, 20, 60).astype(float)  # Повторы цен и вкладов проверяют порядок при равенстве.
+            effects = rng.integers(1, 10, 60).astype(float)
+            costs[rng.choice(60, 5, replace=False)] = np.inf  # Без платформы или блока питания.
+            self.assertEqual(list(_frontier(costs, effects, depth)), self.brute_force(costs, effects, depth))
+
+    def test_keeps_depth_equal_components(self):
+        costs = np.array([10.0, 10.0, 10.0])
+        effects = np.array([5.0, 5.0, 5.0])
+        self.assertEqual(list(_frontier(costs, effects, 2)), [0, 1])
+
+    def test_dominated_component_dropped(self):
+        costs = np.array([30.0, 10.0, 20.0, np.inf])
+        effects = np.array([1.0, 3.0, 2.0, 9.0])  # Дороже и слабее: 2 доминирует 1-й, 0 - 1-й и 2-й.
+        self.assertEqual(list(_frontier(costs, effects, 1)), [1])
+        self.assertEqual(sorted(_frontier(costs, effects, 2)), [1, 2])
+
+
+class FindBuildsTests(SimpleTestCase):
+    """Подбор сборок: отсечение границей Парето не меняет результат полного перебора пар."""
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.cpus = [
+            part(pk, f'{rng.integers(100, 600)}.00', socket='AM5' if pk % 2 else 'LGA1700', tdp=65)
+            for pk in range(1, 41)
+        ]
+        self.gpus = [part(pk, f'{rng.integers(200, 1500)}.00', tdp=int(rng.integers(100, 450))) for pk in range(101, 141)]
+        self.motherboards = [
+            part(201, '150.00', socket='AM5', ram_type='DDR5', max_ram_frequency=6000, form_factor='ATX'),
+            part(202, '120.00', socket='LGA1700', ram_type='DDR5', max_ram_frequency=5600, form_factor='Micro-ATX'),
+        ]
+        self.rams = [part(301, '90.00', type='DDR5', frequency=5600)]
+        self.cases = [part(401, '70.00', supported_motherboard_form_factors='ATX, Micro-ATX')]
+        self.psus = [part(501, '60.00', power=300), part(502, '110.00', power=500)]  # GPU с TDP выше 500 Вт не проходят.
+        self.storage = part(601, '50.00')
+        self.options = {
+            'cpu': self.cpus, 'gpu': self.gpus, 'motherboard': self.motherboards, 'ram': self.rams,
+            'storage': [self.storage], 'psu': self.psus, 'case': self.cases, 'cooler': [],
+        }
+        self.model = FakeModel(
+            {cpu.pk: float(rng.random()) for cpu in self.cpus}, {gpu.pk: float(rng.random()) for gpu in self.gpus}
+        )
+
+    def find(self, budget, top):
+        with mock.patch('builds.optimizer.catalog_options', return_value=self.options), \
+                mock.patch('builds.optimizer.fps_predictor', SimpleNamespace(model=lambda: self.model)):
+            return find_builds(budget, top=top)
+
+    def brute_force(self, budget, top):
+        """Все пары процессор - видеокарта, лучшие по оценке, при равной - дешевле."""
+        platform = {board.socket: board.price + self.rams[0].price + self.cases[0].price for board in self.motherboards}
+        builds = []
+        for cpu, gpu in product(self.cpus, self.gpus):
+            psu = min((psu for psu in self.psus if psu.power >= gpu.tdp), key=lambda psu: psu.price, default=None)
+            if psu is None:
+                continue
+            cost = cpu.price + platform[cpu.socket] + gpu.price + psu.price + self.storage.price
+            if cost <= budget:
+                score = self.model.cpu_effects[cpu.pk] + self.model.gpu_effects[gpu.pk]
+                builds.append((-score, cost, cpu.pk, gpu.pk))
+        return [(cpu, gpu) for _, _, cpu, gpu in sorted(builds)[:top]]
+
+    def test_matches_full_pair_search(self):
+        for budget, top in ((Decimal('900'), 3), (Decimal('1500'), 5), (Decimal('3000'), 10)):
+            results = self.find(budget, top)
+            self.assertEqual(
+                [(build['components']['cpu']['id'], build['components']['gpu']['id']) for build in results],
+                self.brute_force(budget, top),
+            )
+            for build in results:
+                self.assertLessEqual(Decimal(build['total_price']), budget)
+
+    def test_budget_below_cheapest_build(self):
+        self.assertEqual(self.find(Decimal('100'), 3), [])
+
+
+class CounterTests(TestCase):
+    """Счетчики панели сотрудника меняются на разность вкладов объекта до и после сохранения."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer', 'buyer@example.com', 'password')
+        cls.cpu = create_cpu('Ryzen 5')
+
+    def setUp(self):
+        cache.clear()
+        read_counters()  # Счетчики появляются в кэше при первом чтении.
+
+    def assertCountersMatchDatabase(self):
+        cached = read_counters()
+        self.assertEqual(cached, reconcile_counters())
+
+    def create_order(self, **fields):
+        return Order.objects.create(
+            user=self.user, email=self.user.email, delivery_option='pickup', payment_method='cash',
+            total_amount=Decimal('250.00'), order_date=timezone.now(), **fields
+        )
+
+    def test_order_lifecycle(self):
+        pending, confirmed = OPEN_ORDER_COUNTERS['pending'], OPEN_ORDER_COUNTERS['confirmed']
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.create_order()
+        self.assertEqual((read_counters()[pending], read_counters()[confirmed]), (1, 0))
+
+        order = Order.objects.get(pk=order.pk)  # Вклад загруженного объекта запоминает post_init.
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            order.save()
+        self.assertEqual(callbacks, [])  # Сохранение без изменений не трогает счетчики.
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.status = 'confirmed'
+            order.save()
+        self.assertEqual((read_counters()[pending], read_counters()[confirmed]), (0, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order.is_completed = True
+            order.save()
+        self.assertEqual(read_counters()[confirmed], 0)
+        self.assertCountersMatchDatabase()
+
+    def test_delete_subtracts_contribution(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.create_order()
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.get(pk=order.pk).delete()
+        self.assertEqual(read_counters()[OPEN_ORDER_COUNTERS['pending']], 0)
+        self.assertCountersMatchDatabase()
+
+    def test_stock_and_returns(self):
+        stock = Stock.objects.get(component_type='cpu', component_id=self.cpu.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            stock.quantity = 0
+            stock.save()
+        self.assertEqual(read_counters()[OUT_OF_STOCK], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            order = self.create_order(status='delivered')
+            item = OrderItem.objects.create(
+                order=order, item=str(self.cpu), price=self.cpu.price, component_type='cpu', component_id=self.cpu.pk
+            )
+            request = ReturnRequest.objects.create(user=self.user, order_item=item, reason='Брак')
+        self.assertEqual(read_counters()[PENDING_RETURNS], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            request.status = 'approved'
+            request.save()
+        self.assertEqual(read_counters()[PENDING_RETURNS], 0)
+        self.assertCountersMatchDatabase()
+
+    def test_rolled_back_change_keeps_counters(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError):
+                with transaction.atomic():
+                    self.create_order()
+                    raise RuntimeError('Откат транзакции')
+        self.assertEqual(callbacks, [])
+        self.assertEqual(read_counters()[OPEN_ORDER_COUNTERS['pending']], 0)
+
+
+class BenchmarkGuardTests(TestCase):
+    """Заполнение и замеры не запускаются на рабочей базе."""
+
+    @override_settings(BENCHMARK_DATABASE=False, DEBUG=False)
+    def test_refuses_without_benchmark_database(self):
+        with self.assertRaises(BenchmarkDatabaseError):
+            ensure_benchmark_database(confirmed=True)  # Без DEBUG флаг --yes не помогает.
+        with self.assertRaises(BenchmarkDatabaseError):
+            seed(components=0, users=0, games=0, orders=0, fps_rows=0)
+        with self.assertRaises(CommandError):
+            call_command('seed_benchmark', '--yes', stdout=None)
+        with self.assertRaises(CommandError):
+            call_command('run_benchmark', stdout=None)
+        self.assertFalse(User.objects.filter(username='bench_staff').exists())
+
+    @override_settings(BENCHMARK_DATABASE=False, DEBUG=True)
+    def test_debug_requires_confirmation(self):
+        with self.assertRaises(BenchmarkDatabaseError):
+            ensure_benchmark_database()
+        ensure_benchmark_database(confirmed=True)
+
+    @override_settings(BENCHMARK_DATABASE=True, DEBUG=False)
+    def test_benchmark_settings_allow_run(self):
+        ensure_benchmark_database()
+
+    def test_staff_user_has_unusable_password(self):
+        user = benchmark_user()
+        self.assertTrue(user.is_staff)
+        self.assertFalse(user.has_usable_password())
+
+    def test_existing_staff_password_is_disabled(self):
+        User.objects.create_user('bench_staff', password='bench_staff')  # Создан прежней версией команды.
+        self.assertFalse(benchmark_user().has_usable_password())
+        self.assertFalse(self.client.login(username='bench_staff', password='bench_staff'))
+
+
+class BuildOptionsTests(TestCase):
+    """Списки конфигуратора: совместимость, наличие и условные ответы по ETag."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cpu = create_cpu('Ryzen 5 5600', socket='AM4')
+        cls.board = create_motherboard('B550', 'AM4')
+        cls.sold_out_board = create_motherboard('A520', 'AM4')
+        cls.other_board = create_motherboard('B650', 'AM5')
+        set_stock('motherboard', cls.sold_out_board, 0)
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, params, **headers):
+        return self.client.get('/builds/build_options/', params, **headers)
+
+    def test_options_follow_selection_and_stock(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = self.get({'cpu': self.cpu.pk}).json()
+        self.assertEqual([option['id'] for option in data['options']['motherboard']], [self.board.pk])
+        self.assertEqual([option['id'] for option in data['options']['cpu']], [self.cpu.pk])
+        self.assertEqual(data['errors'], [])
+        board_query = next(query['sql'] for query in queries if 'FROM "components_motherboard"' in query['sql'])
+        self.assertIn('EXISTS', board_query)  # Наличие - подзапросом, а не списком ID в параметрах.
+
+    def test_incompatible_selection_reports_error(self):
+        data = self.get({'cpu': self.cpu.pk, 'motherboard': self.other_board.pk}).json()
+        self.assertEqual(data['errors'], ['Процессор не совместим с материнской платой.'])
+        self.assertEqual(data['options']['cpu'], [])
+
+    def test_not_modified_until_catalog_changes(self):
+        params = {'cpu': self.cpu.pk}
+        etag = self.get(params)['ETag']
+        self.assertEqual(self.get(params, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertNotEqual(self.get({'cpu': self.cpu.pk, 'motherboard': self.board.pk})['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            set_stock('motherboard', self.sold_out_board, 3)  # Поставка: список плат изменился.
+        response = self.get(params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [option['id'] for option in response.json()['options']['motherboard']],
+            [self.sold_out_board.pk, self.board.pk],
+        )  # Списки упорядочены по производителю и модели: A520, B550.
+
+
+class KeysetListTests(TestCase):
+    """Список сборок и списки заказов сотрудника листаются по курсору, ссылки сохраняют поиск."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user('employee', 'employee@example.com', 'password', is_staff=True)
+        cpu = create_cpu('Ryzen 5')
+        for _ in range(7):  # Больше одной страницы (по 6 сборок).
+            Build.objects.create(user=cls.staff, cpu=cpu)
+        for index in range(12):  # Больше одной страницы (по 10 заказов).
+            Order.objects.create(
+                user=cls.staff, email=f'buyer{index}@example.com', delivery_option='pickup', payment_method='cash',
+                total_amount=Decimal('250.00'), order_date=timezone.now(), is_completed=True,
+            )
+
+    def test_build_list_uses_cursor_links(self):
+        response = self.client.get('/builds/')
+        page = response.context['builds']
+        self.assertIsInstance(page, KeysetPage)
+        self.assertContains(response, f'href="?cursor={page.next_cursor}"')
+        self.assertNotContains(response, '?page=')
+
+        last = self.client.get('/builds/', {'cursor': page.next_cursor}).context['builds']
+        self.assertEqual(len(last), 1)
+        self.assertFalse(last.has_next())
+
+    def test_order_history_cursor_links_keep_query(self):
+        self.client.force_login(self.staff)
+        response = self.client.get('/builds/employee/orders/history/', {'q': 'example'})
+        page = response.context['page_obj']
+        self.assertIsInstance(page, KeysetPage)
+        self.assertContains(response, f'href="?q=example&amp;cursor={page.next_cursor}"')
+
+        response = self.client.get('/builds/employee/orders/history/', {'q': 'example', 'cursor': page.next_cursor})
+        last = response.context['page_obj']
+        self.assertEqual(len(last), 2)
+        self.assertContains(response, f'href="?q=example&amp;cursor={last.previous_cursor}"')
+
+        response = self.client.get('/builds/employee/orders/', {'q': 'example'})
+        self.assertIsInstance(response.context['page_obj'], KeysetPage)  # Текущих заказов нет: одна пустая страница.
+
+
+class CatalogOptionsTests(TestCase):
+    """Списки конфигуратора: каталог перечитывается при изменении компонентов, а не запасов."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cpu = create_cpu('Ryzen 5')
+
+    def setUp(self):
+        cache.clear()
+        stock_index.invalidate()
+
+    def option(self, options):
+        return next(cpu for cpu in options['cpu'] if cpu.pk == self.cpu.pk)
+
+    def test_stock_change_keeps_cached_components(self):
+        self.assertTrue(self.option(catalog_options()).in_stock)
+        with self.captureOnCommitCallbacks(execute=True):
+            set_stock('cpu', self.cpu, 0)
+
+        with CaptureQueriesContext(connection) as queries:
+            options = catalog_options()
+        self.assertFalse(self.option(options).in_stock)
+        self.assertFalse(any('"components_cpu"' in query['sql'] for query in queries))  # Только индекс запасов.
+
+        with self.assertNumQueries(0):
+            self.assertIs(catalog_options(), options)
+
+    def test_component_change_reloads_components(self):
+        catalog_options()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.cpu.price = Decimal('199.00')
+            self.cpu.save()
+        self.assertEqual(self.option(catalog_options()).price, Decimal('199.00'))
@@ -7,6 +7,8 @@ app_name = 'builds'
 urlpatterns = [
     path('create/', views.build_create, name='build_create'),
     path('build_preview/', views.build_preview, name='build_preview'),  # Добавлено!
+    path('build_options/', views.build_options, name='build_options'),
+    path('build_optimizer/', views.build_optimizer, name='build_optimizer'),
     path('', views.build_list, name='build_list'),
     path('<int:pk>/', views.build_detail, name='build_detail'),
     path('<int:pk>/edit/', views.build_edit, name='build_edit'),
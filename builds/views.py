@@ -11,19 +11,16 @@ from django.contrib.auth.decorators import (
     login_required,
     user_passes_test,
 )  # Импортируем декораторы для проверки авторизации и прав пользователя
-from django.contrib.sessions.models import Session  # Импортируем модель сессии
 from django.core.exceptions import (
     ObjectDoesNotExist,
     ValidationError,
 )  # Импортируем исключения
-from django.core.mail import send_mail  # Импортируем функцию отправки email
 from django.core.paginator import (
     EmptyPage,
     PageNotAnInteger,
     Paginator,
 )  # Импортируем классы для пагинации
 from django.db import transaction  # Импортируем transaction для атомарных операций с БД
-from django.db.models import Q  # Импортируем Q для сложных запросов к БД
 from django.http import (
     Http404,
     JsonResponse,
@@ -34,21 +31,24 @@ from django.shortcuts import (
     render,
 )  # Импортируем функции для работы с запросами/ответами
 from django.views.decorators.cache import (
+    cache_control,
     cache_page,
-)  # Импортируем декоратор для кэширования страниц
+)  # Импортируем декораторы для кэширования страниц
 from django.urls import reverse  # Импортируем reverse для получения URL по имени
 from django.utils import timezone  # Импортируем timezone для работы с датой и временем
 
 from django.views.decorators.http import (
+    condition,
+    require_GET,
     require_POST,
-)  # Импортируем декоратор для обработки только POST запросов
+)  # Импортируем декораторы для ограничения методов и условных запросов
+from pc_builder.pagination import paginate  # Импортируем пагинацию по номеру страницы или курсору
 
 from .forms import OrderUpdateForm  # Импортируем форму обновления заказа
 from .models import (
     Build,
     CartItem,
     Order,
-    OrderItem,
     ReturnRequest,
 )  # Импортируем модели
 from components.models import (
@@ -62,9 +62,45 @@ from components.models import (
     Cooler,
     Stock,
 )  # Импортируем модели компонентов
-from users.utils import (
-    send_order_status_email,
-)  # Импортируем утилиту для отправки email об изменении статуса заказа
+from .configurator import configurator_context  # Импортируем кэшируемые списки конфигуратора
+from .preview import build_preview_data  # Импортируем кэшируемый предпросмотр сборки
+from .optimizer import (
+    DEFAULT_SETTINGS,
+    DEFAULT_TOP,
+    MAX_TOP,
+    best_builds,
+    budget_bucket,
+)  # Импортируем подбор лучших сборок под бюджет
+from .cart import load_cart  # Импортируем расчет корзины
+from .dashboard import (
+    dashboard_counters,
+    dashboard_orders,
+)  # Импортируем данные страниц сотрудника
+from .checkout import (
+    InsufficientStockError,
+    create_order_items,
+    reserve_stock,
+)  # Импортируем резервирование товара и создание позиций заказа
+from components.compatibility import (
+    compatibility_error,
+    compatible_options,
+    compatible_queryset,
+    incompatibilities,
+    normalize_selection,
+    selection_of,
+)  # Импортируем проверку и подбор совместимых компонентов по графу
+from components.versioning import (
+    catalog_etag,
+    catalog_last_modified,
+)  # Импортируем версию каталога для ETag/Last-Modified
+from components.resolver import (
+    COMPONENT_MODELS,
+    prime_component_names,
+)  # Импортируем пакетную загрузку названий компонентов
+from components.stock_index import stock_index  # Импортируем индекс складских запасов
+from fps_data.models import FPSData  # Импортируем замеры FPS (коды настроек графики)
+from users.outbox import enqueue_email  # Импортируем очередь исходящей почты
+from users.notifications import notify_order_status  # Импортируем уведомления о статусе заказа
 
 logger = logging.getLogger(__name__)  # Инициализируем логгер
 
@@ -78,8 +114,9 @@ def employee_check(user):
 def employee_return_requests(request):
     """Отображает список запросов на возврат для сотрудников."""
     return_requests = (
-        ReturnRequest.objects.all().order_by('-request_date')
-    )  # Получаем все запросы на возврат, отсортированные по дате создания (от новых к старым).
+        ReturnRequest.objects.select_related('user', 'order_item')
+        .order_by('-request_date')
+    )  # Получаем все запросы на возврат с пользователем и позицией заказа, отсортированные по дате создания (от новых к старым).
     paginator = Paginator(return_requests, 10)  # Создаем объект Paginator, разбивающий запросы на страницы по 10 штук.
     page_number = request.GET.get('page')  # Получаем номер текущей страницы из GET параметра 'page'.
     try:
@@ -198,15 +235,9 @@ def get_cart_context(request):
     cart_items = []
     total_price = Decimal('0.0')
     if request.user.is_authenticated:
-        cart_items = CartItem.objects.filter(user=request.user)
-        for item in cart_items:
-            try:
-                item_price = item.get_total_price()
-                logger.debug(f"Item: {item}, Price: {item_price}, Quantity: {item.quantity}") # LOG
-                total_price += item_price
-            except Exception as e:
-                logger.error(f"Ошибка при обработке элемента корзины {item}: {e}")
-                # Можно принять решение об исключении этого элемента из корзины или обработать как-то иначе
+        cart = load_cart(request.user)  # Расчет корзины из кэша или одним запросом.
+        cart_items = cart.items
+        total_price = cart.total_price
     return {
         'cart_items': cart_items,
         'total_price': total_price,
@@ -217,43 +248,24 @@ def get_cart_context(request):
 def cart_view(request):
     """Просмотр корзины."""
     logger.info(f"User in cart_view: {request.user}")  # Логируем пользователя, зашедшего в корзину.
-    print(
-        f"Cart items in cart_view: {CartItem.objects.filter(user=request.user)}"
-    )  # Выводим в консоль элементы корзины пользователя.
 
-    # Получаем текущую сессию, блокируя ее для обновления
-    try:
-        with transaction.atomic():  # Оборачиваем операцию в транзакцию для атомарности.
-            Session.objects.select_for_update().get(
-                session_key=request.session.session_key
-            )  # Получаем сессию и блокируем ее для обновления, чтобы избежать гонок при параллельных запросах.
-            cart_items = CartItem.objects.filter(
-                user=request.user
-            )  # Получаем элементы корзины для текущего пользователя.
-            print(f"Количество элементов в корзине: {len(cart_items)}")  # Лог!
-            for item in cart_items:  # Лог для каждого элемента
-                print(f"Элемент корзины: {item}")
-            total_price = sum(
-                item.get_total_price() for item in cart_items
-            )  # Суммируем стоимость товаров в корзине.
-            context = {
-                'cart_items': cart_items,
-                'total_price': total_price,
-            }  # Создаем контекст для шаблона.
-            response = render(
-                request, 'builds/cart.html', context
-            )  # Рендерим шаблон корзины. Сохраняем response
-            response['Cache-Control'] = (
-                'private, no-cache, no-store, must-revalidate'
-            )  # Добавляем заголовки, запрещающие кэширование.
-            response['Pragma'] = 'no-cache'
-            response['Expires'] = '0'
-            return response  # Возвращаем response
-    except Session.DoesNotExist:
-        context = {'cart_items': [], 'total_price': 0}
-        return render(
-            request, 'builds/cart.html', context
-        )  # Если сессия не найдена, рендерим шаблон с пустой корзино
+    cart = load_cart(
+        request.user
+    )  # Элементы корзины со всеми товарами и итоговая сумма (до изменения корзины - из кэша).
+    logger.debug(f"Количество элементов в корзине: {len(cart)}")
+    context = {
+        'cart_items': cart.items,
+        'total_price': cart.total_price,
+    }  # Создаем контекст для шаблона.
+    response = render(
+        request, 'builds/cart.html', context
+    )  # Рендерим шаблон корзины. Сохраняем response
+    response['Cache-Control'] = (
+        'private, no-cache, no-store, must-revalidate'
+    )  # Добавляем заголовки, запрещающие кэширование.
+    response['Pragma'] = 'no-cache'
+    response['Expires'] = '0'
+    return response  # Возвращаем response
 
 
 @login_required  # Требуется авторизация пользователя
@@ -468,15 +480,6 @@ def add_to_cart(request):
 
         cart_item.save()  # Сохраняем изменения в элементе корзины.
 
-        print(
-            "CartItem saved: {}, quantity: {}, component_type: {}, "
-            "component_id: {}".format(
-                cart_item.id,
-                cart_item.quantity,
-                component_type,
-                component_id,
-            )
-        )  # Выводим в консоль информацию о сохраненном элементе корзины.
         logger.info(
             f"CartItem saved: ID={cart_item.id}, quantity={cart_item.quantity}"
         )  # Логируем сохранение элемента корзины.
@@ -511,22 +514,13 @@ def remove_from_cart(request, item_id):
 
 def build_list(request):
     """Отображает список сборок."""
-    builds_list = Build.objects.all().order_by('id')  # Получаем все сборки, отсортированные по ID.
-    paginator = Paginator(builds_list, 6)  # Создаем объект Paginator, разбивающий сборки на страницы по 6 штук.
-    page = request.GET.get('page')  # Получаем номер текущей страницы из GET параметра 'page'.
-
-    try:
-        builds = paginator.page(
-            page
-        )  # Получаем объект Page для текущей страницы.
-    except PageNotAnInteger:
-        builds = paginator.page(
-            1
-        )  # Если номер страницы не является целым числом, получаем первую страницу.
-    except EmptyPage:
-        builds = paginator.page(
-            paginator.num_pages
-        )  # Если номер страницы больше, чем общее количество страниц, получаем последнюю страницу.
+    builds = paginate(
+        request,
+        Build.objects.select_related('cpu__manufacturer', 'case'),
+        6,
+        ('id',),
+        keyset=True,
+    )  # Сборки по 6 на страницу, отсортированные по ID, по курсору без COUNT(*) и OFFSET. Стоимость берется из total_price.
 
     # --- Получаем контекст корзины ---
     cart_context = get_cart_context(
@@ -590,24 +584,12 @@ def build_create(request):
                 component = get_object_or_404(
                     model, pk=component_id
                 )  # Получаем компонент по ID.
-                # Проверяем наличие через Stock
-                try:
-                    stock = Stock.objects.get(
-                        component_type=model._meta.model_name,
-                        component_id=component_id,
-                    )  # Получаем информацию о запасах.
-                    if (
-                        stock.quantity > 0
-                    ):  # Если количество товара на складе больше 0.
-                        return component  # Возвращаем компонент.
-                    else:
-                        return (
-                            None
-                        )  # Товар не в наличии, возвращаем None.
-                except Stock.DoesNotExist:
-                    return (
-                        None
-                    )  # Stock object doesn't exist, returning None
+                # Проверяем наличие через индекс запасов
+                if stock_index.in_stock(
+                    model._meta.model_name, component.pk
+                ):  # Если количество товара на складе больше 0.
+                    return component  # Возвращаем компонент.
+                return None  # Товар не в наличии (или нет записи Stock), возвращаем None.
             except (ValueError, TypeError, ObjectDoesNotExist):
                 return (
                     None
@@ -646,76 +628,28 @@ def build_create(request):
             return render(
                 request,
                 'builds/build_create.html',
-                {
-                    'error_message': f'Следующие компоненты отсутствуют на складе: {", ".join(missing_components)}',
-                    'cpus': CPU.objects.all(),
-                    'gpus': GPU.objects.all(),
-                    'motherboards': Motherboard.objects.all(),
-                    'rams': RAM.objects.all(),
-                    'storages': Storage.objects.all(),
-                    'psus': PSU.objects.all(),
-                    'cases': Case.objects.all(),
-                    'coolers': Cooler.objects.all(),
-                },
+                configurator_context(
+                    in_stock_only=True,
+                    error_message=f'Следующие компоненты отсутствуют на складе: {", ".join(missing_components)}',
+                ),
             )  # Отображаем страницу создания сборки с сообщением об ошибке.
 
         # Проверки совместимости
-        error_message = None  # Инициализируем переменную для сообщения об ошибке совместимости.
-
-        if cpu and motherboard:
-            if not cpu.is_compatible_with_motherboard(
-                motherboard
-            ):  # Проверяем совместимость процессора и материнской платы.
-                error_message = (
-                    'Процессор не совместим с материнской платой.'
-                )  # Сообщение об ошибке.
-
-        if motherboard and ram:
-            if not motherboard.is_compatible_with_ram(
-                ram
-            ):  # Проверяем совместимость материнской платы и оперативной памяти.
-                error_message = (
-                    'Оперативная память не совместима с материнской платой.'
-                )  # Сообщение об ошибке.
-
-        if gpu and psu:
-            if not psu.is_sufficient_for_gpu(
-                gpu
-            ):  # Проверяем достаточно ли мощности блока питания для видеокарты.
-                error_message = (
-                    'Мощности блока питания недостаточно для видеокарты.'
-                )  # Сообщение об ошибке.
-
-        if cpu and cooler:
-            if not cooler.is_compatible_with_cpu(
-                cpu
-            ):  # Проверяем совместимость кулера и процессора.
-                error_message = 'Кулер не совместим с процессором.'  # Сообщение об ошибке.
+        error_message = compatibility_error(
+            selection_of(cpu=cpu, motherboard=motherboard, ram=ram, gpu=gpu, psu=psu, case=case)
+        )  # Проверяем совместимость выбранных компонентов одним запросом к графу совместимости.
 
         if error_message:  # Если есть ошибка совместимости.
             return render(
                 request,
                 'builds/build_create.html',
-                {
-                    'error_message': error_message,
-                    'cpus': CPU.objects.all(),
-                    'gpus': GPU.objects.all(),
-                    'motherboards': Motherboard.objects.all(),
-                    'rams': RAM.objects.all(),
-                    'storages': Storage.objects.all(),
-                    'psus': PSU.objects.all(),
-                    'cases': Case.objects.all(),
-                    'coolers': Cooler.objects.all(),
-                },
+                configurator_context(
+                    in_stock_only=True,
+                    error_message=error_message,
+                ),
             )  # Отображаем страницу создания сборки с сообщением об ошибке.
 
-        # Создаем сборку
-        total_price = sum(
-            component.price
-            for component in [cpu, gpu, motherboard, ram, storage, psu, case, cooler]
-            if component and component.price is not None
-        )  # Вычисляем общую стоимость сборки.
-
+        # Создаем сборку (общая стоимость и TDP рассчитываются в Build.save())
         build = Build(
             user=request.user,
             cpu=cpu,
@@ -737,51 +671,15 @@ def build_create(request):
             return render(
                 request,
                 'builds/build_create.html',
-                {
-                    'error_message': f'Ошибка сохранения сборки: {e}',
-                    'cpus': CPU.objects.all(),
-                    'gpus': GPU.objects.all(),
-                    'motherboards': Motherboard.objects.all(),
-                    'rams': RAM.objects.all(),
-                    'storages': Storage.objects.all(),
-                    'psus': PSU.objects.all(),
-                    'cases': Case.objects.all(),
-                    'coolers': Cooler.objects.all(),
-                },
+                configurator_context(
+                    in_stock_only=True,
+                    error_message=f'Ошибка сохранения сборки: {e}',
+                ),
             )  # Отображаем страницу создания сборки с сообщением об ошибке.
     else:  # Если это GET запрос.
-        # Get components that are in stock
-        def get_in_stock_components(model):
-            """Получает компоненты, которые есть в наличии на складе."""
-            model_name = model._meta.model_name  # Получаем имя модели.
-            in_stock_ids = Stock.objects.filter(
-                component_type=model_name, quantity__gt=0
-            ).values_list(
-                'component_id', flat=True
-            )  # Получаем ID компонентов, которые есть в наличии.
-            return model.objects.filter(
-                id__in=in_stock_ids
-            )  # Возвращаем компоненты, которые есть в наличии.
-
-        cpus = get_in_stock_components(CPU)
-        gpus = get_in_stock_components(GPU)
-        motherboards = get_in_stock_components(Motherboard)
-        rams = get_in_stock_components(RAM)
-        storages = get_in_stock_components(Storage)
-        psus = get_in_stock_components(PSU)
-        cases = get_in_stock_components(Case)
-        coolers = get_in_stock_components(Cooler)
-
-        context = {
-            'cpus': cpus,
-            'gpus': gpus,
-            'motherboards': motherboards,
-            'rams': rams,
-            'storages': storages,
-            'psus': psus,
-                        'cases': cases,
-            'coolers': coolers,
-        }  # Создаем контекст для шаблона.
+        context = configurator_context(
+            in_stock_only=True
+        )  # Списки компонентов в наличии из кэша конфигуратора.
         return render(
             request, 'builds/build_create.html', context
         )  # Отображаем страницу создания сборки с компонентами в наличии.
@@ -799,91 +697,18 @@ def build_preview(request):
                 {'error': 'Неверный формат данных'}, status=400
             )  # Если не удалось распарсить JSON, возвращаем ошибку.
 
-        cpu_id = data.get('cpu')  # Получаем ID процессора из данных.
-        gpu_id = data.get('gpu')  # Получаем ID видеокарты из данных.
-        motherboard_id = data.get('motherboard')  # Получаем ID материнской платы из данных.
-        ram_id = data.get('ram')  # Получаем ID оперативной памяти из данных.
-        storage_id = data.get('storage')  # Получаем ID накопителя из данных.
-        psu_id = data.get('psu')  # Получаем ID блока питания из данных.
-        case_id = data.get('case')  # Получаем ID корпуса из данных.
-        cooler_id = data.get('cooler')  # Получаем ID кулера из данных.
-
         try:
-            cpu = CPU.objects.get(pk=cpu_id) if cpu_id else None  # Получаем процессор по ID.
-            gpu = GPU.objects.get(pk=gpu_id) if gpu_id else None  # Получаем видеокарту по ID.
-            motherboard = (
-                Motherboard.objects.get(pk=motherboard_id)
-                if motherboard_id
-                else None
-            )  # Получаем материнскую плату по ID.
-            ram = RAM.objects.get(pk=ram_id) if ram_id else None  # Получаем оперативную память по ID.
-            storage = (
-                Storage.objects.get(pk=storage_id) if storage_id else None
-            )  # Получаем накопитель по ID.
-            psu = PSU.objects.get(pk=psu_id) if psu_id else None  # Получаем блок питания по ID.
-            case = Case.objects.get(pk=case_id) if case_id else None  # Получаем корпус по ID.
-            cooler = (
-                Cooler.objects.get(pk=cooler_id) if cooler_id else None
-            )  # Получаем кулер по ID.
+            preview = build_preview_data(
+                data if isinstance(data, dict) else {}
+            )  # Предпросмотр из кэша или один запрос на тип компонента.
         except ObjectDoesNotExist:
             return JsonResponse(
                 {'error': 'Один из компонентов не найден'}, status=400
             )  # Если один из компонентов не найден, возвращаем ошибку.
 
-        error_message = None  # Инициализируем переменную для сообщения об ошибке совместимости.
-
-        if (
-            cpu
-            and motherboard
-            and not cpu.is_compatible_with_motherboard(motherboard)
-        ):  # Проверяем совместимость процессора и материнской платы.
-            error_message = (
-                'Процессор не совместим с материнской платой.'
-            )  # Сообщение об ошибке.
-
-        if (
-            motherboard
-            and ram
-            and not motherboard.is_compatible_with_ram(ram)
-        ):  # Проверяем совместимость материнской платы и оперативной памяти.
-            error_message = (
-                'Оперативная память не совместима с материнской платой.'
-            )  # Сообщение об ошибке.
-
-        if gpu and psu and not psu.is_sufficient_for_gpu(gpu):
-            error_message = (
-                'Мощности блока питания недостаточно для видеокарты.'
-            )  # Сообщение об ошибке.
-
-        if cpu and cooler and not cooler.is_compatible_with_cpu(cpu):
-            error_message = 'Кулер не совместим с процессором.'  # Сообщение об ошибке.
-
-        total_price = sum(
-            c.price
-            for c in [cpu, gpu, motherboard, ram, storage, psu, case, cooler]
-            if c and c.price is not None
-        )  # Вычисляем общую стоимость сборки.
-
-        context = {
-            'cpu': cpu,
-            'gpu': gpu,
-            'motherboard': motherboard,
-            'ram': ram,
-            'storage': storage,
-            'psu': psu,
-            'case': case,
-            'cooler': cooler,
-            'total_price': total_price,
-            'error_message': error_message,
-        }  # Создаем контекст для шаблона.
-        html = (
-            render(request, 'builds/build_preview.html', context)
-            .content.decode('utf-8')
-        )  # Рендерим шаблон предпросмотра сборки и декодируем его в строку.
-
         return JsonResponse(
-            {'html': html}
-        )  # Возвращаем JSON ответ с HTML кодом предпросмотра.
+            preview
+        )  # Возвращаем JSON ответ с HTML кодом предпросмотра, ценой, ошибками и потреблением.
 
     return JsonResponse(
         {'html': ''}
@@ -893,8 +718,17 @@ def build_preview(request):
 def build_edit(request, pk):
     """Редактирует существующую сборку."""
     build = get_object_or_404(
-        Build, pk=pk
-    )  # Получаем сборку по ID или возвращаем 404, если не найдена.
+        Build.objects.select_related(
+            'cpu__manufacturer',
+            'gpu__manufacturer',
+            'motherboard__manufacturer',
+            'ram__manufacturer',
+            'storage__manufacturer',
+            'psu__manufacturer',
+            'case__manufacturer',
+        ),
+        pk=pk,
+    )  # Получаем сборку с текущими компонентами одним запросом или возвращаем 404, если не найдена.
 
     if request.method == 'POST':  # Если это POST запрос.
         # Получаем данные из POST
@@ -938,67 +772,23 @@ def build_edit(request, pk):
             return render(
                 request,
                 'builds/build_edit.html',
-                {
-                    'build': build,
-                    'error_message': 'Один из выбранных компонентов не найден.',
-                    'cpus': CPU.objects.all(),
-                    'gpus': GPU.objects.all(),
-                    'motherboards': Motherboard.objects.all(),
-                    'rams': RAM.objects.all(),
-                    'storages': Storage.objects.all(),
-                    'psus': PSU.objects.all(),
-                    'cases': Case.objects.all(),
-                    'coolers': Cooler.objects.all(),  # Добавляем coolers
-                },
+                configurator_context(
+                    build=build,
+                    error_message='Один из выбранных компонентов не найден.',
+                ),
             )  # Отображаем страницу редактирования сборки с сообщением об ошибке.
-        error_message = None  # Инициализируем переменную для сообщения об ошибке совместимости.
-
-        if cpu and motherboard:
-            if not cpu.is_compatible_with_motherboard(
-                motherboard
-            ):  # Проверяем совместимость процессора и материнской платы.
-                error_message = (
-                    'Процессор не совместим с материнской платой.'
-                )  # Сообщение об ошибке.
-
-        if motherboard and ram:
-            if not motherboard.is_compatible_with_ram(
-                ram
-            ):  # Проверяем совместимость материнской платы и оперативной памяти.
-                error_message = (
-                    'Оперативная память не совместима с материнской платой.'
-                )  # Сообщение об ошибке.
-
-        if gpu and psu:
-            if not psu.is_sufficient_for_gpu(
-                gpu
-            ):  # Проверяем достаточно ли мощности блока питания для видеокарты.
-                error_message = (
-                    'Мощности блока питания недостаточно для видеокарты.'
-                )  # Сообщение об ошибке.
-
-        if cpu and cooler:
-            if not cooler.is_compatible_with_cpu(
-                cpu
-            ):  # Проверяем совместимость кулера и процессора.
-                error_message = 'Кулер не совместим с процессором.'  # Сообщение об ошибке.
+        error_message = compatibility_error(
+            selection_of(cpu=cpu, motherboard=motherboard, ram=ram, gpu=gpu, psu=psu, case=case)
+        )  # Проверяем совместимость выбранных компонентов одним запросом к графу совместимости.
 
         if error_message:  # Если есть ошибка совместимости.
             return render(
                 request,
                 'builds/build_edit.html',
-                {
-                    'build': build,
-                    'error_message': error_message,
-                    'cpus': CPU.objects.all(),
-                    'gpus': GPU.objects.all(),
-                    'motherboards': Motherboard.objects.all(),
-                    'rams': RAM.objects.all(),
-                    'storages': Storage.objects.all(),
-                    'psus': PSU.objects.all(),
-                    'cases': Case.objects.all(),
-                    'coolers': Cooler.objects.all(),  # Добавляем coolers
-                },
+                configurator_context(
+                    build=build,
+                    error_message=error_message,
+                ),
             )  # Отображаем страницу редактирования сборки с сообщением об ошибке.
 
         #  Обновление полей build
@@ -1011,28 +801,8 @@ def build_edit(request, pk):
         build.case = case  # Обновляем корпус.
         build.cooler = cooler  # Добавлено обновление кулера
 
-        # Рассчитываем общую стоимость
-        total_price = Decimal('0.0')  # Инициализируем общую стоимость.
-        if build.cpu:
-            total_price += build.cpu.price  # Добавляем цену процессора.
-        if build.gpu:
-            total_price += build.gpu.price  # Добавляем цену видеокарты.
-        if build.motherboard:
-            total_price += build.motherboard.price  # Добавляем цену материнской платы.
-        if build.ram:
-            total_price += build.ram.price  # Добавляем цену оперативной памяти.
-        if build.storage:
-            total_price += build.storage.price  # Добавляем цену накопителя.
-        if psu:
-            total_price += build.psu.price  # Добавляем цену блока питания.
-        if case:
-            total_price += build.case.price  # Добавляем цену корпуса.
-        if cooler:
-            total_price += build.cooler.price  # Добавляем цену кулера
-        build.total_price = total_price  # Обновляем общую стоимость сборки.
-
         try:
-            build.save()  # Сохраняем сборку в базе данных.
+            build.save()  # Сохраняем сборку; save() сам пересчитывает общую стоимость и TDP.
             return redirect(
                 'builds:build_detail', pk=build.pk
             )  # Перенаправляем на страницу детальной информации о сборке.
@@ -1040,42 +810,17 @@ def build_edit(request, pk):
             return render(
                 request,
                 'builds/build_edit.html',
-                {
-                    'build': build,
-                    'error_message': f'Ошибка сохранения сборки: {e}',
-                    'cpus': CPU.objects.all(),
-                    'gpus': GPU.objects.all(),
-                    'motherboards': Motherboard.objects.all(),
-                    'rams': RAM.objects.all(),
-                    'storages': Storage.objects.all(),
-                    'psus': PSU.objects.all(),
-                    'cases': Case.objects.all(),
-                    'coolers': Cooler.objects.all(),  # Добавляем coolers
-                },
+                configurator_context(
+                    build=build,
+                    error_message=f'Ошибка сохранения сборки: {e}',
+                ),
             )  # Отображаем страницу редактирования сборки с сообщением об ошибке.
 
     else:  # Если это GET запрос.
         # Отобразите форму с текущими значениями
-        cpus = CPU.objects.all()  # Получаем все процессоры.
-        gpus = GPU.objects.all()  # Получаем все видеокарты.
-        motherboards = Motherboard.objects.all()  # Получаем все материнские платы.
-        rams = RAM.objects.all()  # Получаем всю оперативную память.
-        storages = Storage.objects.all()  # Получаем все накопители.
-        psus = PSU.objects.all()  # Получаем все блоки питания.
-        cases = Case.objects.all()  # Получаем все корпуса.
-        coolers = Cooler.objects.all()  # Получаем все кулеры.
-
-        context = {
-            'build': build,
-            'cpus': cpus,
-            'gpus': gpus,
-            'motherboards': motherboards,
-            'rams': rams,
-            'storages': storages,
-            'psus': psus,
-            'cases': cases,
-            'coolers': coolers,
-        }  # Создаем контекст для шаблона.
+        context = configurator_context(
+            build=build
+        )  # Списки всех компонентов из кэша конфигуратора.
         return render(
             request, 'builds/build_edit.html', context
         )  # Отображаем страницу редактирования сборки с текущими значениями.
@@ -1121,63 +866,19 @@ def employee_order_list(request):
     )  # Логируем, является ли пользователь сотрудником.
 
     query = request.GET.get('q')  # Получаем поисковой запрос из GET параметров.
-    # refresh = request.GET.get('refresh')  # Больше не нужен
-
-    if query:  # Если есть поисковой запрос.
-        orders = Order.objects.filter(
-            Q(is_completed=False)
-            & (
-                Q(track_number__icontains=query)
-                | Q(user__username__icontains=query)
-                | Q(email__icontains=query)
-            )
-        ).order_by(
-            '-order_date'
-        )  # Фильтруем заказы по поисковому запросу и сортируем по дате (от новых к старым).
-    else:  # Если нет поискового запроса.
-        orders = Order.objects.filter(
-            is_completed=False
-        ).order_by(
-            '-order_date'
-        )  # Получаем все незавершенные заказы и сортируем по дате (от новых к старым).
-
-    # Пагинация
-    paginator = Paginator(
-        orders, 10
-    )  # Создаем объект Paginator, разбивающий заказы на страницы по 10 штук.
-    page_number = request.GET.get('page')  # Получаем номер текущей страницы.
-    try:
-        page_obj = paginator.get_page(
-            page_number
-        )  # Получаем объект Page для текущей страницы.
-    except PageNotAnInteger:
-        page_obj = paginator.page(
-            1
-        )  # Если номер страницы не является целым числом, получаем первую страницу.
-    except EmptyPage:
-        page_obj = paginator.page(
-            paginator.num_pages
-        )  # Если номер страницы больше, чем общее количество страниц, получаем последнюю страницу.
-
-    # Получаем количество запросов на возврат
-    return_request_count = ReturnRequest.objects.filter(
-        status='pending'
-    ).count()  # Получаем количество запросов на возврат со статусом "pending".
+    orders = dashboard_orders(
+        False, query
+    )  # Незавершенные заказы с пользователем, позициями и итогами (с учетом поиска).
 
-    # Получаем количество товаров, отсутствующих на складе
-    out_of_stock_count = request.GET.get(
-        'out_of_stock_count', Stock.objects.filter(quantity=0).count()
-    )  # Получаем количество товаров, которых нет в наличии.
+    # Пагинация: по 10 заказов, от новых к старым, по курсору (ссылки сохраняют поиск).
+    page_obj = paginate(request, orders, 10, ('-order_date', '-id'), keyset=True)
 
+    context = {'page_obj': page_obj, 'query': query}
+    context.update(
+        dashboard_counters()
+    )  # Количество запросов на возврат и отсутствующих товаров - из кэша и индекса запасов.
     return render(
-        request,
-        'builds/employee_order_list.html',
-        {
-            'page_obj': page_obj,
-            'query': query,
-            'return_request_count': return_request_count,
-            'out_of_stock_count': out_of_stock_count,
-        },  # Добавляем return_request_count
+        request, 'builds/employee_order_list.html', context
     )  # Отображаем страницу со списком заказов.
 
 
@@ -1222,19 +923,14 @@ def employee_order_update(request, order_id):
         form = CustomOrderUpdateForm(
             request.POST, instance=order, status_choices=status_choices
         )  # Создаем форму с данными из POST запроса и передаем возможные статусы.
+        old_status = order.status  # Сохраняем старый статус до валидации: is_valid() записывает данные формы в order
         if form.is_valid():  # Если форма валидна
-            old_status = order.status  # Сохраняем старый статус для сравнения
             form.save()  # Сохраняем изменения в заказе
             new_status = order.status  # Получаем новый статус заказа
 
-            # Отправка email уведомления, если статус изменился
-            if new_status in [
-                'delivered',
-                'delivering',
-            ] and old_status != new_status:  # Если статус стал "доставлен" или "в доставке" и изменился
-                send_order_status_email(
-                    order
-                )  # Отправляем уведомление по электронной почте
+            # Уведомление покупателю, если статус изменился (журнал исключает повторные письма)
+            if old_status != new_status:
+                notify_order_status(order)
 
             messages.success(
                 request, f"Статус заказа #{order.pk} успешно изменен."
@@ -1289,47 +985,13 @@ def employee_order_complete(request, order_id):
 def employee_order_history(request):
     """Отображает историю выданных заказов с информацией о возвратах."""
     query = request.GET.get('q')  # Получаем поисковой запрос из GET параметров.
-    if query:  # Если есть поисковой запрос.
-        orders = (
-            Order.objects.filter(
-                Q(is_completed=True)
-                & (
-                    Q(track_number__icontains=query)
-                    | Q(user__username__icontains=query)
-                    | Q(email__icontains=query)
-                )
-            )
-            .order_by('-order_date')
-            .prefetch_related(
-                'return_request'
-            )  # Оптимизация запроса - предварительная загрузка связанных запросов на возврат.
-        )  # Фильтруем завершенные заказы по поисковому запросу и сортируем по дате (от новых к старым).
-    else:  # Если нет поискового запроса.
-        orders = (
-            Order.objects.filter(is_completed=True)
-            .order_by('-order_date')
-            .prefetch_related(
-                'return_request'
-            )  # Оптимизация запроса - предварительная загрузка связанных запросов на возврат.
-        )  # Получаем все завершенные заказы и сортируем по дате (от новых к старым).
-
-    # Пагинация
-    paginator = Paginator(
-        orders, 10
-    )  # По 10 заказов на страницу # Создаем объект Paginator, разбивающий заказы на страницы по 10 штук.
-    page_number = request.GET.get('page')  # Получаем номер текущей страницы.
-    try:
-        page_obj = paginator.get_page(
-            page_number
-        )  # Получаем объект Page для текущей страницы.
-    except PageNotAnInteger:
-        page_obj = paginator.page(
-            1
-        )  # Если номер страницы не является целым числом, получаем первую страницу.
-    except EmptyPage:
-        page_obj = paginator.page(
-            paginator.num_pages
-        )  # Если номер страницы больше, чем общее количество страниц, получаем последнюю страницу.
+    orders = dashboard_orders(
+        True, query
+    )  # Выданные заказы с пользователем, запросом на возврат, позициями и итогами.
+
+    # Пагинация: по 10 заказов, от новых к старым. Курсор избавляет от COUNT(*)
+    # и OFFSET на глубоких страницах истории; ссылки сохраняют поиск.
+    page_obj = paginate(request, orders, 10, ('-order_date', '-id'), keyset=True)
 
     context = {'page_obj': page_obj, 'query': query}  # Создаем контекст для шаблона.
     return render(
@@ -1340,12 +1002,11 @@ def employee_order_history(request):
 @login_required  # Требуется авторизация пользователя.
 def checkout(request):
     """Обрабатывает оформление заказа."""
-    cart_items = CartItem.objects.filter(
-        user=request.user
-    )  # Получаем все элементы корзины для текущего пользователя.
-    total_price = sum(
-        item.get_total_price() for item in cart_items
-    )  # Вычисляем общую стоимость товаров в корзине.
+    cart = load_cart(
+        request.user, use_cache=False
+    )  # Свежий расчет корзины: все элементы с товарами одним запросом.
+    cart_items = cart.items  # Элементы корзины текущего пользователя.
+    total_price = cart.total_price  # Общая стоимость товаров в корзине.
     user = request.user  # Получаем текущего пользователя
 
     if request.method == 'POST':  # Если это POST запрос
@@ -1370,6 +1031,9 @@ def checkout(request):
 
         try:
             with transaction.atomic():  # Оборачиваем операцию в транзакцию для атомарности.
+                # Резервирование товара: блокировка записей Stock, проверка наличия и списание
+                reserve_stock(cart.lines)
+
                 # Создание заказа (определяем order до if payment_method == 'balance')
                 order = Order.objects.create(
                     user=user,
@@ -1398,6 +1062,9 @@ def checkout(request):
                             request,
                             "Недостаточно средств на балансе. Пополните счет.",
                         )  # Выводим сообщение об ошибке.
+                        transaction.set_rollback(
+                            True
+                        )  # Отменяем созданный заказ и резервирование товара.
                         return render(
                             request,
                             'builds/checkout.html',
@@ -1416,62 +1083,13 @@ def checkout(request):
                         description=f"Оплата заказа #{order.pk}",  # Номер заказа будет известен после создания
                     )  # Создаем транзакцию о списании средств.
 
-                # Создание позиций заказа
-                for item in cart_items:  # Для каждого элемента в корзине.
-                    component_type = None  # Инициализируем тип компонента.
-                    component_id = None  # Инициализируем ID компонента.
-
-                    if item.build:  # Если это сборка.
-                        component_type = 'build'  # Устанавливаем тип компонента в "build".
-                        component_id = item.build.pk  # Получаем ID сборки.
-                    elif item.cpu:  # Если это процессор.
-                        component_type = 'cpu'  # Устанавливаем тип компонента в "cpu".
-                        component_id = item.cpu.pk  # Получаем ID процессора.
-                    elif item.gpu:  # Если это видеокарта.
-                        component_type = 'gpu'  # Устанавливаем тип компонента в "gpu".
-                        component_id = item.gpu.pk  # Получаем ID видеокарты.
-                    elif item.motherboard:  # Если это материнская плата.
-                        component_type = (
-                            'motherboard'  # Устанавливаем тип компонента в "motherboard".
-                        )
-                        component_id = (
-                            item.motherboard.pk
-                        )  # Получаем ID материнской платы.
-                    elif item.ram:  # Если это оперативная память.
-                        component_type = 'ram'  # Устанавливаем тип компонента в "ram".
-                        component_id = (
-                            item.ram.pk
-                        )  # Получаем ID оперативной памяти.
-                    elif item.storage:  # Если это накопитель.
-                        component_type = (
-                            'storage'  # Устанавливаем тип компонента в "storage".
-                        )
-                        component_id = (
-                            item.storage.pk
-                        )  # Получаем ID накопителя.
-                    elif item.psu:  # Если это блок питания.
-                        component_type = 'psu'  # Устанавливаем тип компонента в "psu".
-                        component_id = (
-                            item.psu.pk
-                        )  # Получаем ID блока питания.
-                    elif item.case:  # Если это корпус.
-                        component_type = 'case'  # Устанавливаем тип компонента в "case".
-                        component_id = item.case.pk  # Получаем ID корпуса.
-                    elif item.cooler:  # Если это кулер.
-                        component_type = 'cooler'  # Устанавливаем тип компонента в "cooler".
-                        component_id = item.cooler.pk  # Получаем ID кулера.
-
-                    OrderItem.objects.create(
-                        order=order,
-                        item=str(item),  # Преобразуем товар в строку
-                        quantity=item.quantity,
-                        price=item.get_total_price() / item.quantity,
-                        component_type=component_type,
-                        component_id=component_id,
-                    )  # Создаем позицию заказа.
+                # Создание позиций заказа одним запросом
+                create_order_items(order, cart.lines)
 
                 # Очистка корзины после оформления заказа
-                cart_items.delete()  # Удаляем все элементы из корзины.
+                CartItem.objects.filter(
+                    pk__in=[item.pk for item in cart_items]
+                ).delete()  # Удаляем оформленные элементы из корзины.
 
                 # Отправка уведомления по электронной почте
                 subject = 'Ваш заказ оформлен!'  # Тема письма.
@@ -1485,29 +1103,18 @@ def checkout(request):
                 from_email = settings.EMAIL_HOST_USER  # Email отправителя.
                 recipient_list = [email]  # Email получателя.
 
-                try:
-                    send_mail(
-                        subject, message, from_email, recipient_list
-                    )  # Отправляем письмо.
-                    success = True  # Устанавливаем флаг успеха.
-                except Exception as e:  # Если произошла ошибка при отправке письма.
-                    messages.error(
-                        request,
-                        f"Заказ оформлен, но не удалось отправить уведомление: {e}",
-                    )  # Выводим сообщение об ошибке.
-                    success = False  # Устанавливаем флаг неудачи.
+                enqueue_email(
+                    subject, message, recipient_list, from_email=from_email
+                )  # Ставим письмо в очередь: оно сохраняется вместе с заказом, SMTP не задерживает транзакцию.
 
-                # Перенаправление на страницу подтверждения с параметром в URL
-                if success:  # Если заказ успешно оформлен.
-                    return redirect(
-                        reverse('builds:order_confirmation')
-                        + f'?success=True&track_number={order.track_number}'
-                    )  # Перенаправляем на страницу подтверждения с параметром success=True.
-                else:  # Если не удалось отправить уведомление.
-                    return redirect(
-                        reverse('builds:order_confirmation') + '?success=False'
-                    )  # Перенаправляем на страницу подтверждения с параметром success=False.
+            # Перенаправление на страницу подтверждения с параметром в URL
+            return redirect(
+                reverse('builds:order_confirmation')
+                + f'?success=True&track_number={order.track_number}'
+            )  # Перенаправляем на страницу подтверждения с параметром success=True.
 
+        except InsufficientStockError as e:  # Товара не хватает - заказ не создан.
+            messages.error(request, str(e))  # Выводим, каких товаров не хватает.
         except Exception as e:  # Если произошла ошибка при оформлении заказа.
             messages.error(request, f"Ошибка при оформлении заказа: {e}")  # Выводим сообщение об ошибке.
             print(
@@ -1602,95 +1209,123 @@ def index(request):
         )  # Отображаем обычную главную страницу.
 
 
-def get_compatible_motherboards(request):
+def _build_options_selection(request):
+    """Частичный выбор конфигуратора из GET параметров (?cpu=1&motherboard=2...)."""
+    return normalize_selection(
+        {component_type: request.GET.get(component_type) for component_type in COMPONENT_MODELS}
+    )
+
+
+def _build_options_etag(request):
+    return catalog_etag(sorted(_build_options_selection(request).items()))
+
+
+def _build_options_last_modified(request):
+    return catalog_last_modified()
+
+
+@require_GET  # Только GET: ответ кэшируется браузером.
+@cache_control(private=True, no_cache=True)  # Браузер хранит ответ, но перед использованием проверяет ETag.
+@condition(
+    etag_func=_build_options_etag, last_modified_func=_build_options_last_modified
+)  # Если каталог не менялся, возвращаем 304 без пересчета списков.
+def build_options(request):
     """
-    Возвращает JSON с материнскими платами, совместимыми с выбранным CPU.
+    Возвращает JSON со списками совместимых компонентов для всех слотов конфигуратора.
+
+    Принимает весь частичный выбор сразу, поэтому смена одного списка
+    обходится одним запросом к серверу.
     """
-    cpu_id = request.GET.get('cpu_id')  # Получаем ID процессора из GET запроса.
-    if cpu_id:  # Если ID процессора указан.
-        try:
-            cpu = CPU.objects.get(
-                pk=cpu_id
-            )  # Получаем процессор по ID. Если не найден, вызывается исключение.
-            # Получаем материнские платы с тем же сокетом, что и у CPU
-            compatible_motherboards = (
-                Motherboard.objects.filter(socket=cpu.socket)
-                .values('id', 'name')  # .values() для оптимизации
-                        )  # Получаем материнские платы с тем же сокетом, что и у CPU. .values('id', 'name') используется для оптимизации запроса и получения только необходимых полей.
-            return JsonResponse(
-                list(compatible_motherboards), safe=False
-            )  # Преобразуем QuerySet в список и возвращаем JSON ответ. safe=False позволяет сериализовать не-словарь.
-        except CPU.DoesNotExist:  # Если процессор не найден.
-            return JsonResponse(
-                {'error': 'CPU не найден'}, status=404
-            )  # Возвращаем JSON ответ с ошибкой.
-    else:  # Если ID процессора не указан.
+    selection = _build_options_selection(request)
+    return JsonResponse(
+        {
+            'options': compatible_options(selection),
+            'errors': incompatibilities(selection),
+        }
+    )  # Возвращаем списки вариантов и ошибки совместимости уже выбранных компонентов.
+
+
+def _compatible_component_response(request, source_type, target_type, label, not_found):
+    """
+    Ответ прежних AJAX точек: список компонентов target_type, совместимых с одним
+    компонентом source_type (ID в GET параметре '<source_type>_id').
+    """
+    component_id = request.GET.get(f'{source_type}_id')  # Получаем ID выбранного компонента из GET запроса.
+    selection = normalize_selection({source_type: component_id})
+    if not selection:  # Если ID не указан.
         return JsonResponse(
-            {'error': 'Не указан CPU ID'}, status=400
+            {'error': f'Не указан {label} ID'}, status=400
         )  # Возвращаем JSON ответ с ошибкой.
+    if not COMPONENT_MODELS[source_type].objects.filter(pk=selection[source_type]).exists():
+        return JsonResponse(
+            {'error': not_found}, status=404
+        )  # Возвращаем JSON ответ с ошибкой.
+    compatible = compatible_queryset(target_type, selection).values_list(
+        'pk', 'manufacturer__name', 'model'
+    )  # Один запрос к графу совместимости вместо сравнения полей.
+    return JsonResponse(
+        [
+            {'id': pk, 'name': f"{manufacturer} {model}"}
+            for pk, manufacturer, model in compatible
+        ],
+        safe=False,
+    )  # safe=False позволяет сериализовать не-словарь.
+
+
+def get_compatible_motherboards(request):
+    """
+    Возвращает JSON с материнскими платами, совместимыми с выбранным CPU.
+    """
+    return _compatible_component_response(request, 'cpu', 'motherboard', 'CPU', 'CPU не найден')
 
 
 def get_compatible_rams(request):
     """
     Возвращает JSON с RAM, совместимой с выбранной материнской платой.
     """
-    motherboard_id = request.GET.get(
-        'motherboard_id'
-    )  # Получаем ID материнской платы из GET запроса.
-    if motherboard_id:  # Если ID материнской платы указан.
-        try:
-            motherboard = Motherboard.objects.get(
-                pk=motherboard_id
-            )  # Получаем материнскую плату по ID. Если не найдена, вызывается исключение.
-            # Получаем RAM с тем же типом и поддерживаемой частотой, что и у материнской платы
-            compatible_rams = (
-                RAM.objects.filter(
-                    ram_type=motherboard.ram_type,
-                    memory_clock__lte=motherboard.max_ram_speed,
-                )
-                .values('id', 'name')
-            )  # Получаем оперативную память с тем же типом и поддерживаемой частотой, что и у материнской платы. .values('id', 'name') используется для оптимизации запроса и получения только необходимых полей.
-            return JsonResponse(
-                list(compatible_rams), safe=False
-            )  # Преобразуем QuerySet в список и возвращаем JSON ответ. safe=False позволяет сериализовать не-словарь.
-        except Motherboard.DoesNotExist:  # Если материнская плата не найдена.
-            return JsonResponse(
-                {'error': 'Motherboard не найдена'}, status=404
-            )  # Возвращаем JSON ответ с ошибкой.
-    else:  # Если ID материнской платы не указан.
-        return JsonResponse(
-            {'error': 'Не указан Motherboard ID'}, status=400
-        )  # Возвращаем JSON ответ с ошибкой.
+    return _compatible_component_response(
+        request, 'motherboard', 'ram', 'Motherboard', 'Motherboard не найдена'
+    )
 
 
 def get_compatible_cpu(request):
     """
     Возвращает JSON с CPU, совместимыми с выбранной материнской платой.
     """
-    motherboard_id = request.GET.get(
-        'motherboard_id'
-    )  # Получаем ID материнской платы из GET запроса.
-    if motherboard_id:  # Если ID материнской платы указан.
-        try:
-            motherboard = Motherboard.objects.get(
-                pk=motherboard_id
-            )  # Получаем материнскую плату по ID. Если не найдена, вызывается исключение.
-            # Получаем CPU с тем же сокетом, что и у материнской платы
-            compatible_cpus = (
-                CPU.objects.filter(socket=motherboard.socket)
-                .values('id', 'name')
-            )  # Получаем процессоры с тем же сокетом, что и у материнской платы. .values('id', 'name') используется для оптимизации запроса и получения только необходимых полей.
-            return JsonResponse(
-                list(compatible_cpus), safe=False
-            )  # Преобразуем QuerySet в список и возвращаем JSON ответ. safe=False позволяет сериализовать не-словарь.
-        except Motherboard.DoesNotExist:  # Если материнская плата не найдена.
-            return JsonResponse(
-                {'error': 'Motherboard не найдена'}, status=404
-            )  # Возвращаем JSON ответ с ошибкой.
-    else:  # Если ID материнской платы не указан.
-        return JsonResponse(
-            {'error': 'Не указан Motherboard ID'}, status=400
-        )  # Возвращаем JSON ответ с ошибкой.
+    return _compatible_component_response(
+        request, 'motherboard', 'cpu', 'Motherboard', 'Motherboard не найдена'
+    )
+
+
+@require_GET  # Только GET: ответ зависит лишь от параметров и каталога.
+def build_optimizer(request):
+    """
+    Возвращает JSON с лучшими совместимыми сборками в пределах бюджета.
+
+    GET параметры: budget (обязательный), game и settings (оценка по FPS в игре),
+    top (количество сборок, 1..MAX_TOP). Результаты кэшируются по корзине бюджета.
+    """
+    try:
+        budget = Decimal(request.GET['budget'])
+        game_id = int(request.GET['game']) if request.GET.get('game') else None
+        top = int(request.GET.get('top', DEFAULT_TOP))
+    except (KeyError, ArithmeticError, ValueError):  # InvalidOperation - подкласс ArithmeticError.
+        return JsonResponse({'error': 'Укажите бюджет числом'}, status=400)
+    if not budget.is_finite() or budget <= 0:
+        return JsonResponse({'error': 'Бюджет должен быть положительным'}, status=400)
+    settings_code = request.GET.get('settings') or DEFAULT_SETTINGS
+    if settings_code not in dict(FPSData._meta.get_field('settings').choices):
+        return JsonResponse({'error': 'Неизвестные настройки графики'}, status=400)
+    top = min(max(top, 1), MAX_TOP)
+    return JsonResponse(
+        {
+            'budget': str(budget),
+            'budget_bucket': str(budget_bucket(budget)),
+            'game': game_id,
+            'settings': settings_code,
+            'builds': best_builds(budget, game_id, settings_code, top),
+        }
+    )
 
 
 @login_required  # Требуется авторизация пользователя.
@@ -1699,9 +1334,9 @@ def get_compatible_cpu(request):
 )  # Требуется, чтобы пользователь был сотрудником (проверка через функцию is_employee).
 def employee_out_of_stock_list(request):
     """Представление для отображения списка товаров, которых нет в наличии."""
-    out_of_stock_items = Stock.objects.filter(
-        quantity=0
-    )  # Получаем все товары, которых нет в наличии (quantity = 0).
+    out_of_stock_items = prime_component_names(
+        Stock.objects.filter(quantity=0).order_by('component_type', 'component_id')
+    )  # Получаем все товары, которых нет в наличии (quantity = 0), с названиями - по одному запросу на тип.
 
     return render(
         request,
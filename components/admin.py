@@ -1,5 +1,6 @@
 # components/admin.py
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 
 from .forms import (
     CPUForm,
@@ -24,6 +25,7 @@ from .models import (
     Stock,
     Review,  # Import Review
 )
+from .resolver import prime_component_names, stock_search_filter
 
 
 @admin.register(Manufacturer)
@@ -195,6 +197,14 @@ def reduce_stock(modeladmin, request, queryset):
 reduce_stock.short_description = "Уменьшить запас выбранных элементов на 10"
 
 
+class StockChangeList(ChangeList):
+    """Список складских запасов: названия компонентов загружаются по одному запросу на тип."""
+
+    def get_results(self, request):
+        super().get_results(request)
+        prime_component_names(self.result_list)
+
+
 @admin.register(Stock)
 class StockAdmin(admin.ModelAdmin):
     list_display = ('component_type', 'get_component_name', 'quantity')
@@ -202,6 +212,23 @@ class StockAdmin(admin.ModelAdmin):
     search_fields = ('component_type', 'component_id')
     actions = [replenish_stock, reduce_stock]  # Добавляем actions
 
+    def get_changelist(self, request, **kwargs):
+        return StockChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Дополнительно ищет по названию компонента (производитель + модель).
+
+        Совпадения по названию отбираются из входного queryset, в котором уже
+        применены фильтры списка, поэтому фильтры продолжают действовать.
+        """
+        results, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        if search_term:
+            results |= queryset.filter(stock_search_filter(search_term))
+        return results, may_have_duplicates
+
 
 @admin.register(Review)  # Register the Review model
 class ReviewAdmin(admin.ModelAdmin):
@@ -0,0 +1,223 @@
+# components/catalog.py
+from django.conf import settings
+from django.db.models import OuterRef, Q, Subquery
+from django.shortcuts import render
+
+from pc_builder.pagination import paginate
+
+from .forms import (
+    CaseSearchForm,
+    CoolerSearchForm,
+    CPUSearchForm,
+    GPUSearchForm,
+    MotherboardSearchForm,
+    PSUSearchForm,
+    RAMSearchForm,
+    StorageSearchForm,
+)
+from .models import (
+    CPU,
+    GPU,
+    Motherboard,
+    RAM,
+    Storage,
+    PSU,
+    Case,
+    Cooler,
+    Stock,
+)
+from .versioning import component_versions
+
+
+SORT_OPTIONS = {
+    'popularity': ('-popularity',),  # Продажи за окно (components.popularity); поле индексировано.
+    'price_asc': ('price',),
+    'price_desc': ('-price',),
+    'rating_desc': ('-average_rating', '-review_count'),  # Денормализованные поля отзывов (components.reviews).
+}  # Сортировки, общие для всех списков компонентов.
+
+
+class CatalogSpec:
+    """
+    Описание списка компонентов одного типа для общего движка каталога.
+
+    filters - пары (поле формы, lookup), которые применяются, если поле заполнено.
+    sort_options - дополнительные сортировки типа {значение поля sort: поля order_by}
+    к общим SORT_OPTIONS. Сортировка задается явно, так как она же служит ключом
+    курсорной пагинации.
+    """
+
+    def __init__(
+        self,
+        component_type,
+        model,
+        form_class,
+        context_name,
+        filters=(),
+        sort_options=None,
+        default_sort=('-popularity',),
+        per_page=6,
+    ):
+        self.component_type = component_type  # Тип компонента в Stock ('cpu', 'gpu', ...).
+        self.model = model  # Модель компонента.
+        self.form_class = form_class  # Форма поиска и фильтрации.
+        self.context_name = context_name  # Имя страницы в контексте шаблона ('cpus', 'gpus', ...).
+        self.filters = filters
+        self.sort_options = {**SORT_OPTIONS, **(sort_options or {})}
+        self.default_sort = default_sort  # Сортировка, если значение sort не выбрано: сначала популярные.
+        self.per_page = per_page  # Количество компонентов на странице.
+
+    @property
+    def template_name(self):
+        return f'components/{self.component_type}_list.html'
+
+    def base_queryset(self):
+        """Компоненты с производителем и количеством на складе в одном запросе."""
+        stock_quantity = Stock.objects.filter(
+            component_type=self.component_type, component_id=OuterRef('pk')
+        ).values('quantity')[:1]  # Подзапрос к Stock выполняется только для строк текущей страницы.
+        return self.model.objects.select_related('manufacturer').annotate(
+            stock_quantity=Subquery(stock_quantity)
+        )
+
+    def filter_queryset(self, queryset, cleaned_data):
+        """Применяет поиск и фильтры из очищенных данных формы."""
+        q = cleaned_data.get('q')
+        if q:  # Поиск по производителю или модели.
+            queryset = queryset.filter(
+                Q(manufacturer__name__icontains=q) | Q(model__icontains=q)
+            )  # distinct() не нужен: связь с производителем не размножает строки.
+
+        manufacturers = cleaned_data.get('manufacturer')
+        if manufacturers:
+            queryset = queryset.filter(manufacturer__id__in=manufacturers)
+
+        for field_name, lookup in self.filters:
+            value = cleaned_data.get(field_name)
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
+
+    def get_ordering(self, cleaned_data):
+        """Возвращает поля сортировки для выбранного значения sort."""
+        return self.sort_options.get(cleaned_data.get('sort'), self.default_sort)
+
+
+CATALOG_SPECS = {
+    'cpu': CatalogSpec(
+        'cpu',
+        CPU,
+        CPUSearchForm,
+        'cpus',
+        filters=(
+            ('socket', 'socket__icontains'),
+            ('integrated_graphics', 'integrated_graphics'),
+        ),
+        sort_options={
+            'frequency_desc': ('-frequency',),
+        },
+    ),
+    'gpu': CatalogSpec(
+        'gpu',
+        GPU,
+        GPUSearchForm,
+        'gpus',
+        filters=(
+            ('memory', 'memory'),
+            ('interface', 'interface__icontains'),
+        ),
+    ),
+    'motherboard': CatalogSpec(
+        'motherboard',
+        Motherboard,
+        MotherboardSearchForm,
+        'motherboards',
+        filters=(
+            ('socket', 'socket__icontains'),
+            ('form_factor', 'form_factor__icontains'),
+        ),
+    ),
+    'ram': CatalogSpec(
+        'ram',
+        RAM,
+        RAMSearchForm,
+        'rams',
+        filters=(
+            ('type', 'type__icontains'),
+            ('capacity', 'capacity'),
+        ),
+    ),
+    'storage': CatalogSpec(
+        'storage',
+        Storage,
+        StorageSearchForm,
+        'storages',
+        filters=(
+            ('type', 'type__icontains'),
+            ('capacity', 'capacity'),
+        ),
+    ),
+    'psu': CatalogSpec(
+        'psu',
+        PSU,
+        PSUSearchForm,
+        'psus',
+        filters=(
+            ('power', 'power'),
+            ('certification', 'certification__icontains'),
+        ),
+    ),
+    'case': CatalogSpec(
+        'case',
+        Case,
+        CaseSearchForm,
+        'cases',
+        filters=(
+            ('form_factor', 'form_factor__icontains'),
+            ('dimensions', 'dimensions__icontains'),
+            ('side_panel_window', 'side_panel_window'),
+        ),
+    ),
+    'cooler': CatalogSpec(
+        'cooler',
+        Cooler,
+        CoolerSearchForm,
+        'coolers',
+        filters=(
+            ('cooler_type', 'cooler_type'),
+            ('fan_size', 'fan_size'),
+            ('rgb', 'rgb'),
+        ),
+    ),
+}  # Описания списков для всех типов компонентов.
+
+
+def render_component_list(request, spec):
+    """Отображает страницу списка компонентов по описанию spec."""
+    form = spec.form_class(request.GET)  # Форма поиска с параметрами из GET запроса.
+    queryset = spec.base_queryset()
+    cleaned_data = {}
+    if form.is_valid():
+        cleaned_data = form.cleaned_data
+        queryset = spec.filter_queryset(queryset, cleaned_data)
+
+    components = paginate(
+        request, queryset, spec.per_page, spec.get_ordering(cleaned_data)
+    )  # Страница по номеру (?page=) или по курсору (?cursor=).
+
+    stock_dict = {
+        component.id: component.stock_quantity
+        for component in components
+        if component.stock_quantity is not None
+    }  # Наличие только для компонентов текущей страницы: ID компонента -> количество.
+
+    context = {
+        spec.context_name: components,
+        'form': form,
+        'stock_dict': stock_dict,
+        'fragment_versions': component_versions(
+            spec.component_type, [component.id for component in components]
+        ),  # Версии кэшированных карточек: ID компонента -> версия.
+        'fragment_cache_seconds': settings.FRAGMENT_CACHE_SECONDS,
+    }
+    return render(request, spec.template_name, context)
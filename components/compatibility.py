@@ -0,0 +1,392 @@
+# components/compatibility.py
+from collections import namedtuple
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
+
+BATCH_SIZE = 1000  # Размер пакета при массовой записи ребер.
+
+
+def cpu_fits_motherboard(cpu, motherboard):
+    """Сокеты процессора и материнской платы совпадают."""
+    return cpu.socket == motherboard.socket
+
+
+def ram_type_matches_motherboard(ram, motherboard):
+    """Тип памяти поддерживается платой."""
+    return ram.type == motherboard.ram_type
+
+
+def ram_fits_motherboard(ram, motherboard):
+    """Тип памяти поддерживается платой, а частота не выше максимальной."""
+    return ram_type_matches_motherboard(ram, motherboard) and ram.frequency <= motherboard.max_ram_frequency
+
+
+def psu_powers_gpu(psu, gpu):
+    """Мощности блока питания достаточно для TDP видеокарты."""
+    return psu.power >= gpu.tdp
+
+
+def supported_form_factors(case):
+    """Форм-факторы материнских плат, которые помещаются в корпус (в нижнем регистре)."""
+    return {
+        form_factor.strip().lower()
+        for form_factor in (case.supported_motherboard_form_factors or '').split(',')
+        if form_factor.strip()
+    }
+
+
+def motherboard_fits_case(motherboard, case):
+    """Форм-фактор материнской платы есть в списке поддерживаемых корпусом."""
+    return (motherboard.form_factor or '').strip().lower() in supported_form_factors(case)
+
+
+class CompatibilityRule(
+    namedtuple('CompatibilityRule', 'first second check fields message edge_check comparison', defaults=(None, None))
+):
+    """
+    Правило совместимости пары типов.
+
+    check(first, second) вызывается с компонентами типов first и second;
+    fields - поля, которые нужны правилу для каждого из типов.
+
+    В базе правило проверяется двумя частями. edge_check - условие на равенство
+    (сокет, тип памяти, форм-фактор): совместимые по нему пары хранятся ребрами
+    графа. comparison - сравнение столбцов (поле first, lookup, поле second),
+    например мощность блока питания >= TDP видеокарты: такие пары почти все
+    совместимы, поэтому вместо ребер условие проверяется запросом к столбцам.
+    """
+
+
+COMPATIBILITY_RULES = (
+    CompatibilityRule(
+        'cpu', 'motherboard', cpu_fits_motherboard,
+        {'cpu': ('socket',), 'motherboard': ('socket',)},
+        'Процессор не совместим с материнской платой.',
+        edge_check=cpu_fits_motherboard,
+    ),
+    CompatibilityRule(
+        'ram', 'motherboard', ram_fits_motherboard,
+        {'ram': ('type', 'frequency'), 'motherboard': ('ram_type', 'max_ram_frequency')},
+        'Оперативная память не совместима с материнской платой.',
+        edge_check=ram_type_matches_motherboard,
+        comparison=('frequency', 'lte', 'max_ram_frequency'),
+    ),
+    CompatibilityRule(
+        'psu', 'gpu', psu_powers_gpu,
+        {'psu': ('power',), 'gpu': ('tdp',)},
+        'Мощности блока питания недостаточно для видеокарты.',
+        comparison=('power', 'gte', 'tdp'),
+    ),
+    CompatibilityRule(
+        'motherboard', 'case', motherboard_fits_case,
+        {'motherboard': ('form_factor',), 'case': ('supported_motherboard_form_factors',)},
+        'Материнская плата не помещается в корпус.',
+        edge_check=motherboard_fits_case,
+    ),
+)  # Кулер в граф не входит: правило совместимости с процессором пока не определено.
+
+EDGE_RULES = tuple(rule for rule in COMPATIBILITY_RULES if rule.edge_check)  # Правила, которые хранятся ребрами.
+
+GRAPH_TYPES = {
+    component_type
+    for rule in EDGE_RULES
+    for component_type in (rule.first, rule.second)
+}  # Типы компонентов, которые участвуют в графе.
+
+REVERSED_LOOKUPS = {'lt': 'gt', 'lte': 'gte', 'gt': 'lt', 'gte': 'lte', 'exact': 'exact'}  # Сравнение с переставленными сторонами.
+
+
+def _edge_model():
+    from .models import CompatibilityEdge  # Локальный импорт: модели импортируют правила из этого модуля.
+
+    return CompatibilityEdge
+
+
+def _component_models():
+    from .resolver import COMPONENT_MODELS
+
+    return COMPONENT_MODELS
+
+
+def _in_stock(component_type):
+    """Условие «компонент есть на складе» подзапросом к Stock (без списка ID в параметрах запроса)."""
+    from .models import Stock
+
+    return Exists(
+        Stock.objects.filter(component_type=component_type, component_id=OuterRef('pk'), quantity__gt=0)
+    )
+
+
+def related_types(component_type):
+    """Типы, с которыми у компонента типа component_type есть правило совместимости."""
+    return {other_type for _, other_type in _rules_of(component_type)}
+
+
+def _rules_of(component_type, rules=COMPATIBILITY_RULES):
+    """Правила с участием типа: [(правило, другой тип)]."""
+    return [
+        (rule, rule.second if rule.first == component_type else rule.first)
+        for rule in rules
+        if component_type in (rule.first, rule.second)
+    ]
+
+
+def _edge_check(rule, component_type, component, other):
+    """Проверяет часть правила, которая хранится ребрами, для компонента типа component_type."""
+    if rule.first == component_type:
+        return rule.edge_check(component, other)
+    return rule.edge_check(other, component)
+
+
+def _comparison_condition(rule, target_type, other_id):
+    """
+    Условие на столбец компонентов типа target_type: сравнение правила
+    с полем выбранного компонента другого типа (подзапрос, без отдельного запроса).
+    """
+    first_field, lookup, second_field = rule.comparison
+    models = _component_models()
+    if target_type == rule.second:
+        other = models[rule.first].objects.filter(pk=other_id).values(first_field)[:1]
+        return Q(**{f'{second_field}__{REVERSED_LOOKUPS[lookup]}': Subquery(other)})
+    other = models[rule.second].objects.filter(pk=other_id).values(second_field)[:1]
+    return Q(**{f'{first_field}__{lookup}': Subquery(other)})
+
+
+def _pair_edges(edge_model, type_a, id_a, type_b, id_b):
+    """Совместимая пара записывается в обе стороны."""
+    return [
+        edge_model(source_type=type_a, source_id=id_a, target_type=type_b, target_id=id_b),
+        edge_model(source_type=type_b, source_id=id_b, target_type=type_a, target_id=id_a),
+    ]
+
+
+def _load(model, component_type):
+    """Компоненты типа с полями, которые нужны правилам."""
+    fields = {'pk'}
+    for rule in EDGE_RULES:
+        fields.update(rule.fields.get(component_type, ()))
+    return list(model.objects.only(*fields).order_by('pk'))
+
+
+def rebuild_graph(models=None, edge_model=None):
+    """
+    Полностью перестраивает граф совместимости. Возвращает количество ребер.
+
+    Ребра строятся только по равенствам (EDGE_RULES) и пишутся пакетами, без
+    списка всех ребер в памяти. Их число - удвоенное (обе стороны) число
+    совместимых пар: для каталога из 10 тысяч компонентов (по 1250 на тип)
+    около 5.6 миллиона ребер, больше половины - пары плата - корпус, так как
+    почти любой корпус принимает ATX и Micro-ATX.
+
+    models и edge_model позволяют вызвать перестроение из миграции с
+    историческими моделями; по умолчанию используются модели приложения.
+    """
+    models = models or _component_models()
+    edge_model = edge_model or _edge_model()
+    components = {
+        component_type: _load(models[component_type], component_type)
+        for component_type in GRAPH_TYPES
+    }
+    edges = (
+        edge
+        for rule in EDGE_RULES
+        for first in components[rule.first]
+        for second in components[rule.second]
+        if rule.edge_check(first, second)
+        for edge in _pair_edges(edge_model, rule.first, first.pk, rule.second, second.pk)
+    )
+    total = 0
+    with transaction.atomic():
+        edge_model.objects.all().delete()
+        while True:
+            batch = list(islice(edges, BATCH_SIZE))
+            if not batch:
+                return total
+            edge_model.objects.bulk_create(batch)
+            total += len(batch)
+
+
+def remove_component_edges(component_type, component_id):
+    """Удаляет все ребра компонента."""
+    _edge_model().objects.filter(
+        Q(source_type=component_type, source_id=component_id)
+        | Q(target_type=component_type, target_id=component_id)
+    ).delete()
+
+
+def refresh_component(component_type, component):
+    """
+    Пересчитывает ребра одного компонента после его сохранения.
+
+    Проверяются только правила с участием его типа, поэтому обновление
+    занимает по одному запросу на связанный тип, а не перестроение всего графа.
+    """
+    if component_type not in GRAPH_TYPES:
+        return
+    edge_model = _edge_model()
+    models = _component_models()
+    edges = []
+    for rule, other_type in _rules_of(component_type, EDGE_RULES):
+        for other in _load(models[other_type], other_type):
+            if _edge_check(rule, component_type, component, other):
+                edges.extend(
+                    _pair_edges(edge_model, component_type, component.pk, other_type, other.pk)
+                )
+    with transaction.atomic():
+        remove_component_edges(component_type, component.pk)
+        edge_model.objects.bulk_create(edges, batch_size=BATCH_SIZE)
+
+
+def normalize_selection(selection):
+    """
+    Приводит выбор конфигуратора {тип: ID} к виду {тип: int}.
+
+    Пустые и некорректные значения, а также неизвестные типы отбрасываются.
+    """
+    models = _component_models()
+    normalized = {}
+    for component_type, component_id in (selection or {}).items():
+        if component_type not in models or component_id in (None, ''):
+            continue
+        try:
+            normalized[component_type] = int(component_id)
+        except (TypeError, ValueError):
+            continue
+    return normalized
+
+
+def selection_of(**components):
+    """Выбор {тип: ID} из загруженных компонентов (None пропускаются)."""
+    return {
+        component_type: component.pk
+        for component_type, component in components.items()
+        if component is not None
+    }
+
+
+def compatible_ids(target_type, selection):
+    """
+    Подзапрос ID компонентов типа target_type, совместимых со всем выбором.
+
+    Учитываются только выбранные компоненты связанных типов: компонент
+    подходит, если у него есть ребро с каждым из них (EDGE_RULES) и выполняются
+    сравнения столбцов правил. Возвращает None, если выбор не ограничивает тип
+    target_type.
+    """
+    selection = normalize_selection(selection)
+    rules = [
+        (rule, other_type)
+        for rule, other_type in _rules_of(target_type)
+        if other_type in selection
+    ]
+    if not rules:
+        return None
+    condition = Q()
+    edge_sources = Q()
+    edge_count = 0
+    for rule, other_type in rules:
+        if rule.comparison:
+            condition &= _comparison_condition(rule, target_type, selection[other_type])
+        if rule.edge_check:
+            edge_sources |= Q(source_type=other_type, source_id=selection[other_type])
+            edge_count += 1
+    if edge_count:
+        condition &= Q(
+            pk__in=_edge_model().objects.filter(edge_sources, target_type=target_type)
+            .values('target_id')
+            .annotate(matches=Count('pk'))
+            .filter(matches=edge_count)
+            .values('target_id')
+        )
+    return _component_models()[target_type].objects.filter(condition).values('pk')
+
+
+def compatible_queryset(target_type, selection, queryset=None):
+    """
+    Компоненты типа target_type, которые остаются совместимыми с выбором.
+
+    Выполняется одним запросом: фильтр по подзапросу к индексу графа.
+    """
+    if queryset is None:
+        queryset = _component_models()[target_type].objects.all()
+    ids = compatible_ids(target_type, selection)
+    if ids is None:
+        return queryset
+    return queryset.filter(pk__in=ids)
+
+
+def incompatibilities(selection):
+    """
+    Сообщения о несовместимых парах выбранных компонентов.
+
+    Ребра всех пар проверяются одним запросом к графу, сравнения столбцов -
+    одним запросом на правило.
+    """
+    selection = normalize_selection(selection)
+    rules = [
+        rule for rule in COMPATIBILITY_RULES
+        if rule.first in selection and rule.second in selection
+    ]
+    if not rules:
+        return []
+    condition = Q()
+    for rule in rules:
+        if rule.edge_check:
+            condition |= Q(
+                source_type=rule.first,
+                source_id=selection[rule.first],
+                target_type=rule.second,
+                target_id=selection[rule.second],
+            )
+    found = set(
+        _edge_model().objects.filter(condition).values_list('source_type', 'target_type')
+    ) if condition else set()
+    models = _component_models()
+    messages = []
+    for rule in rules:
+        compatible = not rule.edge_check or (rule.first, rule.second) in found
+        if compatible and rule.comparison:
+            compatible = models[rule.first].objects.filter(
+                _comparison_condition(rule, rule.first, selection[rule.second]),
+                pk=selection[rule.first],
+            ).exists()
+        if not compatible:
+            messages.append(rule.message)
+    return messages
+
+
+def compatibility_error(selection):
+    """Текст ошибки совместимости для выбора или None, если все совместимо."""
+    messages = incompatibilities(selection)
+    return ' '.join(messages) if messages else None
+
+
+def compatible_options(selection, in_stock_only=True):
+    """
+    Списки вариантов для всех слотов конфигуратора с учетом частичного выбора.
+
+    Возвращает {тип: [{'id', 'name', 'price'}, ...]}; для каждого слота
+    выполняется один запрос (свой выбор слота его список не ограничивает).
+    Наличие проверяется подзапросом EXISTS: список ID из индекса запасов при
+    10 тысячах компонентов превысил бы лимит параметров MSSQL (2100).
+    """
+    selection = normalize_selection(selection)
+    options = {}
+    for component_type, model in _component_models().items():
+        queryset = model.objects.all()
+        if in_stock_only:
+            queryset = queryset.filter(_in_stock(component_type))
+        queryset = compatible_queryset(component_type, selection, queryset)
+        options[component_type] = [
+            {
+                'id': pk,
+                'name': f"{manufacturer} {model_name}",
+                'price': str(price),
+            }
+            for pk, manufacturer, model_name, price in queryset.order_by(
+                'manufacturer__name', 'model', 'pk'
+            ).values_list('pk', 'manufacturer__name', 'model', 'price')
+        ]
+    return options
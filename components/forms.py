@@ -148,11 +148,26 @@ class ComponentSearchForm(forms.Form):
     q = forms.CharField(label="Поиск", required=False)
 
 
-class CPUSearchForm(forms.Form):
+class SortedSearchForm(forms.Form):
+    """Поле сортировки, общее для форм поиска компонентов (значения - components.catalog.SORT_OPTIONS)."""
+
     SORT_CHOICES = (
         ('popularity', 'Сначала популярные'),
         ('price_asc', 'Цена: по возрастанию'),
         ('price_desc', 'Цена: по убыванию'),
+        ('rating_desc', 'Рейтинг: по убыванию'),
+    )
+
+    sort = forms.ChoiceField(
+        label="Сортировка",
+        required=False,
+        choices=SORT_CHOICES,
+        initial='popularity',  # Default sort
+    )
+
+
+class CPUSearchForm(SortedSearchForm):
+    SORT_CHOICES = SortedSearchForm.SORT_CHOICES + (
         ('frequency_desc', 'Частота: по убыванию'),
     )
 
@@ -181,7 +196,7 @@ class CPUSearchForm(forms.Form):
         ]
 
 
-class GPUSearchForm(forms.Form):
+class GPUSearchForm(SortedSearchForm):
     q = forms.CharField(label="Поиск", required=False)
     manufacturer = forms.MultipleChoiceField(
         choices=[],
@@ -201,7 +216,7 @@ class GPUSearchForm(forms.Form):
         ]
 
 
-class MotherboardSearchForm(forms.Form):
+class MotherboardSearchForm(SortedSearchForm):
     q = forms.CharField(label="Поиск", required=False)
     manufacturer = forms.MultipleChoiceField(
         choices=[],
@@ -219,7 +234,7 @@ class MotherboardSearchForm(forms.Form):
         ]
 
 
-class RAMSearchForm(forms.Form):
+class RAMSearchForm(SortedSearchForm):
     q = forms.CharField(label="Поиск", required=False)
     manufacturer = forms.MultipleChoiceField(
         choices=[],
@@ -237,7 +252,7 @@ class RAMSearchForm(forms.Form):
         ]
 
 
-class StorageSearchForm(forms.Form):
+class StorageSearchForm(SortedSearchForm):
     q = forms.CharField(label="Поиск", required=False)
     manufacturer = forms.MultipleChoiceField(
         choices=[],
@@ -255,7 +270,7 @@ class StorageSearchForm(forms.Form):
         ]
 
 
-class PSUSearchForm(forms.Form):
+class PSUSearchForm(SortedSearchForm):
     q = forms.CharField(label="Поиск", required=False)
     manufacturer = forms.MultipleChoiceField(
         choices=[],
@@ -273,7 +288,7 @@ class PSUSearchForm(forms.Form):
         ]
 
 
-class CaseSearchForm(forms.Form):
+class CaseSearchForm(SortedSearchForm):
     q = forms.CharField(label="Поиск", required=False)
     manufacturer = forms.MultipleChoiceField(
         choices=[],
@@ -293,7 +308,7 @@ class CaseSearchForm(forms.Form):
 
 # components/forms.py
 
-class CoolerSearchForm(forms.Form):
+class CoolerSearchForm(SortedSearchForm):
     q = forms.CharField(label="Поиск", required=False)
     manufacturer = forms.MultipleChoiceField(
         choices=[],
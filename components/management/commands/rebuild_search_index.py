@@ -0,0 +1,12 @@
+# components/management/commands/rebuild_search_index.py
+from django.core.management.base import BaseCommand
+
+from components.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Полностью перестраивает поисковый индекс компонентов.'
+
+    def handle(self, *args, **options):
+        total = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f'Проиндексировано компонентов: {total}'))
@@ -0,0 +1,19 @@
+# components/management/commands/update_popularity.py
+from django.core.management.base import BaseCommand
+
+from components.popularity import POPULARITY_WINDOW_DAYS, rebuild_popularity, update_popularity
+
+
+class Command(BaseCommand):
+    help = 'Обновляет популярность компонентов по новым заказам (запускается периодически, например из cron).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=POPULARITY_WINDOW_DAYS, help='Размер окна популярности (дни).')
+        parser.add_argument('--rebuild', action='store_true', help='Пересчитать популярность с нуля.')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            total = rebuild_popularity(days=options['days'])
+        else:
+            total = update_popularity(days=options['days'])
+        self.stdout.write(self.style.SUCCESS(f'Обновлена популярность компонентов: {total}'))
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.12 on 2026-10-18 23:59
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def build_index(apps, schema_editor):
+    """Заполняет поисковый индекс для уже существующих компонентов."""
+    from components.search import rebuild_index
+
+    rebuild_index(
+        models={
+            component_type: apps.get_model('components', model_name)
+            for component_type, model_name in (
+                ('cpu', 'CPU'),
+                ('gpu', 'GPU'),
+                ('motherboard', 'Motherboard'),
+                ('ram', 'RAM'),
+                ('storage', 'Storage'),
+                ('psu', 'PSU'),
+                ('case', 'Case'),
+                ('cooler', 'Cooler'),
+            )
+        },
+        document_model=apps.get_model('components', 'SearchDocument'),
+        term_model=apps.get_model('components', 'SearchTerm'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0014_alter_psu_unique_together'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('component_type', models.CharField(choices=[('cpu', 'Процессор'), ('gpu', 'Видеокарта'), ('motherboard', 'Материнская плата'), ('ram', 'Оперативная память'), ('storage', 'Накопитель'), ('psu', 'Блок питания'), ('case', 'Корпус'), ('cooler', 'Охлаждение')], max_length=50, verbose_name='Тип компонента')),
+                ('component_id', models.PositiveIntegerField(verbose_name='ID компонента')),
+                ('title', models.CharField(max_length=512, verbose_name='Название')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Цена')),
+            ],
+            options={
+                'verbose_name': 'Поисковый документ',
+                'verbose_name_plural': 'Поисковые документы',
+                'unique_together': {('component_type', 'component_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('gram', models.CharField(max_length=3, verbose_name='N-грамма')),
+                ('weight', models.PositiveSmallIntegerField(default=1, verbose_name='Вес')),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='components.searchdocument', verbose_name='Документ')),
+            ],
+            options={
+                'verbose_name': 'Поисковый термин',
+                'verbose_name_plural': 'Поисковые термины',
+                'unique_together': {('gram', 'document')},
+            },
+        ),
+        migrations.RunPython(build_index, migrations.RunPython.noop),
+    ]
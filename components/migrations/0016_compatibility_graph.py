@@ -0,0 +1,50 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:07
+
+from django.db import migrations, models
+
+
+def build_graph(apps, schema_editor):
+    """Заполняет граф совместимости для уже существующих компонентов."""
+    from components.compatibility import rebuild_graph
+
+    rebuild_graph(
+        models={
+            component_type: apps.get_model('components', model_name)
+            for component_type, model_name in (
+                ('cpu', 'CPU'),
+                ('gpu', 'GPU'),
+                ('motherboard', 'Motherboard'),
+                ('ram', 'RAM'),
+                ('psu', 'PSU'),
+                ('case', 'Case'),
+            )
+        },
+        edge_model=apps.get_model('components', 'CompatibilityEdge'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0015_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompatibilityEdge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_type', models.CharField(choices=[('cpu', 'Процессор'), ('gpu', 'Видеокарта'), ('motherboard', 'Материнская плата'), ('ram', 'Оперативная память'), ('storage', 'Накопитель'), ('psu', 'Блок питания'), ('case', 'Корпус'), ('cooler', 'Охлаждение')], max_length=50, verbose_name='Тип компонента')),
+                ('source_id', models.PositiveIntegerField(verbose_name='ID компонента')),
+                ('target_type', models.CharField(choices=[('cpu', 'Процессор'), ('gpu', 'Видеокарта'), ('motherboard', 'Материнская плата'), ('ram', 'Оперативная память'), ('storage', 'Накопитель'), ('psu', 'Блок питания'), ('case', 'Корпус'), ('cooler', 'Охлаждение')], max_length=50, verbose_name='Тип совместимого компонента')),
+                ('target_id', models.PositiveIntegerField(verbose_name='ID совместимого компонента')),
+            ],
+            options={
+                'verbose_name': 'Ребро совместимости',
+                'verbose_name_plural': 'Граф совместимости',
+                'indexes': [models.Index(fields=['source_type', 'source_id'], name='components_compat_source_idx'), models.Index(fields=['target_type', 'target_id'], name='components_compat_target_idx')],
+                'unique_together': {('target_type', 'source_type', 'source_id', 'target_id')},
+            },
+        ),
+        migrations.RunPython(build_graph, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,122 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:15
+
+from django.db import migrations, models
+
+
+def fill_ratings(apps, schema_editor):
+    """Заполняет количество отзывов и средний рейтинг для существующих компонентов."""
+    from components.reviews import rebuild_ratings
+
+    rebuild_ratings(
+        models={
+            component_type: apps.get_model('components', model_name)
+            for component_type, model_name in (
+                ('cpu', 'CPU'),
+                ('gpu', 'GPU'),
+                ('motherboard', 'Motherboard'),
+                ('ram', 'RAM'),
+                ('storage', 'Storage'),
+                ('psu', 'PSU'),
+                ('case', 'Case'),
+                ('cooler', 'Cooler'),
+            )
+        },
+        review_model=apps.get_model('components', 'Review'),
+        content_type_model=apps.get_model('contenttypes', 'ContentType'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0016_compatibility_graph'),
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Средний рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='case',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='cooler',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Средний рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='cooler',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='cpu',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Средний рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='cpu',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='gpu',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Средний рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='gpu',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='motherboard',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Средний рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='motherboard',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='psu',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Средний рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='psu',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='ram',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Средний рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='ram',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddField(
+            model_name='storage',
+            name='average_rating',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=3, verbose_name='Средний рейтинг'),
+        ),
+        migrations.AddField(
+            model_name='storage',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество отзывов'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['content_type', 'object_id', '-created_at'], name='components_review_object_idx'),
+        ),
+        migrations.RunPython(fill_ratings, migrations.RunPython.noop),
+    ]
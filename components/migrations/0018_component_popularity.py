@@ -0,0 +1,70 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0017_review_ratings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='case',
+            name='popularity',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='cooler',
+            name='popularity',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='cpu',
+            name='popularity',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='gpu',
+            name='popularity',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='motherboard',
+            name='popularity',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='psu',
+            name='popularity',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='ram',
+            name='popularity',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.AddField(
+            model_name='storage',
+            name='popularity',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False, verbose_name='Популярность'),
+        ),
+        migrations.CreateModel(
+            name='PopularityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('component_type', models.CharField(choices=[('cpu', 'Процессор'), ('gpu', 'Видеокарта'), ('motherboard', 'Материнская плата'), ('ram', 'Оперативная память'), ('storage', 'Накопитель'), ('psu', 'Блок питания'), ('case', 'Корпус'), ('cooler', 'Охлаждение')], max_length=50, verbose_name='Тип компонента')),
+                ('component_id', models.PositiveIntegerField(verbose_name='ID компонента')),
+                ('day', models.DateField(verbose_name='День')),
+                ('quantity', models.PositiveIntegerField(default=0, verbose_name='Продано, шт.')),
+                ('last_item_id', models.PositiveIntegerField(db_index=True, default=0, verbose_name='Последняя позиция заказа')),
+            ],
+            options={
+                'verbose_name': 'Продажи за день',
+                'verbose_name_plural': 'Продажи по дням',
+                'indexes': [models.Index(fields=['day'], name='components_popularity_day_idx')],
+                'unique_together': {('component_type', 'component_id', 'day')},
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0018_component_popularity'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cpu',
+            name='socket',
+            field=models.CharField(db_index=True, max_length=50, verbose_name='Сокет'),
+        ),
+        migrations.AlterField(
+            model_name='motherboard',
+            name='socket',
+            field=models.CharField(db_index=True, max_length=50, verbose_name='Сокет'),
+        ),
+        migrations.AddIndex(
+            model_name='stock',
+            index=models.Index(fields=['quantity', 'component_type', 'component_id'], name='components_stock_qty_idx'),
+        ),
+    ]
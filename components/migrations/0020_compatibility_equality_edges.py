@@ -0,0 +1,33 @@
+from django.db import migrations
+
+
+def rebuild_graph(apps, schema_editor):
+    """
+    Перестраивает граф: ребра остаются только для правил на равенство,
+    ребра блок питания - видеокарта удаляются (правило проверяется по столбцам).
+    """
+    from components.compatibility import rebuild_graph as rebuild
+
+    rebuild(
+        models={
+            component_type: apps.get_model('components', model_name)
+            for component_type, model_name in (
+                ('cpu', 'CPU'),
+                ('motherboard', 'Motherboard'),
+                ('ram', 'RAM'),
+                ('case', 'Case'),
+            )
+        },
+        edge_model=apps.get_model('components', 'CompatibilityEdge'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('components', '0019_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_graph, migrations.RunPython.noop),
+    ]
@@ -7,7 +7,10 @@ from django.contrib.contenttypes.fields import (  # Импортирует по
 )
 from django.contrib.contenttypes.models import ContentType  # Импортирует модель ContentType для хранения информации о моделях.
 from django.core.validators import MinValueValidator  # Импортирует валидатор для проверки минимального значения поля.
-from django.db import models  # Импортирует модуль models для определения моделей базы данных.
+from django.db import models, transaction  # models - для определения моделей базы данных, transaction - для действий после фиксации.
+
+from .stock_index import stock_index  # Индекс складских запасов, общий для процесса.
+from .versioning import bump_component_versions  # Сброс кэшированных фрагментов компонента.
 
 User = get_user_model()  # Получает модель пользователя, используемую в проекте.
 
@@ -58,7 +61,7 @@ class CPU(models.Model):
         verbose_name="Цена",
         validators=[MinValueValidator(0)],  # Цена не может быть отрицательной.
     )
-    socket = models.CharField(max_length=50, verbose_name="Сокет")  # Сокет процессора (строка, максимум 50 символов).
+    socket = models.CharField(max_length=50, db_index=True, verbose_name="Сокет")  # Сокет процессора (строка, максимум 50 символов). Индексирован для подбора платформы по сокету.
     image = models.ImageField(  # Изображение процессора.
         upload_to='cpu_images/', verbose_name="Изображение", blank=True, null=True # Изображения загружаются в директорию 'cpu_images/'. Поле может быть пустым.
     )
@@ -76,20 +79,27 @@ class CPU(models.Model):
 
     def is_compatible_with_motherboard(self, motherboard):
         """Проверяет совместимость сокета процессора и материнской платы."""
-        return self.socket == motherboard.socket  # Проверяет, совпадают ли сокеты.
+        from .compatibility import cpu_fits_motherboard  # Локальный импорт: правила совместимости собраны в compatibility.
+
+        return cpu_fits_motherboard(self, motherboard)  # Проверяет, совпадают ли сокеты.
 
     def has_stock(self):
         """Проверяет, есть ли товар в наличии."""
-        try:
-            stock = Stock.objects.get(component_type='cpu', component_id=self.id)  # Пытается получить информацию о запасах данного процессора.
-            return stock.quantity > 0  # Возвращает True, если количество на складе больше 0.
-        except Stock.DoesNotExist:  # Если информация о запасах не найдена.
-            return False  # Возвращает False (товара нет в наличии).
+        return stock_index.in_stock('cpu', self.id)  # Берет количество из индекса запасов без запроса к базе.
 
     reviews = GenericRelation(
         'components.Review', related_query_name='cpu'
     )  # Use string representation to avoid circular import. Обобщенная связь с моделью Review (отзыв) для процессора.
     # related_query_name позволяет запрашивать отзывы, связанные с процессором, используя cpu__поле_отзыва.
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Количество отзывов"
+    )  # Поддерживается сигналами Review (components.reviews), чтобы не считать отзывы при показе.
+    average_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False, verbose_name="Средний рейтинг"
+    )  # Средняя оценка отзывов; 0, если отзывов нет.
+    popularity = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True, verbose_name="Популярность"
+    )  # Продано штук за последние дни; пересчитывается командой update_popularity (components.popularity).
 
 
 # Определение модели Motherboard (Материнская плата)
@@ -101,7 +111,7 @@ class Motherboard(models.Model):
     )
     model = models.CharField(max_length=255, verbose_name="Модель")  # Модель материнской платы.
     form_factor = models.CharField(max_length=50, verbose_name="Форм-фактор")  # Форм-фактор материнской платы (ATX, Micro-ATX и т.д.).
-    socket = models.CharField(max_length=50, verbose_name="Сокет")  # Сокет процессора, поддерживаемый материнской платой.
+    socket = models.CharField(max_length=50, db_index=True, verbose_name="Сокет")  # Сокет процессора, поддерживаемый материнской платой. Индексирован для подбора по сокету.
     chipset = models.CharField(max_length=50, verbose_name="Чипсет")  # Чипсет материнской платы.
     ram_slots = models.IntegerField(verbose_name="Слоты для RAM")  # Количество слотов для оперативной памяти.
     ram_type = models.CharField(
@@ -135,27 +145,32 @@ class Motherboard(models.Model):
 
     def is_compatible_with_cpu(self, cpu):
         """Проверяет совместимость сокета материнской платы и процессора."""
-        return self.socket == cpu.socket  # Проверяет, совпадают ли сокеты.
+        from .compatibility import cpu_fits_motherboard
+
+        return cpu_fits_motherboard(cpu, self)  # Проверяет, совпадают ли сокеты.
 
     def is_compatible_with_ram(self, ram):
         """Проверяет совместимость типа RAM и частоты."""
-        return (
-            self.ram_type == ram.type and self.max_ram_frequency >= ram.frequency
-        )  # Проверяет совместимость типа и частоты оперативной памяти.
+        from .compatibility import ram_fits_motherboard
+
+        return ram_fits_motherboard(ram, self)  # Проверяет совместимость типа и частоты оперативной памяти.
 
     def has_stock(self):
         """Проверяет, есть ли товар в наличии."""
-        try:
-            stock = Stock.objects.get(
-                component_type='motherboard', component_id=self.id
-            )  # Пытается получить информацию о запасах данной материнской платы.
-            return stock.quantity > 0  # Возвращает True, если количество на складе больше 0.
-        except Stock.DoesNotExist:  # Если информация о запасах не найдена.
-            return False  # Возвращает False (товара нет в наличии).
+        return stock_index.in_stock('motherboard', self.id)  # Берет количество из индекса запасов без запроса к базе.
 
     reviews = GenericRelation(
         'components.Review', related_query_name='motherboard'
     ) # Обобщенная связь с моделью Review (отзыв) для материнской платы.
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Количество отзывов"
+    )  # Поддерживается сигналами Review (components.reviews), чтобы не считать отзывы при показе.
+    average_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False, verbose_name="Средний рейтинг"
+    )  # Средняя оценка отзывов; 0, если отзывов нет.
+    popularity = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True, verbose_name="Популярность"
+    )  # Продано штук за последние дни; пересчитывается командой update_popularity (components.popularity).
 
 
 # Определение модели RAM (Оперативная память)
@@ -195,20 +210,24 @@ class RAM(models.Model):
 
     def is_compatible_with_motherboard(self, motherboard):
         """Проверяет совместимость типа RAM и частоты с материнской платой."""
-        return (
-            self.type == motherboard.ram_type
-            and self.frequency <= motherboard.max_ram_frequency
-        )  # Проверяет совместимость типа и частоты оперативной памяти с материнской платой.
+        from .compatibility import ram_fits_motherboard
+
+        return ram_fits_motherboard(self, motherboard)  # Проверяет совместимость типа и частоты оперативной памяти с материнской платой.
 
     def has_stock(self):
         """Проверяет, есть ли товар в наличии."""
-        try:
-            stock = Stock.objects.get(component_type='ram', component_id=self.id)  # Пытается получить информацию о запасах данной оперативной памяти.
-            return stock.quantity > 0  # Возвращает True, если количество на складе больше 0.
-        except Stock.DoesNotExist:  # Если информация о запасах не найдена.
-            return False  # Возвращает False (товара нет в наличии).
+        return stock_index.in_stock('ram', self.id)  # Берет количество из индекса запасов без запроса к базе.
 
     reviews = GenericRelation('components.Review', related_query_name='ram') # Обобщенная связь с моделью Review (отзыв) для оперативной памяти.
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Количество отзывов"
+    )  # Поддерживается сигналами Review (components.reviews), чтобы не считать отзывы при показе.
+    average_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False, verbose_name="Средний рейтинг"
+    )  # Средняя оценка отзывов; 0, если отзывов нет.
+    popularity = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True, verbose_name="Популярность"
+    )  # Продано штук за последние дни; пересчитывается командой update_popularity (components.popularity).
 
 
 # Определение модели GPU (Видеокарта)
@@ -248,17 +267,24 @@ class GPU(models.Model):
 
     def is_power_compatible(self, psu):
         """Проверяет, достаточно ли мощности блока питания для видеокарты."""
-        return self.tdp <= psu.power  # Проверяет, достаточно ли мощности блока питания для TDP видеокарты.
+        from .compatibility import psu_powers_gpu
+
+        return psu_powers_gpu(psu, self)  # Проверяет, достаточно ли мощности блока питания для TDP видеокарты.
 
     def has_stock(self):
         """Проверяет, есть ли товар в наличии."""
-        try:
-            stock = Stock.objects.get(component_type='gpu', component_id=self.id)  # Пытается получить информацию о запасах данной видеокарты.
-            return stock.quantity > 0  # Возвращает True, если количество на складе больше 0.
-        except Stock.DoesNotExist:  # Если информация о запасах не найдена.
-            return False  # Возвращает False (товара нет в наличии).
+        return stock_index.in_stock('gpu', self.id)  # Берет количество из индекса запасов без запроса к базе.
 
     reviews = GenericRelation('components.Review', related_query_name='gpu') # Обобщенная связь с моделью Review (отзыв) для видеокарты.
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Количество отзывов"
+    )  # Поддерживается сигналами Review (components.reviews), чтобы не считать отзывы при показе.
+    average_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False, verbose_name="Средний рейтинг"
+    )  # Средняя оценка отзывов; 0, если отзывов нет.
+    popularity = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True, verbose_name="Популярность"
+    )  # Продано штук за последние дни; пересчитывается командой update_popularity (components.popularity).
 
 
 # Определение модели Storage (Накопитель)
@@ -303,13 +329,18 @@ class Storage(models.Model):
 
     def has_stock(self):
         """Проверяет, есть ли товар в наличии."""
-        try:
-            stock = Stock.objects.get(component_type='storage', component_id=self.id)  # Пытается получить информацию о запасах данного накопителя.
-            return stock.quantity > 0  # Возвращает True, если количество на складе больше 0.
-        except Stock.DoesNotExist:  # Если информация о запасах не найдена.
-            return False  # Возвращает False (товара нет в наличии).
+        return stock_index.in_stock('storage', self.id)  # Берет количество из индекса запасов без запроса к базе.
 
     reviews = GenericRelation('components.Review', related_query_name='storage') # Обобщенная связь с моделью Review (отзыв) для накопителя.
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Количество отзывов"
+    )  # Поддерживается сигналами Review (components.reviews), чтобы не считать отзывы при показе.
+    average_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False, verbose_name="Средний рейтинг"
+    )  # Средняя оценка отзывов; 0, если отзывов нет.
+    popularity = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True, verbose_name="Популярность"
+    )  # Продано штук за последние дни; пересчитывается командой update_popularity (components.popularity).
 
 
 # Определение модели PSU (Блок питания)
@@ -346,17 +377,24 @@ class PSU(models.Model):
 
     def is_sufficient_for_gpu(self, gpu):
         """Проверяет, достаточно ли мощности блока питания для видеокарты."""
-        return self.power >= gpu.tdp  # Проверяет, достаточно ли мощности блока питания для TDP видеокарты.
+        from .compatibility import psu_powers_gpu
+
+        return psu_powers_gpu(self, gpu)  # Проверяет, достаточно ли мощности блока питания для TDP видеокарты.
 
     def has_stock(self):
         """Проверяет, есть ли товар в наличии."""
-        try:
-            stock = Stock.objects.get(component_type='psu', component_id=self.id)  # Пытается получить информацию о запасах данного блока питания.
-            return stock.quantity > 0  # Возвращает True, если количество на складе больше 0.
-        except Stock.DoesNotExist:  # Если информация о запасах не найдена.
-            return False  # Возвращает False (товара нет в наличии).
+        return stock_index.in_stock('psu', self.id)  # Берет количество из индекса запасов без запроса к базе.
 
     reviews = GenericRelation('components.Review', related_query_name='psu') # Обобщенная связь с моделью Review (отзыв) для блока питания.
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Количество отзывов"
+    )  # Поддерживается сигналами Review (components.reviews), чтобы не считать отзывы при показе.
+    average_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False, verbose_name="Средний рейтинг"
+    )  # Средняя оценка отзывов; 0, если отзывов нет.
+    popularity = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True, verbose_name="Популярность"
+    )  # Продано штук за последние дни; пересчитывается командой update_popularity (components.popularity).
 
 
 class Case(models.Model):
@@ -396,13 +434,18 @@ class Case(models.Model):
 
     def has_stock(self):
         """Проверяет, есть ли товар в наличии."""
-        try:
-            stock = Stock.objects.get(component_type='case', component_id=self.id) # Пытается получить информацию о запасах данного корпуса.
-            return stock.quantity > 0 # Возвращает True, если количество на складе больше 0.
-        except Stock.DoesNotExist: # Если информация о запасах не найдена.
-            return False # Возвращает False (товара нет в наличии).
+        return stock_index.in_stock('case', self.id)  # Берет количество из индекса запасов без запроса к базе.
 
     reviews = GenericRelation('components.Review', related_query_name='case') # Обобщенная связь с моделью Review (отзыв) для корпуса.
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Количество отзывов"
+    )  # Поддерживается сигналами Review (components.reviews), чтобы не считать отзывы при показе.
+    average_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False, verbose_name="Средний рейтинг"
+    )  # Средняя оценка отзывов; 0, если отзывов нет.
+    popularity = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True, verbose_name="Популярность"
+    )  # Продано штук за последние дни; пересчитывается командой update_popularity (components.popularity).
 
 
 class Build(models.Model):
@@ -561,13 +604,18 @@ class Cooler(models.Model):
 
     def has_stock(self):
         """Проверяет, есть ли товар в наличии."""
-        try:
-            stock = Stock.objects.get(component_type='cooler', component_id=self.id) # Пытается получить информацию о запасах данного кулера.
-            return stock.quantity > 0 # Возвращает True, если количество на складе больше 0.
-        except Stock.DoesNotExist: # Если информация о запасах не найдена.
-            return False # Возвращает False (товара нет в наличии).
+        return stock_index.in_stock('cooler', self.id)  # Берет количество из индекса запасов без запроса к базе.
 
     reviews = GenericRelation('components.Review', related_query_name='cooler') # Обобщенная связь с моделью Review (отзыв) для кулера.
+    review_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name="Количество отзывов"
+    )  # Поддерживается сигналами Review (components.reviews), чтобы не считать отзывы при показе.
+    average_rating = models.DecimalField(
+        max_digits=3, decimal_places=2, default=0, editable=False, verbose_name="Средний рейтинг"
+    )  # Средняя оценка отзывов; 0, если отзывов нет.
+    popularity = models.PositiveIntegerField(
+        default=0, editable=False, db_index=True, verbose_name="Популярность"
+    )  # Продано штук за последние дни; пересчитывается командой update_popularity (components.popularity).
 
 
 class Stock(models.Model):
@@ -595,27 +643,31 @@ class Stock(models.Model):
     def __str__(self):
         return f"{self.get_component_name()} - {self.quantity}" # Возвращает строку, содержащую название компонента и его количество на складе.
 
+    def save(self, *args, **kwargs):
+        """Сохраняет запись и после фиксации транзакции сбрасывает индекс складских запасов."""
+        super().save(*args, **kwargs)
+        self._reset_stock_caches()
+
+    def delete(self, *args, **kwargs):
+        """Удаляет запись и после фиксации транзакции сбрасывает индекс складских запасов."""
+        result = super().delete(*args, **kwargs)
+        self._reset_stock_caches()
+        return result
+
+    def _reset_stock_caches(self):
+        """Сбрасывает индекс запасов и версию карточки компонента, когда изменение зафиксировано."""
+        key = (self.component_type, self.component_id)
+        transaction.on_commit(stock_index.invalidate)  # Следующее обращение к индексу перечитает запасы из базы.
+        transaction.on_commit(lambda: bump_component_versions([key]))  # Наличие выводится в карточке компонента.
+
     def get_component_name(self):
         """Возвращает имя компонента."""
-        component_model = {
-            'cpu': CPU,
-            'gpu': GPU,
-            'motherboard': Motherboard,
-            'ram': RAM,
-            'storage': Storage,
-            'psu': PSU,
-            'case': Case,
-            'cooler': Cooler,
-        }.get(self.component_type) # Получает модель компонента по его типу.
-
-        if component_model:
-            try:
-                component = component_model.objects.get(pk=self.component_id) # Пытается получить экземпляр компонента по ID.
-                return f"{component.manufacturer} {component.model}" # Возвращает название компонента (производитель + модель).
-            except component_model.DoesNotExist:
-                return "Компонент не найден" # Возвращает сообщение, если компонент не найден.
-        else:
-            return "Неизвестный тип компонента" # Возвращает сообщение, если тип компонента неизвестен.
+        if hasattr(self, '_component_name'):
+            return self._component_name # Название уже загружено для всей страницы (prime_component_names).
+        from .resolver import resolve_component_names # Локальный импорт: resolver импортирует модели.
+
+        key = (self.component_type, self.component_id)
+        return resolve_component_names([key])[key] # Название компонента (производитель + модель) или сообщение, что он не найден.
 
     def get_component_type_display(self):
         return dict(self.COMPONENT_TYPE_CHOICES).get(
@@ -629,6 +681,12 @@ class Stock(models.Model):
             'component_type',
             'component_id',
         )  # Гарантирует уникальность записи для каждого компонен # Гарантирует, что для каждого типа и ID компонента будет только одна запись в таблице запасов.
+        indexes = [
+            models.Index(
+                fields=['quantity', 'component_type', 'component_id'],
+                name='components_stock_qty_idx',
+            ),
+        ]  # Список и счетчик отсутствующих товаров (quantity=0) в порядке типа и ID без сортировки.
 
 
 class Review(models.Model):
@@ -648,6 +706,138 @@ class Review(models.Model):
         verbose_name = "Отзыв"
         verbose_name_plural = "Отзывы"
         ordering = ['-created_at'] # Сортировка по дате создания (от новых к старым).
+        indexes = [
+            models.Index(
+                fields=['content_type', 'object_id', '-created_at'],
+                name='components_review_object_idx',
+            ),
+        ]  # Страница отзывов компонента и пересчет его рейтинга читают только этот индекс.
+
+    def __str__(self):
+        return f"Отзыв от {self.user.username} на {self.content_object}" # Возвращает строку, содержащую имя пользователя и объект, на который оставлен отзыв.
+
+class SearchDocument(models.Model):
+    """Документ поискового индекса: один компонент любого типа."""
+
+    component_type = models.CharField(
+        max_length=50,
+        choices=Stock.COMPONENT_TYPE_CHOICES,
+        verbose_name="Тип компонента",
+    ) # Тип проиндексированного компонента.
+    component_id = models.PositiveIntegerField(verbose_name="ID компонента") # ID компонента в соответствующей таблице.
+    title = models.CharField(max_length=512, verbose_name="Название") # Производитель и модель - отображаются в результатах поиска без запроса к таблице компонента.
+    price = models.DecimalField(max_digits=10, decimal_places=2, verbose_name="Цена") # Цена компонента на момент индексации.
+
+    def __str__(self):
+        return self.title
+
+    class Meta:
+        verbose_name = "Поисковый документ"
+        verbose_name_plural = "Поисковые документы"
+        unique_together = (
+            'component_type',
+            'component_id',
+        )  # Один документ на компонент.
+
+
+class SearchTerm(models.Model):
+    """Запись инвертированного индекса: n-грамма, встречающаяся в документе."""
+
+    gram = models.CharField(max_length=3, verbose_name="N-грамма") # Триграмма слова или префикс '^x' (начало слова).
+    document = models.ForeignKey(
+        SearchDocument,
+        on_delete=models.CASCADE,
+        related_name='terms',
+        verbose_name="Документ",
+    ) # Документ, в котором встречается n-грамма.
+    weight = models.PositiveSmallIntegerField(default=1, verbose_name="Вес") # Вес совпадения: название важнее характеристик.
+
+    class Meta:
+        verbose_name = "Поисковый термин"
+        verbose_name_plural = "Поисковые термины"
+        unique_together = (
+            'gram',
+            'document',
+        )  # Уникальный индекс (gram, document) - поиск идет по его префиксу gram.
+
+
+class CompatibilityEdge(models.Model):
+    """
+    Ребро графа совместимости: компонент source совместим с компонентом target.
+
+    Каждая совместимая пара хранится в обе стороны, поэтому выборка «какие
+    компоненты типа X подходят к выбранным» идет по одному индексу
+    (target_type, source_type, source_id).
+    """
+
+    source_type = models.CharField(
+        max_length=50,
+        choices=Stock.COMPONENT_TYPE_CHOICES,
+        verbose_name="Тип компонента",
+    ) # Тип выбранного компонента.
+    source_id = models.PositiveIntegerField(verbose_name="ID компонента") # ID выбранного компонента.
+    target_type = models.CharField(
+        max_length=50,
+        choices=Stock.COMPONENT_TYPE_CHOICES,
+        verbose_name="Тип совместимого компонента",
+    ) # Тип компонента, совместимого с выбранным.
+    target_id = models.PositiveIntegerField(verbose_name="ID совместимого компонента") # ID совместимого компонента.
 
     def __str__(self):
-        return f"Отзыв от {self.user.username} на {self.content_object}" # Возвращает строку, содержащую имя пользователя и объект, на который оставлен отзыв.
\ No newline at end of file
+        return f"{self.source_type} #{self.source_id} -> {self.target_type} #{self.target_id}"
+
+    class Meta:
+        verbose_name = "Ребро совместимости"
+        verbose_name_plural = "Граф совместимости"
+        unique_together = (
+            'target_type',
+            'source_type',
+            'source_id',
+            'target_id',
+        )  # Уникальный индекс; его префикс (target_type, source_type, source_id) используется при подборе.
+        indexes = [
+            models.Index(
+                fields=['source_type', 'source_id'],
+                name='components_compat_source_idx',
+            ),
+            models.Index(
+                fields=['target_type', 'target_id'],
+                name='components_compat_target_idx',
+            ),
+        ]  # Удаление ребер компонента при его изменении или удалении.
+
+
+class PopularityBucket(models.Model):
+    """
+    Продажи компонента за один день: компактная сводка позиций заказов.
+
+    Корзины пополняются только новыми позициями заказов (после last_item_id),
+    а популярность компонента - сумма его корзин за скользящее окно.
+    """
+
+    component_type = models.CharField(
+        max_length=50,
+        choices=Stock.COMPONENT_TYPE_CHOICES,
+        verbose_name="Тип компонента",
+    ) # Тип проданного компонента.
+    component_id = models.PositiveIntegerField(verbose_name="ID компонента") # ID проданного компонента.
+    day = models.DateField(verbose_name="День") # День оформления заказов.
+    quantity = models.PositiveIntegerField(default=0, verbose_name="Продано, шт.") # Количество проданных штук за день.
+    last_item_id = models.PositiveIntegerField(
+        default=0, db_index=True, verbose_name="Последняя позиция заказа"
+    ) # Наибольший ID учтенной позиции заказа; максимум по таблице - точка продолжения подсчета.
+
+    def __str__(self):
+        return f"{self.component_type} #{self.component_id} {self.day}: {self.quantity}"
+
+    class Meta:
+        verbose_name = "Продажи за день"
+        verbose_name_plural = "Продажи по дням"
+        unique_together = (
+            'component_type',
+            'component_id',
+            'day',
+        )  # Одна корзина на компонент и день; префикс индекса используется при пересчете популярности.
+        indexes = [
+            models.Index(fields=['day'], name='components_popularity_day_idx'),
+        ]  # Удаление корзин, вышедших из окна.
@@ -0,0 +1,203 @@
+# components/popularity.py
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, Max, PositiveIntegerField, Sum, When
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+POPULARITY_WINDOW_DAYS = 30  # Скользящее окно популярности (дни).
+RECOUNT_DAYS = 2  # Последние дни (включая сегодня) пересчитываются целиком: позиции заказов фиксируются не в порядке pk.
+
+
+def _component_models():
+    from .resolver import COMPONENT_MODELS  # Локальный импорт: resolver импортирует модели.
+
+    return COMPONENT_MODELS
+
+
+def _bucket_model():
+    from .models import PopularityBucket
+
+    return PopularityBucket
+
+
+def _order_item_model():
+    from builds.models import OrderItem  # Локальный импорт: builds зависит от components.
+
+    return OrderItem
+
+
+def window_start(today=None, days=POPULARITY_WINDOW_DAYS):
+    """Первый день окна популярности."""
+    today = today or timezone.now().date()
+    return today - timedelta(days=days - 1)
+
+
+def _day_start(day):
+    """Начало дня для сравнения с order_date (по индексу, без преобразования столбца)."""
+    start = datetime.combine(day, time.min)
+    return timezone.make_aware(start) if settings.USE_TZ else start
+
+
+def _daily_sales(**filters):
+    """Продажи компонентов по дням: строки (component_type, component_id, day, sold, last_item)."""
+    return (
+        _order_item_model().objects.filter(
+            component_type__isnull=False, component_id__isnull=False, **filters
+        )
+        .values('component_type', 'component_id', day=TruncDate('order__order_date'))
+        .annotate(sold=Sum('quantity'), last_item=Max('pk'))
+        .order_by()
+    )
+
+
+def _add_sales(since_day, recount_from):
+    """
+    Добавляет в корзины дней до recount_from позиции заказов, еще не учтенные подсчетом.
+
+    Читаются только позиции с ID больше наибольшего last_item_id корзин,
+    поэтому стоимость прохода зависит от числа новых заказов, а не от всей истории.
+    Водяной знак годится только для дней, заказы которых уже зафиксированы:
+    параллельный заказ может получить меньший ID и зафиксироваться позже,
+    поэтому последние дни пересчитывает _recount_recent.
+    Возвращает множество затронутых пар (тип, ID).
+    """
+    if since_day >= recount_from:
+        return set()  # Окно не длиннее пересчитываемых дней.
+    bucket_model = _bucket_model()
+    watermark = bucket_model.objects.aggregate(last=Max('last_item_id'))['last'] or 0
+    sales = _daily_sales(
+        pk__gt=watermark,
+        order__order_date__gte=_day_start(since_day),
+        order__order_date__lt=_day_start(recount_from),
+    )
+    touched = set()
+    for row in sales:
+        key = {
+            'component_type': row['component_type'],
+            'component_id': row['component_id'],
+            'day': row['day'],
+        }
+        updated = bucket_model.objects.filter(**key).update(
+            quantity=F('quantity') + row['sold'],
+            last_item_id=Greatest('last_item_id', row['last_item']),
+        )
+        if not updated:
+            bucket_model.objects.create(quantity=row['sold'], last_item_id=row['last_item'], **key)
+        touched.add((row['component_type'], row['component_id']))
+    return touched
+
+
+def _recount_recent(recount_from):
+    """
+    Пересчитывает целиком корзины дней начиная с recount_from.
+
+    Позиции заказов последних дней читаются заново (по индексу на order_date),
+    поэтому позиция, зафиксированная позже позиции с большим ID, не теряется.
+    Стоимость прохода зависит от числа заказов за RECOUNT_DAYS дней.
+    Возвращает множество затронутых пар (тип, ID).
+    """
+    bucket_model = _bucket_model()
+    buckets = {
+        (bucket.component_type, bucket.component_id, bucket.day): bucket
+        for bucket in bucket_model.objects.filter(day__gte=recount_from)
+    }
+    touched = set()
+    for row in _daily_sales(order__order_date__gte=_day_start(recount_from)):
+        key = (row['component_type'], row['component_id'], row['day'])
+        bucket = buckets.pop(key, None)
+        if bucket is None:
+            bucket_model.objects.create(
+                component_type=row['component_type'], component_id=row['component_id'], day=row['day'],
+                quantity=row['sold'], last_item_id=row['last_item'],
+            )
+        elif bucket.quantity != row['sold'] or bucket.last_item_id < row['last_item']:
+            bucket_model.objects.filter(pk=bucket.pk).update(
+                quantity=row['sold'], last_item_id=max(bucket.last_item_id, row['last_item'])
+            )
+        else:
+            continue
+        touched.add(key[:2])
+    for (component_type, component_id, _), bucket in buckets.items():
+        if bucket.quantity:  # Заказы дня удалены; корзина остается ради водяного знака.
+            bucket_model.objects.filter(pk=bucket.pk).update(quantity=0)
+            touched.add((component_type, component_id))
+    return touched
+
+
+def _drop_expired(since_day):
+    """
+    Удаляет корзины, вышедшие из окна. Возвращает множество затронутых пар (тип, ID).
+
+    Корзина с наибольшим last_item_id остается с нулевым количеством: по ней
+    продолжается подсчет новых позиций, а в следующих проходах она уже не
+    считается изменившейся.
+    """
+    bucket_model = _bucket_model()
+    watermark = bucket_model.objects.aggregate(last=Max('last_item_id'))['last'] or 0
+    expired = bucket_model.objects.filter(day__lt=since_day)
+    touched = set(expired.filter(quantity__gt=0).values_list('component_type', 'component_id'))
+    expired.exclude(last_item_id=watermark).delete()
+    expired.filter(quantity__gt=0).update(quantity=0)  # Осталась только корзина водяного знака.
+    return touched
+
+
+def _write_scores(touched, since_day):
+    """Пересчитывает popularity затронутых компонентов: один UPDATE на тип."""
+    bucket_model = _bucket_model()
+    models = _component_models()
+    by_type = {}
+    for component_type, component_id in touched:
+        by_type.setdefault(component_type, set()).add(component_id)
+    for component_type, ids in by_type.items():
+        model = models.get(component_type)
+        if model is None:
+            continue
+        scores = dict.fromkeys(ids, 0)
+        scores.update(
+            bucket_model.objects.filter(
+                component_type=component_type, component_id__in=ids, day__gte=since_day
+            )
+            .values('component_id')
+            .annotate(total=Sum('quantity'))
+            .order_by()
+            .values_list('component_id', 'total')
+        )
+        model.objects.filter(pk__in=ids).update(
+            popularity=Case(
+                *[When(pk=component_id, then=score) for component_id, score in scores.items()],
+                default=F('popularity'),
+                output_field=PositiveIntegerField(),
+            )
+        )
+
+
+def update_popularity(today=None, days=POPULARITY_WINDOW_DAYS):
+    """
+    Инкрементально обновляет популярность компонентов по истории заказов.
+
+    Новые позиции заказов добавляются в дневные корзины, корзины последних
+    RECOUNT_DAYS дней пересчитываются целиком, вышедшие из окна корзины
+    удаляются, и popularity пересчитывается только у компонентов, чьи корзины
+    изменились. Возвращает количество обновленных компонентов.
+    """
+    today = today or timezone.now().date()
+    since_day = window_start(today, days)
+    recount_from = max(since_day, today - timedelta(days=RECOUNT_DAYS - 1))
+    with transaction.atomic():
+        touched = (
+            _add_sales(since_day, recount_from) | _recount_recent(recount_from) | _drop_expired(since_day)
+        )
+        _write_scores(touched, since_day)
+    return len(touched)
+
+
+def rebuild_popularity(today=None, days=POPULARITY_WINDOW_DAYS):
+    """Пересчитывает популярность с нуля по заказам за окно (после смены окна или чистки данных)."""
+    with transaction.atomic():
+        _bucket_model().objects.all().delete()
+        for model in _component_models().values():
+            model.objects.filter(popularity__gt=0).update(popularity=0)
+        return update_popularity(today, days)
@@ -0,0 +1,202 @@
+# components/resolver.py
+import threading
+from collections import OrderedDict, namedtuple
+
+from django.core.cache import cache
+from django.db.models import CharField, Q, Value
+from django.db.models.functions import Cast, Concat
+
+from .models import (
+    CPU,
+    GPU,
+    Motherboard,
+    RAM,
+    Storage,
+    PSU,
+    Case,
+    Cooler,
+    Stock,
+)
+
+COMPONENT_MODELS = {
+    'cpu': CPU,
+    'gpu': GPU,
+    'motherboard': Motherboard,
+    'ram': RAM,
+    'storage': Storage,
+    'psu': PSU,
+    'case': Case,
+    'cooler': Cooler,
+}  # Тип компонента -> модель.
+
+NOT_FOUND_NAME = "Компонент не найден"  # Название для ссылки на удаленный компонент.
+UNKNOWN_TYPE_NAME = "Неизвестный тип компонента"  # Название для неизвестного типа.
+RESOLVER_CACHE_SIZE = 4096  # Максимальное количество компонентов в LRU-кэше процесса.
+RESOLVER_VERSION_KEY = 'component_resolver_version'  # Ключ версии кэша в общем кэше (Redis).
+
+
+def component_name_expression():
+    """Выражение «Производитель Модель», совпадающее с f'{component.manufacturer} {component.model}'."""
+    return Concat('manufacturer__name', Value(' '), 'model', output_field=CharField())
+
+
+def stock_search_filter(query):
+    """
+    Условие для Stock: название компонента или количество содержит query.
+
+    Для каждого типа строится подзапрос component_id IN (...) по таблице компонента,
+    поэтому фильтрация целиком выполняется в базе одним запросом.
+    """
+    condition = Q(
+        pk__in=_stock_ids_with_quantity(query)
+    )  # Поиск по количеству, как и раньше, - по вхождению подстроки.
+    for component_type, model in COMPONENT_MODELS.items():
+        matching_ids = (
+            model.objects.annotate(full_name=component_name_expression())
+            .filter(full_name__icontains=query)
+            .values('pk')
+        )
+        condition |= Q(component_type=component_type, component_id__in=matching_ids)
+    return condition
+
+
+def _stock_ids_with_quantity(query):
+    """Подзапрос ID записей Stock, количество которых содержит query как подстроку."""
+    return (
+        Stock.objects.annotate(quantity_text=Cast('quantity', CharField()))
+        .filter(
+            quantity_text__contains=query,
+            component_type__in=COMPONENT_MODELS,
+        )
+        .values('pk')
+    )
+
+
+class ComponentInfo(namedtuple('ComponentInfo', 'name price image_url found')):
+    """Данные компонента для списков: название, цена, URL изображения и признак, что компонент найден."""
+
+
+class ComponentResolver:
+    """
+    Пакетное разрешение ссылок (component_type, component_id) с LRU-кэшем.
+
+    Промахи кэша группируются по типу и загружаются одним in_bulk на тип.
+    Кэш сбрасывается при изменении компонентов; версия в общем кэше (Redis)
+    сообщает об этом остальным процессам.
+    """
+
+    def __init__(self, max_size=RESOLVER_CACHE_SIZE):
+        self._lock = threading.Lock()  # Защищает OrderedDict от одновременного изменения потоками.
+        self._entries = OrderedDict()  # (component_type, component_id) -> ComponentInfo в порядке использования.
+        self._max_size = max_size
+        self._version = None  # Версия общего кэша, с которой согласованы записи.
+
+    def _shared_version(self):
+        try:
+            return cache.get(RESOLVER_VERSION_KEY, 0)
+        except Exception:
+            return 0  # Без Redis кэш сбрасывается только в пределах процесса.
+
+    def resolve(self, pairs):
+        """Возвращает словарь {(component_type, component_id): ComponentInfo}."""
+        keys = {(component_type, component_id) for component_type, component_id in pairs}
+        if not keys:
+            return {}
+        version = self._shared_version()
+        result = {}
+        with self._lock:
+            if self._version != version:  # Компоненты менялись в другом процессе.
+                self._entries.clear()
+                self._version = version
+            for key in keys:
+                info = self._entries.get(key)
+                if info is not None:
+                    self._entries.move_to_end(key)
+                    result[key] = info
+
+        missing = {}
+        for component_type, component_id in keys - result.keys():
+            missing.setdefault(component_type, set()).add(component_id)
+        loaded = {}
+        for component_type, ids in missing.items():
+            loaded.update(self._load(component_type, ids))
+
+        if loaded:
+            with self._lock:
+                for key, info in loaded.items():
+                    self._entries[key] = info
+                    self._entries.move_to_end(key)
+                while len(self._entries) > self._max_size:
+                    self._entries.popitem(last=False)  # Вытесняем давно не использованные записи.
+            result.update(loaded)
+        return result
+
+    def _load(self, component_type, ids):
+        """Загружает компоненты одного типа одним запросом."""
+        model = COMPONENT_MODELS.get(component_type)
+        if model is None:
+            return {
+                (component_type, pk): ComponentInfo(UNKNOWN_TYPE_NAME, None, '', False)
+                for pk in ids
+            }
+        components = model.objects.select_related('manufacturer').in_bulk(ids)
+        infos = {}
+        for pk in ids:
+            component = components.get(pk)
+            if component is None:
+                infos[(component_type, pk)] = ComponentInfo(NOT_FOUND_NAME, None, '', False)
+            else:
+                infos[(component_type, pk)] = ComponentInfo(
+                    f"{component.manufacturer} {component.model}",
+                    component.price,
+                    component.image.url if component.image else '',
+                    True,
+                )
+        return infos
+
+    def invalidate(self, component_type=None, component_id=None):
+        """Сбрасывает запись компонента (или весь кэш) и увеличивает общую версию."""
+        with self._lock:
+            if component_type is None:
+                self._entries.clear()
+            else:
+                self._entries.pop((component_type, component_id), None)
+        try:
+            cache.incr(RESOLVER_VERSION_KEY)
+        except ValueError:
+            cache.set(RESOLVER_VERSION_KEY, 1, None)  # Ключа еще нет - создаем его без срока жизни.
+        except Exception:
+            pass  # Кэш недоступен - достаточно локального сброса.
+        with self._lock:
+            self._version = self._shared_version()  # Свой сброс уже учтен - не очищаем кэш повторно.
+
+
+component_resolver = ComponentResolver()  # Общий экземпляр для процесса.
+
+
+def resolve_components(pairs):
+    """Возвращает словарь {(component_type, component_id): ComponentInfo} для набора пар."""
+    return component_resolver.resolve(pairs)
+
+
+def resolve_component_names(pairs):
+    """Возвращает словарь {(component_type, component_id): название} для набора пар."""
+    return {key: info.name for key, info in resolve_components(pairs).items()}
+
+
+def prime_component_names(items):
+    """
+    Заранее загружает данные компонентов для списка объектов с полями
+    component_type/component_id (например, страницы Stock).
+
+    Объекты получают атрибут component_info, а get_component_name() больше
+    не обращается к базе.
+    """
+    items = list(items)
+    infos = resolve_components(
+        (item.component_type, item.component_id) for item in items
+    )
+    for item in items:
+        item.component_info = infos[(item.component_type, item.component_id)]
+        item._component_name = item.component_info.name
+    return items
@@ -0,0 +1,89 @@
+# components/reviews.py
+from decimal import Decimal
+
+from django.db.models import Avg, Count
+
+from pc_builder.pagination import CURSOR_PARAM, KeysetPaginator
+
+REVIEWS_PER_PAGE = 10  # Количество отзывов на странице компонента.
+REVIEW_ORDERING = ('-created_at',)  # Сначала новые; ключ курсорной пагинации.
+RATING_PLACES = Decimal('0.01')  # Точность среднего рейтинга (как в поле average_rating).
+
+
+def _average(value):
+    return Decimal(str(value or 0)).quantize(RATING_PLACES)
+
+
+def _component_models():
+    from .resolver import COMPONENT_MODELS  # Локальный импорт: resolver импортирует модели.
+
+    return COMPONENT_MODELS
+
+
+def refresh_rating(component_type, component_id):
+    """
+    Пересчитывает review_count и average_rating компонента после изменения его отзывов.
+
+    Агрегат считается по индексу отзывов компонента, а значения записываются
+    через update(), поэтому сигналы сохранения компонента не срабатывают.
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from .models import Review
+
+    model = _component_models().get(component_type)
+    if model is None:
+        return  # Отзыв не к компоненту каталога.
+    totals = Review.objects.filter(
+        content_type=ContentType.objects.get_for_model(model), object_id=component_id
+    ).aggregate(count=Count('pk'), average=Avg('rating'))
+    model.objects.filter(pk=component_id).update(
+        review_count=totals['count'], average_rating=_average(totals['average'])
+    )
+
+
+def rebuild_ratings(models=None, review_model=None, content_type_model=None):
+    """
+    Пересчитывает рейтинги всех компонентов: один агрегирующий запрос на тип.
+
+    Параметры позволяют вызвать пересчет из миграции с историческими моделями.
+    """
+    if review_model is None:
+        from django.contrib.contenttypes.models import ContentType as content_type_model
+
+        from .models import Review as review_model
+    models = models or _component_models()
+    for component_type, model in models.items():
+        content_type = content_type_model.objects.filter(
+            app_label='components', model=component_type
+        ).first()
+        model.objects.update(review_count=0, average_rating=0)
+        if content_type is None:
+            continue  # Таблица типов еще пуста - отзывов к этому типу быть не может.
+        totals = (
+            review_model.objects.filter(content_type=content_type)
+            .values('object_id')
+            .annotate(count=Count('pk'), average=Avg('rating'))
+            .order_by()
+        )
+        for row in totals:
+            model.objects.filter(pk=row['object_id']).update(
+                review_count=row['count'], average_rating=_average(row['average'])
+            )
+
+
+def review_context(request, component):
+    """
+    Контекст отзывов компонента: страница (KeysetPage по ?cursor=) и курсор для ключа кэша.
+
+    Страница ленивая: запрос к отзывам выполняется, только если шаблон ее
+    выводит, то есть при промахе кэша фрагмента. Курсор в ключе проверен и
+    приведен к канонической записи (normalize_cursor). Курсорная пагинация не
+    выполняет COUNT(*) и OFFSET; количество и средняя оценка берутся из полей компонента.
+    """
+    paginator = KeysetPaginator(component.reviews.select_related('user'), REVIEWS_PER_PAGE, REVIEW_ORDERING)
+    cursor = paginator.normalize_cursor(request.GET.get(CURSOR_PARAM))
+    return {
+        'reviews': paginator.lazy_page(cursor),
+        'reviews_cursor': cursor,
+    }
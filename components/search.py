@@ -0,0 +1,163 @@
+# components/search.py
+import math
+import re
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from .models import (
+    CPU,
+    GPU,
+    Motherboard,
+    RAM,
+    Storage,
+    PSU,
+    Case,
+    Cooler,
+    SearchDocument,
+    SearchTerm,
+)
+
+SEARCH_SPECS = {
+    'cpu': (CPU, ('socket',)),
+    'gpu': (GPU, ('interface', 'memory')),
+    'motherboard': (Motherboard, ('socket', 'chipset', 'form_factor', 'ram_type')),
+    'ram': (RAM, ('type', 'capacity', 'frequency')),
+    'storage': (Storage, ('type', 'interface', 'capacity')),
+    'psu': (PSU, ('certification', 'power')),
+    'case': (Case, ('form_factor',)),
+    'cooler': (Cooler, ('cooler_type', 'radiator_size', 'fan_size')),
+}  # Тип компонента -> (модель, характеристики, которые попадают в индекс).
+
+TITLE_WEIGHT = 2  # Вес n-грамм из производителя и модели.
+SPEC_WEIGHT = 1  # Вес n-грамм из характеристик.
+MIN_MATCH_RATIO = 0.5  # Доля n-грамм запроса, которые должны совпасть (допускает опечатки).
+BATCH_SIZE = 1000  # Размер пакета при массовой записи терминов.
+
+TOKEN_RE = re.compile(r'\w+')  # Слова: буквы, цифры и подчеркивание (в том числе кириллица).
+
+
+def tokenize(text):
+    """Разбивает текст на слова в нижнем регистре."""
+    return TOKEN_RE.findall(str(text).lower().replace('ё', 'е'))
+
+
+def token_grams(token, complete=True):
+    """
+    Возвращает n-граммы слова: префикс '^x' и триграммы слова с маркерами '^' и '$'.
+
+    Для незаконченного слова (последнее слово запроса) маркер конца не ставится,
+    поэтому запрос 'ryz' совпадает с началом слова 'ryzen'.
+    """
+    padded = f"^{token}{'$' if complete else ''}"
+    grams = {padded[:2]}
+    grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def document_grams(title, specs):
+    """Возвращает словарь {n-грамма: вес} для названия и характеристик компонента."""
+    grams = {}
+    for text, weight in [(title, TITLE_WEIGHT)] + [(spec, SPEC_WEIGHT) for spec in specs]:
+        for token in tokenize(text):
+            for gram in token_grams(token):
+                grams[gram] = max(weight, grams.get(gram, 0))
+    return grams
+
+
+def query_grams(query):
+    """Возвращает n-граммы поискового запроса (последнее слово ищется по префиксу)."""
+    tokens = tokenize(query)
+    grams = set()
+    for position, token in enumerate(tokens):
+        grams |= token_grams(token, complete=position < len(tokens) - 1)
+    return grams
+
+
+def _component_document(component_type, component, document_model=SearchDocument):
+    """Возвращает (документ, n-граммы) для компонента (manufacturer должен быть загружен)."""
+    _, spec_fields = SEARCH_SPECS[component_type]
+    document = document_model(
+        component_type=component_type,
+        component_id=component.pk,
+        title=f"{component.manufacturer.name} {component.model}",
+        price=component.price,
+    )
+    specs = [getattr(component, name) for name in spec_fields]
+    return document, document_grams(document.title, specs)
+
+
+def index_component(component_type, component):
+    """Добавляет или обновляет компонент в поисковом индексе."""
+    document, grams = _component_document(component_type, component)
+    with transaction.atomic():
+        document, _ = SearchDocument.objects.update_or_create(
+            component_type=component_type,
+            component_id=component.pk,
+            defaults={'title': document.title, 'price': document.price},
+        )
+        document.terms.all().delete()  # Термины пересоздаются целиком - документ небольшой.
+        SearchTerm.objects.bulk_create(
+            SearchTerm(document=document, gram=gram, weight=weight)
+            for gram, weight in grams.items()
+        )
+
+
+def remove_component(component_type, component_id):
+    """Удаляет компонент из поискового индекса (термины удаляются каскадно)."""
+    SearchDocument.objects.filter(
+        component_type=component_type, component_id=component_id
+    ).delete()
+
+
+def rebuild_index(models=None, document_model=None, term_model=None):
+    """
+    Полностью перестраивает поисковый индекс. Возвращает количество документов.
+
+    models, document_model и term_model позволяют вызвать перестроение из
+    миграции с историческими моделями; по умолчанию используются модели приложения.
+    """
+    models = models or {component_type: model for component_type, (model, _) in SEARCH_SPECS.items()}
+    document_model = document_model or SearchDocument
+    term_model = term_model or SearchTerm
+    total = 0
+    with transaction.atomic():
+        term_model.objects.all().delete()
+        document_model.objects.all().delete()
+        for component_type, model in models.items():
+            pending = [
+                _component_document(component_type, component, document_model)
+                for component in model.objects.select_related('manufacturer')
+            ]
+            documents = document_model.objects.bulk_create(
+                [document for document, _ in pending], batch_size=BATCH_SIZE
+            )  # ID заполняются на MSSQL, PostgreSQL и SQLite 3.35+.
+            term_model.objects.bulk_create(
+                (
+                    term_model(document=document, gram=gram, weight=weight)
+                    for document, (_, grams) in zip(documents, pending)
+                    for gram, weight in grams.items()
+                ),
+                batch_size=BATCH_SIZE,
+            )
+            total += len(documents)
+    return total
+
+
+def search(query, limit=20):
+    """
+    Ищет компоненты всех типов по n-граммам запроса.
+
+    Возвращает документы, отсортированные по убыванию суммарного веса совпавших
+    n-грамм. Один запрос: поиск по индексу (gram, document) и группировка по документу.
+    """
+    grams = query_grams(query)
+    if not grams:
+        return []
+    min_hits = max(1, math.ceil(len(grams) * MIN_MATCH_RATIO))
+    return list(
+        SearchDocument.objects.filter(terms__gram__in=grams)
+        .annotate(score=Sum('terms__weight'), hits=Count('terms'))
+        .filter(hits__gte=min_hits)
+        .order_by('-score', 'title')[:limit]
+    )
@@ -1,6 +1,7 @@
 # components/signals.py
 # components/signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
 from builds.models import OrderItem
@@ -13,8 +14,16 @@ from .models import (
     PSU,
     Case,
     Cooler,
+    Manufacturer,
     Stock,
+    Review,
 )  # noqa: F401
+from .compatibility import refresh_component, remove_component_edges
+from .resolver import component_resolver
+from .reviews import refresh_rating
+from .search import SEARCH_SPECS, index_component, remove_component
+from .stock_index import stock_index
+from .versioning import bump_component_versions, touch_components
 
 
 @receiver(post_save, sender=OrderItem)
@@ -38,6 +47,7 @@ def update_stock_on_order_item_create(sender, instance, created, **kwargs):
                 # Обрабатываем случай, когда Stock не существует.
                 # Это может быть уместно, если компоненты создаются без записи Stock.
                 pass
+            transaction.on_commit(stock_index.invalidate)  # Запасы могли измениться - индекс перечитается после фиксации.
 
 
 @receiver(post_save, sender=CPU)
@@ -56,3 +66,110 @@ def create_stock_on_component_create(sender, instance, created, **kwargs):
         Stock.objects.create(
             component_type=component_type, component_id=instance.pk, quantity=10
         )
+
+
+@receiver(post_save, sender=CPU)
+@receiver(post_save, sender=GPU)
+@receiver(post_save, sender=Motherboard)
+@receiver(post_save, sender=RAM)
+@receiver(post_save, sender=Storage)
+@receiver(post_save, sender=PSU)
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=Cooler)
+def update_search_index_on_component_save(sender, instance, **kwargs):
+    """Обновляет документ компонента в поисковом индексе."""
+    index_component(sender._meta.model_name, instance)
+
+
+@receiver(post_delete, sender=CPU)
+@receiver(post_delete, sender=GPU)
+@receiver(post_delete, sender=Motherboard)
+@receiver(post_delete, sender=RAM)
+@receiver(post_delete, sender=Storage)
+@receiver(post_delete, sender=PSU)
+@receiver(post_delete, sender=Case)
+@receiver(post_delete, sender=Cooler)
+def remove_from_search_index_on_component_delete(sender, instance, **kwargs):
+    """Удаляет документ компонента из поискового индекса."""
+    remove_component(sender._meta.model_name, instance.pk)
+
+
+@receiver(post_save, sender=Manufacturer)
+def update_search_index_on_manufacturer_save(sender, instance, created, **kwargs):
+    """Переиндексирует компоненты производителя: название входит в их документы."""
+    if created:
+        return  # У нового производителя еще нет компонентов.
+    touch_components()  # Название производителя входит в названия компонентов конфигуратора.
+    for component_type, (model, _) in SEARCH_SPECS.items():
+        for component in model.objects.filter(manufacturer=instance).select_related('manufacturer'):
+            index_component(component_type, component)
+
+
+@receiver(post_save, sender=CPU)
+@receiver(post_save, sender=GPU)
+@receiver(post_save, sender=Motherboard)
+@receiver(post_save, sender=RAM)
+@receiver(post_save, sender=Storage)
+@receiver(post_save, sender=PSU)
+@receiver(post_save, sender=Case)
+@receiver(post_save, sender=Cooler)
+@receiver(post_delete, sender=CPU)
+@receiver(post_delete, sender=GPU)
+@receiver(post_delete, sender=Motherboard)
+@receiver(post_delete, sender=RAM)
+@receiver(post_delete, sender=Storage)
+@receiver(post_delete, sender=PSU)
+@receiver(post_delete, sender=Case)
+@receiver(post_delete, sender=Cooler)
+def invalidate_resolver_on_component_change(sender, instance, **kwargs):
+    """Сбрасывает закэшированные название, цену и изображение компонента."""
+    component_resolver.invalidate(sender._meta.model_name, instance.pk)
+    touch_components()  # Названия, цены и совместимость в конфигураторе устарели.
+    bump_component_versions([(sender._meta.model_name, instance.pk)])  # Карточка и страница компонента устарели.
+
+
+@receiver(post_save, sender=Manufacturer)
+def invalidate_resolver_on_manufacturer_save(sender, instance, **kwargs):
+    """Название производителя входит в названия компонентов - сбрасываем весь кэш."""
+    component_resolver.invalidate()
+    bump_component_versions(
+        (component_type, component_id)
+        for component_type, (model, _) in SEARCH_SPECS.items()
+        for component_id in model.objects.filter(manufacturer=instance).values_list('pk', flat=True)
+    )  # Фрагменты карточек и страниц компонентов производителя.
+
+
+@receiver(post_save, sender=CPU)
+@receiver(post_save, sender=GPU)
+@receiver(post_save, sender=Motherboard)
+@receiver(post_save, sender=RAM)
+@receiver(post_save, sender=PSU)
+@receiver(post_save, sender=Case)
+def refresh_compatibility_on_component_save(sender, instance, **kwargs):
+    """Пересчитывает ребра графа совместимости для сохраненного компонента."""
+    refresh_component(sender._meta.model_name, instance)
+
+
+@receiver(post_delete, sender=CPU)
+@receiver(post_delete, sender=GPU)
+@receiver(post_delete, sender=Motherboard)
+@receiver(post_delete, sender=RAM)
+@receiver(post_delete, sender=PSU)
+@receiver(post_delete, sender=Case)
+def remove_compatibility_on_component_delete(sender, instance, **kwargs):
+    """Удаляет ребра графа совместимости удаленного компонента."""
+    remove_component_edges(sender._meta.model_name, instance.pk)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_rating_on_review_change(sender, instance, **kwargs):
+    """Пересчитывает количество отзывов и средний рейтинг компонента."""
+    refresh_rating(instance.content_type.model, instance.object_id)
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_fragments_on_review_change(sender, instance, **kwargs):
+    """Отзывы выводятся на странице компонента - сбрасываем ее фрагменты."""
+    bump_component_versions([(instance.content_type.model, instance.object_id)])
@@ -0,0 +1,104 @@
+# components/stock_index.py
+import threading
+
+from django.core.cache import cache
+
+from .versioning import touch_catalog
+
+STOCK_INDEX_VERSION_KEY = 'stock_index_version'  # Ключ версии индекса в общем кэше (Redis).
+
+
+class StockIndex:
+    """
+    Процессный индекс складских запасов.
+
+    Хранит количество на складе для всех пар (component_type, component_id)
+    в одном словаре вида {component_type: {component_id: quantity}}.
+    Индекс загружается из Stock одним запросом и сбрасывается при изменении
+    запасов. Версия в общем кэше позволяет другим процессам узнать об изменениях.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Защищает перезагрузку индекса от гонок между потоками.
+        self._quantities = None  # {component_type: {component_id: quantity}} или None, если индекс не загружен.
+        self._version = None  # Версия, с которой был загружен индекс.
+
+    def _shared_version(self):
+        """Возвращает версию индекса из общего кэша (0, если кэш недоступен)."""
+        try:
+            return cache.get(STOCK_INDEX_VERSION_KEY, 0)
+        except Exception:
+            return 0  # Без Redis индекс работает только в пределах процесса.
+
+    def _load(self):
+        """Загружает все записи Stock одним запросом и возвращает новый словарь."""
+        from .models import Stock  # Локальный импорт, чтобы избежать циклического импорта с models.py.
+
+        version = self._shared_version()
+        quantities = {}
+        for component_type, component_id, quantity in Stock.objects.values_list(
+            'component_type', 'component_id', 'quantity'
+        ):
+            quantities.setdefault(component_type, {})[component_id] = quantity
+        self._quantities = quantities
+        self._version = version
+        return quantities
+
+    def _ensure_loaded(self):
+        """
+        Загружает индекс, если он пуст или устарел в другом процессе.
+
+        Возвращает ссылку на словарь, взятую один раз: параллельный invalidate()
+        может сбросить self._quantities сразу после проверки.
+        """
+        quantities = self._quantities
+        if quantities is None or self._version != self._shared_version():
+            with self._lock:
+                quantities = self._quantities
+                if quantities is None or self._version != self._shared_version():
+                    quantities = self._load()
+        return quantities
+
+    def snapshot(self):
+        """
+        Текущий словарь индекса {component_type: {component_id: quantity}} (только для чтения).
+
+        После каждой перезагрузки это новый объект, поэтому производные кэши
+        могут сверяться с ним по идентичности (is).
+        """
+        return self._ensure_loaded()
+
+    def quantity(self, component_type, component_id):
+        """Возвращает количество компонента на складе (0, если записи нет)."""
+        return self._ensure_loaded().get(component_type, {}).get(component_id, 0)
+
+    def in_stock(self, component_type, component_id):
+        """Проверяет, есть ли компонент в наличии."""
+        return self.quantity(component_type, component_id) > 0
+
+    def quantities_for(self, component_type):
+        """Возвращает словарь {component_id: quantity} для типа компонента."""
+        return dict(self._ensure_loaded().get(component_type, {}))
+
+    def in_stock_ids(self, component_type):
+        """Возвращает множество ID компонентов типа, которые есть в наличии."""
+        return {
+            component_id
+            for component_id, quantity in self._ensure_loaded().get(component_type, {}).items()
+            if quantity > 0
+        }
+
+    def invalidate(self):
+        """Сбрасывает индекс в текущем процессе и увеличивает общую версию."""
+        with self._lock:
+            self._quantities = None
+        try:
+            cache.incr(STOCK_INDEX_VERSION_KEY)
+        except ValueError:
+            cache.set(STOCK_INDEX_VERSION_KEY, 1, None)  # Ключа еще нет - создаем его без срока жизни.
+        except Exception:
+            pass  # Кэш недоступен - достаточно локального сброса.
+        touch_catalog()  # Наличие влияет на списки конфигуратора - их ETag устаревают.
+
+
+stock_index = StockIndex()  # Общий экземпляр индекса для процесса.
@@ -1,8 +1,27 @@
 # components/templatetags/component_tags.py
 from django import template
 
+from pc_builder.pagination import CURSOR_PARAM
+
 register = template.Library()
 
 @register.filter
 def get_item(dictionary, key):
     return dictionary.get(key)
+
+@register.simple_tag(takes_context=True)
+def cursor_query(context, cursor):
+    """Строка запроса для перехода по курсору с сохранением остальных GET параметров."""
+    params = context['request'].GET.copy()
+    params.pop('page', None)  # Номер страницы не используется вместе с курсором.
+    params[CURSOR_PARAM] = cursor
+    return params.urlencode()
+
+
+@register.simple_tag(takes_context=True)
+def page_query(context, number):
+    """Строка запроса для перехода на страницу number с сохранением фильтров, поиска и сортировки."""
+    params = context['request'].GET.copy()
+    params.pop(CURSOR_PARAM, None)  # Курсор не используется вместе с номером страницы.
+    params['page'] = number
+    return params.urlencode()
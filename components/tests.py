@@ -1,3 +1,571 @@
-from django.test import TestCase
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from pc_builder.pagination import KeysetPage, KeysetPaginator, paginate
+from builds.models import Order, OrderItem
+from .compatibility import compatible_queryset, incompatibilities, rebuild_graph
+from .models import (
+    CPU, GPU, PSU, RAM, CompatibilityEdge, Manufacturer, Motherboard, PopularityBucket, Review, SearchDocument, Stock,
+)
+from .popularity import rebuild_popularity, update_popularity
+from .search import rebuild_index, search
+from .stock_index import STOCK_INDEX_VERSION_KEY, StockIndex, stock_index
+from .versioning import component_versions
+
+
+def create_cpu(manufacturer, model, price, **fields):
+    """Процессор с характеристиками по умолчанию."""
+    values = {'cores': 8, 'frequency': 3.5, 'tdp': 65, 'socket': 'AM4'}
+    values.update(fields)
+    return CPU.objects.create(manufacturer=manufacturer, model=model, price=Decimal(price), **values)
+
+
+class KeysetPaginatorTests(TestCase):
+    """Курсорная пагинация: обход вперед и назад по ключу с повторяющимися значениями."""
+
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = Manufacturer.objects.create(name='AMD', component_type='cpu')
+        prices = ['100.00', '200.00', '200.00', '200.00', '300.00', '300.00', '400.00']  # Повторы цен проверяют добавление pk в ключ.
+        cls.cpus = [create_cpu(manufacturer, f'CPU {index}', price) for index, price in enumerate(prices)]
+
+    def walk_forward(self, paginator):
+        """Все страницы от первой до последней: [[pk, ...], ...]."""
+        pages, cursor = [], ''
+        while True:
+            page = paginator.page(cursor)
+            pages.append([cpu.pk for cpu in page])
+            if not page.has_next():
+                return pages, page
+            cursor = page.next_cursor
+
+    def test_forward_walk_returns_every_row_once_in_order(self):
+        paginator = KeysetPaginator(CPU.objects.all(), 3, ['price'])
+        pages, _ = self.walk_forward(paginator)
+        expected = [cpu.pk for cpu in sorted(self.cpus, key=lambda cpu: (cpu.price, cpu.pk))]
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+    def test_descending_ordering_keeps_pk_direction(self):
+        paginator = KeysetPaginator(CPU.objects.all(), 2, ['-price'])
+        pages, _ = self.walk_forward(paginator)
+        expected = [cpu.pk for cpu in sorted(self.cpus, key=lambda cpu: (-cpu.price, -cpu.pk))]
+        self.assertEqual([pk for page in pages for pk in page], expected)
+
+    def test_previous_cursor_returns_the_previous_page(self):
+        paginator = KeysetPaginator(CPU.objects.all(), 3, ['price'])
+        first = paginator.page('')
+        second = paginator.page(first.next_cursor)
+        self.assertFalse(first.has_previous())
+        self.assertTrue(second.has_previous())
+
+        back = paginator.page(second.previous_cursor)
+        self.assertEqual([cpu.pk for cpu in back], [cpu.pk for cpu in first])
+        self.assertFalse(back.has_previous())
+        self.assertTrue(back.has_next())
+        self.assertEqual(
+            [cpu.pk for cpu in paginator.page(back.next_cursor)], [cpu.pk for cpu in second]
+        )  # Курсор, полученный при обходе назад, снова ведет вперед.
+
+    def test_last_page_links_back(self):
+        paginator = KeysetPaginator(CPU.objects.all(), 3, ['price'])
+        pages, last = self.walk_forward(paginator)
+        self.assertFalse(last.has_next())
+        self.assertEqual([cpu.pk for cpu in paginator.page(last.previous_cursor)], pages[-2])
+
+    def test_invalid_cursor_opens_first_page(self):
+        paginator = KeysetPaginator(CPU.objects.all(), 3, ['price'])
+        first = [cpu.pk for cpu in paginator.page('')]
+        for cursor in ('not-base64!', 'e30', 'eyJrIjpbMV0sImQiOiJuIn0'):  # Мусор, {} и ключ неверной длины.
+            self.assertEqual([cpu.pk for cpu in paginator.page(cursor)], first)
+
+    def test_paginate_switches_to_keyset_on_cursor_parameter(self):
+        factory = RequestFactory()
+        page = paginate(factory.get('/', {'cursor': ''}), CPU.objects.all(), 3, ['price'])
+        self.assertIsInstance(page, KeysetPage)
+        page = paginate(factory.get('/', {'page': 2}), CPU.objects.all(), 3, ['price'])
+        self.assertEqual(page.number, 2)
+
+    def test_page_links_keep_search_and_sort(self):
+        CPU.objects.update(image='cpu_images/ryzen5.png')  # Шаблон карточки выводит изображение.
+        response = self.client.get('/components/cpus/', {'q': 'CPU', 'sort': 'price_asc', 'page': 1})
+        self.assertContains(response, 'href="?q=CPU&amp;sort=price_asc&amp;page=2"')
+
+        response = self.client.get('/components/cpus/', {'q': 'CPU', 'sort': 'price_asc', 'cursor': ''})
+        page = response.context['cpus']
+        self.assertContains(response, f'href="?q=CPU&amp;sort=price_asc&amp;cursor={page.next_cursor}"')
+
+
+class CatalogListTests(TestCase):
+    """Общий движок списков компонентов: сортировки, фильтры и наличие из подзапроса."""
+
+    @classmethod
+    def setUpTestData(cls):
+        amd = Manufacturer.objects.create(name='AMD', component_type='cpu')
+        intel = Manufacturer.objects.create(name='Intel', component_type='cpu')
+        image = 'cpu_images/ryzen5.png'  # Шаблон карточки выводит изображение.
+        cls.popular = create_cpu(amd, 'Ryzen 5', '100.00', popularity=20, frequency=3.5, image=image)
+        cls.fast = create_cpu(amd, 'Ryzen 9', '300.00', popularity=5, frequency=4.5, image=image)
+        cls.intel = create_cpu(intel, 'Core i5', '200.00', popularity=1, frequency=4.0, socket='LGA1700', image=image)
+        Stock.objects.filter(component_type='cpu', component_id=cls.popular.pk).update(quantity=0)
+        Stock.objects.filter(component_type='cpu', component_id=cls.intel.pk).delete()  # Записи о запасах нет.
+
+    def setUp(self):
+        cache.clear()
+
+    def page(self, **params):
+        response = self.client.get('/components/cpus/', params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def ids(self, **params):
+        return [cpu.pk for cpu in self.page(**params).context['cpus']]
+
+    def test_sorting(self):
+        popular, fast, intel = self.popular.pk, self.fast.pk, self.intel.pk
+        self.assertEqual(self.ids(), [popular, fast, intel])  # По умолчанию - сначала популярные.
+        self.assertEqual(self.ids(sort='price_asc'), [popular, intel, fast])
+        self.assertEqual(self.ids(sort='price_desc'), [fast, intel, popular])
+        self.assertEqual(self.ids(sort='frequency_desc'), [fast, intel, popular])  # Сортировка только для процессоров.
+
+    def test_filters(self):
+        self.assertEqual(self.ids(q='ryzen', sort='price_asc'), [self.popular.pk, self.fast.pk])
+        self.assertEqual(self.ids(socket='LGA1700'), [self.intel.pk])
+        self.assertEqual(self.ids(q='Intel'), [self.intel.pk])  # Поиск и по производителю.
+
+    def test_stock_quantity_annotation(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.page(sort='price_asc')
+        self.assertEqual(
+            [cpu.stock_quantity for cpu in response.context['cpus']], [0, None, 10]
+        )  # Для компонента без записи Stock - None.
+        self.assertEqual(response.context['stock_dict'], {self.popular.pk: 0, self.fast.pk: 10})
+        stock_queries = [query['sql'] for query in queries if '"components_stock"' in query['sql']]
+        self.assertEqual(len(stock_queries), 1)
+        self.assertIn('"components_cpu"', stock_queries[0])  # Подзапрос в запросе страницы, а не отдельный запрос.
+
+
+class SearchTests(TestCase):
+    """Поиск по n-граммам: совпадения, опечатки, промахи и переиндексация при сохранении."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.amd = Manufacturer.objects.create(name='AMD', component_type='cpu')
+        cls.cpu = create_cpu(cls.amd, 'Ryzen 7 7700X', '300.00', socket='AM5')
+        cls.gpu = GPU.objects.create(
+            manufacturer=Manufacturer.objects.create(name='NVIDIA', component_type='gpu'), model='GeForce RTX 4070',
+            memory=12, frequency=2.5, tdp=200, price=Decimal('600.00'), interface='PCIe x16',
+        )
+        cls.board = Motherboard.objects.create(
+            manufacturer=Manufacturer.objects.create(name='ASUS', component_type='motherboard'), model='TUF B650',
+            form_factor='ATX', socket='AM5', chipset='B650', ram_slots=4, ram_type='DDR5', max_ram_frequency=6000,
+            expansion_slots='PCIe x16', price=Decimal('200.00'),
+        )
+
+    def found(self, query):
+        return [(document.component_type, document.component_id) for document in search(query)]
+
+    def test_hits(self):
+        self.assertEqual(self.found('ryzen 7700x'), [('cpu', self.cpu.pk)])
+        self.assertEqual(self.found('ryz'), [('cpu', self.cpu.pk)])  # Последнее слово - по префиксу.
+        self.assertEqual(self.found('rtx 4070'), [('gpu', self.gpu.pk)])
+        self.assertEqual(self.found('ryzn 7700x'), [('cpu', self.cpu.pk)])  # Опечатка.
+
+    def test_title_match_ranks_above_spec_match(self):
+        self.assertEqual(
+            self.found('am5'), [('cpu', self.cpu.pk), ('motherboard', self.board.pk)]
+        )  # Производитель AMD в названии процессора весит больше сокета платы.
+
+    def test_misses(self):
+        self.assertEqual(self.found('radeon'), [])
+        self.assertEqual(self.found('intel core'), [])
+        self.assertEqual(self.found('  '), [])
+
+    def test_reindex_on_save_and_delete(self):
+        self.cpu.model = 'Ryzen 9 7950X'
+        self.cpu.save()
+        self.assertEqual(self.found('7700x'), [])
+        self.assertEqual(self.found('7950x'), [('cpu', self.cpu.pk)])
+
+        self.amd.name = 'Advanced Micro Devices'
+        self.amd.save()
+        self.assertEqual(self.found('advanced micro'), [('cpu', self.cpu.pk)])
+
+        self.gpu.delete()
+        self.assertEqual(self.found('rtx 4070'), [])
+        self.assertFalse(SearchDocument.objects.filter(component_type='gpu').exists())
+
+    def test_rebuild_index(self):
+        SearchDocument.objects.all().delete()
+        self.assertEqual(self.found('ryzen'), [])
+        self.assertEqual(rebuild_index(), 3)
+        self.assertEqual(self.found('ryzen'), [('cpu', self.cpu.pk)])
+
+    def test_search_endpoint(self):
+        data = self.client.get('/components/search/', {'q': 'rtx', 'limit': 'abc'}).json()
+        self.assertEqual(data['query'], 'rtx')
+        self.assertEqual(
+            [(result['component_type'], result['url']) for result in data['results']],
+            [('gpu', f'/components/gpus/{self.gpu.pk}/')],
+        )
+
+
+class StockAdminSearchTests(TestCase):
+    """Поиск по названию компонента в админке склада не отменяет фильтры списка."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        intel = Manufacturer.objects.create(name='Intel', component_type='cpu')
+        nvidia = Manufacturer.objects.create(name='NVIDIA', component_type='gpu')
+        cpus = [create_cpu(intel, 'Core i5', '200.00'), create_cpu(intel, 'Core i7', '300.00')]
+        gpu = GPU.objects.create(
+            manufacturer=nvidia, model='GeForce RTX 4070', memory=12, frequency=2.5, tdp=200,
+            price=Decimal('600.00'), interface='PCIe x16',
+        )
+        Stock.objects.filter(component_type='cpu').delete()
+        Stock.objects.filter(component_type='gpu').delete()
+        cls.cpu_stock = [Stock.objects.create(component_type='cpu', component_id=cpu.pk, quantity=5) for cpu in cpus]
+        cls.gpu_stock = Stock.objects.create(component_type='gpu', component_id=gpu.pk, quantity=5)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def result_ids(self, **params):
+        response = self.client.get('/admin/components/stock/', params)
+        self.assertEqual(response.status_code, 200)
+        return {stock.pk for stock in response.context['cl'].result_list}
+
+    def test_name_search_respects_list_filter(self):
+        self.assertEqual(self.result_ids(component_type__exact='gpu', q='Intel'), set())
+        self.assertEqual(self.result_ids(component_type__exact='gpu', q='NVIDIA'), {self.gpu_stock.pk})
+
+    def test_name_search_without_filter(self):
+        self.assertEqual(self.result_ids(q='Intel'), {stock.pk for stock in self.cpu_stock})
+
+
+class CompatibilityTests(TestCase):
+    """Подбор совместимых компонентов: ребра графа для равенств, запросы к столбцам для сравнений."""
+
+    @classmethod
+    def setUpTestData(cls):
+        manufacturer = Manufacturer.objects.create(name='ASUS', component_type='motherboard')
+        cls.board = Motherboard.objects.create(
+            manufacturer=manufacturer, model='B650', form_factor='ATX', socket='AM5', chipset='B650',
+            ram_slots=4, ram_type='DDR5', max_ram_frequency=6000, expansion_slots='PCIe x16',
+            price=Decimal('200.00'),
+        )
+        cls.fast_ram = cls.create_ram('DDR5-7200', 'DDR5', 7200)
+        cls.slow_ram = cls.create_ram('DDR5-5600', 'DDR5', 5600)
+        cls.old_ram = cls.create_ram('DDR4-3200', 'DDR4', 3200)
+        cls.gpu = GPU.objects.create(
+            manufacturer=Manufacturer.objects.create(name='NVIDIA', component_type='gpu'), model='RTX 4070', memory=12, frequency=2.5, tdp=450,
+            price=Decimal('600.00'), interface='PCIe x16',
+        )
+        cls.weak_psu = cls.create_psu('PSU 400', 400)
+        cls.strong_psu = cls.create_psu('PSU 750', 750)
+
+    @classmethod
+    def create_ram(cls, model, ram_type, frequency):
+        manufacturer, _ = Manufacturer.objects.get_or_create(name='Kingston', component_type='ram')
+        return RAM.objects.create(
+            manufacturer=manufacturer, model=model, capacity=16, frequency=frequency, type=ram_type,
+            price=Decimal('80.00'),
+        )
+
+    @classmethod
+    def create_psu(cls, model, power):
+        manufacturer, _ = Manufacturer.objects.get_or_create(name='Seasonic', component_type='psu')
+        return PSU.objects.create(
+            manufacturer=manufacturer, model=model, power=power, certification='80 Plus Gold',
+            price=Decimal('100.00'),
+        )
+
+    def test_psu_filtered_by_power_without_edges(self):
+        compatible = compatible_queryset('psu', {'gpu': self.gpu.pk})
+        self.assertEqual(list(compatible), [self.strong_psu])
+        self.assertEqual(list(compatible_queryset('gpu', {'psu': self.weak_psu.pk})), [])
+        self.assertFalse(CompatibilityEdge.objects.filter(source_type__in=('psu', 'gpu')).exists())
+
+    def test_ram_filtered_by_type_and_frequency(self):
+        self.assertEqual(list(compatible_queryset('ram', {'motherboard': self.board.pk})), [self.slow_ram])
+        self.assertEqual(list(compatible_queryset('motherboard', {'ram': self.fast_ram.pk})), [])
+        self.assertEqual(list(compatible_queryset('motherboard', {'ram': self.slow_ram.pk})), [self.board])
+
+    def test_incompatibilities_check_edges_and_comparisons(self):
+        self.assertEqual(incompatibilities({'psu': self.strong_psu.pk, 'gpu': self.gpu.pk}), [])
+        self.assertEqual(
+            incompatibilities({'psu': self.weak_psu.pk, 'gpu': self.gpu.pk}),
+            ['Мощности блока питания недостаточно для видеокарты.'],
+        )
+        for ram in (self.fast_ram, self.old_ram):  # Не та частота и не тот тип.
+            self.assertEqual(
+                incompatibilities({'ram': ram.pk, 'motherboard': self.board.pk}),
+                ['Оперативная память не совместима с материнской платой.'],
+            )
+
+    def test_rebuild_keeps_only_equality_edges(self):
+        rebuild_graph()
+        edges = set(CompatibilityEdge.objects.values_list('source_type', 'source_id', 'target_type', 'target_id'))
+        self.assertEqual(edges, {
+            ('ram', self.fast_ram.pk, 'motherboard', self.board.pk),
+            ('motherboard', self.board.pk, 'ram', self.fast_ram.pk),
+            ('ram', self.slow_ram.pk, 'motherboard', self.board.pk),
+            ('motherboard', self.board.pk, 'ram', self.slow_ram.pk),
+        })  # Ребро по типу памяти есть и у слишком быстрой памяти: частоту проверяет запрос.
+
+
+class PopularityTests(TestCase):
+    """Инкрементальный подсчет популярности: водяной знак по позициям заказов и скользящее окно."""
+
+    today = date(2026, 3, 31)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer', 'buyer@example.com', 'password')
+        manufacturer = Manufacturer.objects.create(name='AMD', component_type='cpu')
+        cls.cpu = create_cpu(manufacturer, 'Ryzen 5', '250.00')
+        cls.other_cpu = create_cpu(manufacturer, 'Ryzen 7', '350.00')
+
+    def sell(self, cpu, quantity, days_ago, **item_fields):
+        """Заказ на quantity штук процессора, оформленный days_ago дней назад."""
+        order = Order.objects.create(
+            user=self.user, email=self.user.email, delivery_option='pickup', payment_method='cash',
+            total_amount=cpu.price * quantity,
+            order_date=datetime.combine(self.today - timedelta(days=days_ago), time(12)),
+        )
+        return OrderItem.objects.create(
+            order=order, item=str(cpu), quantity=quantity, price=cpu.price,
+            component_type='cpu', component_id=cpu.pk, **item_fields,
+        )
+
+    def popularity(self, cpu):
+        cpu.refresh_from_db()
+        return cpu.popularity
+
+    def test_counts_sales_inside_window_only(self):
+        self.sell(self.cpu, 2, days_ago=0)
+        self.sell(self.cpu, 3, days_ago=29)
+        self.sell(self.cpu, 7, days_ago=30)  # Первый день за пределами 30-дневного окна.
+        self.assertEqual(update_popularity(today=self.today), 1)
+        self.assertEqual(self.popularity(self.cpu), 5)
+        self.assertEqual(self.popularity(self.other_cpu), 0)
+
+    def test_watermark_counts_each_item_once(self):
+        self.sell(self.cpu, 2, days_ago=1)
+        update_popularity(today=self.today)
+        self.assertEqual(update_popularity(today=self.today), 0)  # Новых позиций нет - ничего не пересчитывается.
+        self.assertEqual(self.popularity(self.cpu), 2)
+
+        self.sell(self.cpu, 1, days_ago=1)
+        self.sell(self.other_cpu, 4, days_ago=0)
+        self.assertEqual(update_popularity(today=self.today), 2)
+        self.assertEqual(self.popularity(self.cpu), 3)
+        self.assertEqual(self.popularity(self.other_cpu), 4)
+        self.assertEqual(
+            PopularityBucket.objects.get(component_type='cpu', component_id=self.cpu.pk).quantity, 3
+        )  # Продажи одного дня складываются в одну корзину.
+
+    def test_item_committed_after_larger_pk_is_counted(self):
+        self.sell(self.cpu, 2, days_ago=0, pk=1000)
+        update_popularity(today=self.today)
+        self.sell(self.cpu, 3, days_ago=0, pk=500)  # Параллельный заказ получил меньший ID, но зафиксирован позже.
+        self.assertEqual(update_popularity(today=self.today), 1)
+        self.assertEqual(self.popularity(self.cpu), 5)
+        self.assertEqual(update_popularity(today=self.today), 0)  # Повторный пересчет ничего не добавляет.
+        self.assertEqual(self.popularity(self.cpu), 5)
+
+    def test_deleted_recent_order_leaves_the_score(self):
+        item = self.sell(self.cpu, 2, days_ago=0)
+        self.sell(self.other_cpu, 1, days_ago=0)
+        update_popularity(today=self.today)
+        item.order.delete()
+        update_popularity(today=self.today)
+        self.assertEqual(self.popularity(self.cpu), 0)
+        self.assertEqual(self.popularity(self.other_cpu), 1)
+
+    def test_expired_buckets_leave_the_score(self):
+        self.sell(self.cpu, 2, days_ago=10)
+        self.sell(self.other_cpu, 4, days_ago=0)
+        update_popularity(today=self.today)
+
+        later = self.today + timedelta(days=25)  # Продажа cpu выходит из окна, продажа other_cpu остается.
+        self.assertEqual(update_popularity(today=later), 1)
+        self.assertEqual(self.popularity(self.cpu), 0)
+        self.assertEqual(self.popularity(self.other_cpu), 4)
+        self.assertFalse(PopularityBucket.objects.filter(component_id=self.cpu.pk).exists())
+
+    def test_bucket_holding_watermark_survives_expiry(self):
+        self.sell(self.cpu, 2, days_ago=0)
+        update_popularity(today=self.today)
+
+        later = self.today + timedelta(days=40)
+        update_popularity(today=later)
+        self.assertEqual(self.popularity(self.cpu), 0)
+        self.assertTrue(PopularityBucket.objects.exists())  # Корзина с наибольшим last_item_id хранит водяной знак.
+
+        self.assertEqual(update_popularity(today=later), 0)  # Старая позиция не учитывается повторно.
+        self.assertEqual(self.popularity(self.cpu), 0)
+
+        self.sell(self.other_cpu, 1, days_ago=-40)  # Новая продажа переносит водяной знак.
+        update_popularity(today=later)
+        self.assertEqual(
+            list(PopularityBucket.objects.values_list('component_id', 'quantity')), [(self.other_cpu.pk, 1)]
+        )  # Прежняя корзина водяного знака удалена.
+
+    def test_rebuild_matches_incremental_result(self):
+        self.sell(self.cpu, 2, days_ago=3)
+        update_popularity(today=self.today)
+        self.sell(self.cpu, 5, days_ago=1)
+        self.sell(self.other_cpu, 1, days_ago=40)
+        update_popularity(today=self.today)
+        incremental = (self.popularity(self.cpu), self.popularity(self.other_cpu))
+
+        rebuild_popularity(today=self.today)
+        self.assertEqual((self.popularity(self.cpu), self.popularity(self.other_cpu)), incremental)
+        self.assertEqual(incremental, (7, 0))
+
+
+class StockIndexTests(TestCase):
+    """Индекс складских запасов: сброс после фиксации транзакции и гонка с invalidate()."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cpu = create_cpu(Manufacturer.objects.create(name='AMD', component_type='cpu'), 'Ryzen 5', '250.00')
+
+    def setUp(self):
+        cache.clear()
+        stock_index.invalidate()
+        self.stock = Stock.objects.get(component_type='cpu', component_id=self.cpu.pk)
+
+    def test_concurrent_invalidate_does_not_break_reader(self):
+        index = StockIndex()
+        index.quantity('cpu', self.cpu.pk)  # Индекс загружен.
+        version = index._version
+
+        def invalidated_meanwhile():
+            index._quantities = None  # Так invalidate() другого потока сбрасывает словарь.
+            return version
+
+        with mock.patch.object(index, '_shared_version', side_effect=invalidated_meanwhile):
+            self.assertEqual(index.quantity('cpu', self.cpu.pk), self.stock.quantity)
+
+    def test_save_resets_index_after_commit(self):
+        self.assertEqual(stock_index.quantity('cpu', self.cpu.pk), 10)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.stock.quantity = 0
+            self.stock.save()
+            self.assertEqual(stock_index.quantity('cpu', self.cpu.pk), 10)  # До фиксации индекс не сбрасывается.
+        self.assertEqual(stock_index.quantity('cpu', self.cpu.pk), 0)
+
+    def test_rolled_back_save_keeps_index_version(self):
+        stock_index.quantity('cpu', self.cpu.pk)
+        version = cache.get(STOCK_INDEX_VERSION_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.stock.quantity = 0
+                self.stock.save()
+                self.stock.delete()
+                transaction.set_rollback(True)
+        self.assertEqual(cache.get(STOCK_INDEX_VERSION_KEY), version)
+        self.assertEqual(stock_index.quantity('cpu', self.cpu.pk), 10)
+
+
+class ReviewFragmentTests(TestCase):
+    """Отзывы на странице компонента: запрос только при промахе кэша фрагмента, курсор в ключе проверен."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cpu = create_cpu(
+            Manufacturer.objects.create(name='AMD', component_type='cpu'), 'Ryzen 5', '250.00',
+            image='cpu_images/ryzen5.png',  # Шаблон карточки выводит изображение.
+        )
+        for index in range(12):  # Больше одной страницы (REVIEWS_PER_PAGE = 10).
+            user = User.objects.create_user(f'reviewer{index}', password='password')
+            Review.objects.create(user=user, content_object=cls.cpu, rating=4, text=f'Отзыв {index}')
+
+    def setUp(self):
+        cache.clear()
+
+    def review_queries(self, **params):
+        """Ответ страницы процессора и число запросов к таблице отзывов."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/components/cpus/{self.cpu.pk}/', params)
+        self.assertEqual(response.status_code, 200)
+        return response, sum('"components_review"' in query['sql'] for query in queries)
+
+    def test_cached_fragment_skips_review_query(self):
+        _, queries = self.review_queries()
+        self.assertEqual(queries, 1)
+        response, queries = self.review_queries()
+        self.assertEqual(queries, 0)
+        self.assertContains(response, 'Отзыв 11')
+
+    def test_invalid_cursor_shares_first_page_fragment(self):
+        self.review_queries()
+        for cursor in ('garbage', 'e30', ''):
+            self.assertEqual(self.review_queries(cursor=cursor)[1], 0)
+
+    def test_next_page_cached_under_canonical_cursor(self):
+        first, _ = self.review_queries()
+        cursor = first.context['reviews'].next_cursor
+        response, queries = self.review_queries(cursor=cursor)
+        self.assertEqual(queries, 1)
+        self.assertContains(response, 'Отзыв 0')
+        self.assertNotContains(response, 'Отзыв 11')
+        self.assertEqual(self.review_queries(cursor=cursor + '==')[1], 0)  # Та же граница в другой записи.
+
+
+class FragmentVersionTests(TestCase):
+    """Кэш карточек и страниц компонентов сбрасывается сохранением компонента, а не по времени."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.amd = Manufacturer.objects.create(name='AMD', component_type='cpu')
+        image = 'cpu_images/ryzen5.png'  # Шаблон карточки выводит изображение.
+        cls.cpu = create_cpu(cls.amd, 'Ryzen 5', '250.00', image=image)
+        cls.other = create_cpu(cls.amd, 'Ryzen 7', '350.00', image=image)
+
+    def setUp(self):
+        cache.clear()
+
+    def versions(self):
+        return component_versions('cpu', [self.cpu.pk, self.other.pk])
+
+    def test_save_bumps_only_saved_component(self):
+        before = self.versions()
+        self.assertEqual(self.versions(), before)  # Версии стабильны между запросами.
+        self.cpu.save()
+        after = self.versions()
+        self.assertNotEqual(after[self.cpu.pk], before[self.cpu.pk])
+        self.assertEqual(after[self.other.pk], before[self.other.pk])
+
+    def test_manufacturer_and_stock_changes_bump_versions(self):
+        before = self.versions()
+        self.amd.save()
+        after = self.versions()
+        self.assertTrue(all(after[pk] != before[pk] for pk in before))  # Название производителя в обеих карточках.
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Stock.objects.get(component_type='cpu', component_id=self.other.pk).save()
+        self.assertNotEqual(self.versions()[self.other.pk], after[self.other.pk])
+
+    def test_cached_fragments_refresh_on_save(self):
+        list_url, detail_url = '/components/cpus/', f'/components/cpus/{self.cpu.pk}/'
+        self.assertContains(self.client.get(list_url), 'Ryzen 5')
+        self.assertContains(self.client.get(detail_url), 'Ryzen 5')
+
+        CPU.objects.filter(pk=self.cpu.pk).update(model='Ryzen 5 Pro')  # Без сигналов: версия прежняя.
+        self.assertNotContains(self.client.get(list_url), 'Ryzen 5 Pro')  # Карточка из кэша.
+
+        cpu = CPU.objects.get(pk=self.cpu.pk)
+        cpu.save()
+        self.assertContains(self.client.get(list_url), 'Ryzen 5 Pro')
+        self.assertContains(self.client.get(detail_url), 'Ryzen 5 Pro')
@@ -21,6 +21,7 @@ urlpatterns = [
     path('cases/<int:pk>/', views.case_detail, name='case_detail'),
     path('coolers/', views.cooler_list, name='cooler_list'),
     path('coolers/<int:pk>/', views.cooler_detail, name='cooler_detail'),
+    path('search/', views.component_search, name='component_search'),
 
     # ALL Reviews after
     path('cpus/<int:pk>/add_review/<str:component_type>/', views.add_review, name='add_review'),
@@ -0,0 +1,113 @@
+# components/versioning.py
+import hashlib
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+CATALOG_CHANGED_KEY = 'catalog_changed_at'  # Время последнего изменения каталога (компоненты, совместимость, запасы).
+COMPONENTS_CHANGED_KEY = 'components_changed_at'  # Время последнего изменения самих компонентов (без запасов).
+
+
+def _changed_at(key):
+    """
+    Время последнего изменения (timestamp) или None, если кэш недоступен.
+
+    Если ключа еще нет (первый запуск или очищенный Redis), за точку отсчета
+    берется текущее время: старые ETag и ключи кэша при этом гарантированно устаревают.
+    """
+    try:
+        changed_at = cache.get(key)
+        if changed_at is None:
+            cache.add(key, time.time(), None)
+            changed_at = cache.get(key)
+    except Exception:
+        return None  # Без общего кэша нельзя узнать об изменениях в других процессах.
+    return changed_at
+
+
+def _touch(*keys):
+    now = time.time()
+    try:
+        cache.set_many({key: now for key in keys}, None)
+    except Exception:
+        pass  # Кэш недоступен - зависимые кэши и условные ответы отключены.
+
+
+def catalog_changed_at():
+    """Время последнего изменения каталога (timestamp) или None, если кэш недоступен."""
+    return _changed_at(CATALOG_CHANGED_KEY)
+
+
+def components_changed_at():
+    """Время последнего изменения компонентов (timestamp) или None, если кэш недоступен."""
+    return _changed_at(COMPONENTS_CHANGED_KEY)
+
+
+def touch_catalog():
+    """Отмечает изменение запасов: ответы с прежними ETag/Last-Modified устаревают."""
+    _touch(CATALOG_CHANGED_KEY)
+
+
+def touch_components():
+    """Отмечает изменение компонентов (названия, цены, характеристики); каталог тоже меняется."""
+    _touch(COMPONENTS_CHANGED_KEY, CATALOG_CHANGED_KEY)
+
+
+def catalog_last_modified():
+    """Время последнего изменения каталога для заголовка Last-Modified (datetime или None)."""
+    changed_at = catalog_changed_at()
+    if changed_at is None:
+        return None
+    return datetime.fromtimestamp(changed_at, tz=timezone.utc)
+
+
+def catalog_etag(*parts):
+    """ETag ответа, зависящего от каталога и параметров parts (None, если кэш недоступен)."""
+    changed_at = catalog_changed_at()
+    if changed_at is None:
+        return None
+    payload = '|'.join([repr(changed_at)] + [str(part) for part in parts])
+    return hashlib.md5(payload.encode()).hexdigest()
+
+
+COMPONENT_VERSION_KEY = 'component_version:{component_type}:{component_id}'  # Версия фрагментов одного компонента.
+
+
+def component_versions(component_type, component_ids):
+    """
+    Версии кэшированных фрагментов компонентов: {component_id: версия}.
+
+    Читаются одним запросом к кэшу. Отсутствующие версии создаются текущим
+    временем, поэтому после очистки Redis старые фрагменты не используются.
+    """
+    keys = {
+        COMPONENT_VERSION_KEY.format(component_type=component_type, component_id=component_id): component_id
+        for component_id in component_ids
+    }
+    if not keys:
+        return {}
+    try:
+        versions = cache.get_many(list(keys))
+        missing = {key: time.time() for key in keys if key not in versions}
+        if missing:
+            cache.set_many(missing, None)
+            versions.update(missing)
+    except Exception:
+        return {}  # Кэш недоступен - фрагменты все равно не кэшируются.
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_component_versions(pairs):
+    """Сбрасывает кэшированные фрагменты компонентов для пар (component_type, component_id)."""
+    now = time.time()
+    keys = {
+        COMPONENT_VERSION_KEY.format(component_type=component_type, component_id=component_id): now
+        for component_type, component_id in pairs
+    }
+    if not keys:
+        return
+    try:
+        cache.set_many(keys, None)
+    except Exception:
+        pass  # Кэш недоступен - закэшированных фрагментов тоже нет.
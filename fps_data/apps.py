@@ -5,3 +5,6 @@ from django.apps import AppConfig
 class FpsDataConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'fps_data'
+
+    def ready(self):
+        import fps_data.signals  # noqa: F401
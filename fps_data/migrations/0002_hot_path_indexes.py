@@ -0,0 +1,17 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('fps_data', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='fpsdata',
+            index=models.Index(fields=['game', 'settings', 'cpu', 'gpu'], name='fps_data_lookup_idx'),
+        ),
+    ]
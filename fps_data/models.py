@@ -30,3 +30,9 @@ class FPSData(models.Model):
     class Meta:
         verbose_name = "Данные FPS"
         verbose_name_plural = "Данные FPS"
+        indexes = [
+            models.Index(
+                fields=['game', 'settings', 'cpu', 'gpu'],
+                name='fps_data_lookup_idx',
+            ),
+        ]  # Замер пары процессор/видеокарта в игре при заданных настройках.
@@ -0,0 +1,374 @@
+# fps_data/prediction.py
+import threading
+from collections import namedtuple
+
+import numpy as np
+from django.core.cache import cache
+
+from components.versioning import components_changed_at
+
+FPS_DATA_VERSION_KEY = 'fps_data_version'  # Версия замеров FPS в общем кэше (Redis).
+FPS_TABLE_CACHE_TIMEOUT = 60 * 60  # Время жизни таблицы FPS пары в кэше (секунды); изменения данных меняют ключ.
+
+SUPPORT_IN_GROUP = 1.0  # Компонент измерен в этой игре на этих настройках.
+SUPPORT_MEASURED = 0.85  # Компонент измерен, но в других играх или настройках.
+SUPPORT_FROM_SPECS = 0.6  # Замеров нет - вклад компонента оценен по характеристикам.
+RIDGE = 1e-9  # Относительная регуляризация нормальных уравнений модели.
+ESTIMATE_FACTOR = 0.9  # Сама пара не измерялась: оценка не может быть так же достоверна, как замер.
+
+Prediction = namedtuple('Prediction', 'min_fps avg_fps max_fps confidence measured')
+Prediction.__doc__ = """
+Предсказание FPS. Поля - массивы NumPy одной формы (или скаляры у predict_one).
+
+measured - значение взято из замера; confidence - достоверность от 0 до 1
+(1 для замеров, 0 - предсказать нельзя, FPS при этом NaN).
+"""
+
+
+def _log(values):
+    return np.log(np.maximum(np.asarray(values, dtype=float), 1.0))  # FPS 0 в данных считаем за 1.
+
+
+def _positions(sorted_ids, ids):
+    """Позиции ids в отсортированном массиве sorted_ids и маска найденных."""
+    ids = np.asarray(ids, dtype=np.int64)
+    if not len(sorted_ids):
+        return np.zeros(ids.shape, dtype=np.int64), np.zeros(ids.shape, dtype=bool)
+    positions = np.clip(np.searchsorted(sorted_ids, ids), 0, len(sorted_ids) - 1)
+    return positions, sorted_ids[positions] == ids
+
+
+def _effects_from_specs(effects, measured, features):
+    """
+    Вклады компонентов без замеров по их характеристикам.
+
+    Вклады измеренных компонентов регрессируются на логарифмы характеристик
+    (МНК с свободным членом); если измеренных слишком мало, берется их среднее.
+    """
+    if not measured.any():
+        return effects
+    design = np.column_stack([np.ones(len(features)), _log(features)])
+    if measured.sum() > design.shape[1]:
+        coefficients = np.linalg.lstsq(design[measured], effects[measured], rcond=None)[0]
+        estimated = design @ coefficients
+    else:
+        estimated = np.full(len(effects), effects[measured].mean())
+    return np.where(measured, effects, estimated)
+
+
+class FPSModel:
+    """
+    Снимок замеров FPS в массивах NumPy и подобранная по ним модель.
+
+    Группа - пара (игра, настройки). Замеры хранятся отсортированными по ключу
+    (группа, процессор, видеокарта), поэтому поиск точных значений векторизован
+    через searchsorted. Для остальных пар используется аддитивная модель в
+    логарифмах: log(avg FPS) = база группы + вклад процессора + вклад видеокарты,
+    подобранная МНК; min и max получаются из средних для группы отношений к avg.
+    """
+
+    def __init__(self, rows, cpu_specs, gpu_specs):
+        """
+        rows - кортежи (game_id, settings, cpu_id, gpu_id, min_fps, avg_fps, max_fps);
+        cpu_specs - (id, частота, ядра, TDP); gpu_specs - (id, память, частота, TDP).
+        """
+        cpu_specs = np.array(sorted(cpu_specs), dtype=float).reshape(-1, 4)
+        gpu_specs = np.array(sorted(gpu_specs), dtype=float).reshape(-1, 4)
+        self.cpu_ids = cpu_specs[:, 0].astype(np.int64)
+        self.gpu_ids = gpu_specs[:, 0].astype(np.int64)
+        self.groups = {
+            group: index
+            for index, group in enumerate(sorted({(row[0], row[1]) for row in rows}))
+        }  # (game_id, settings) -> номер группы.
+
+        group = np.array([self.groups[(row[0], row[1])] for row in rows], dtype=np.int64)
+        cpu, cpu_found = _positions(self.cpu_ids, [row[2] for row in rows])
+        gpu, gpu_found = _positions(self.gpu_ids, [row[3] for row in rows])
+        fps = np.array([row[4:7] for row in rows], dtype=float).reshape(-1, 3)
+        found = cpu_found & gpu_found  # Замеры удаленных компонентов не учитываются.
+        group, cpu, gpu, fps = group[found], cpu[found], gpu[found], fps[found]
+
+        keys = self._keys(group, cpu, gpu)
+        order = np.argsort(keys, kind='stable')
+        self.keys = keys[order]
+        self.fps = fps[order]  # Точные замеры (min, avg, max) в порядке keys.
+
+        self._fit(group, cpu, gpu, fps, cpu_specs[:, 1:], gpu_specs[:, 1:])
+
+    def _keys(self, group, cpu, gpu):
+        return (group * len(self.cpu_ids) + cpu) * len(self.gpu_ids) + gpu
+
+    def _fit(self, group, cpu, gpu, fps, cpu_features, gpu_features):
+        """
+        МНК по нормальным уравнениям.
+
+        Столбцы - группы и только измеренные процессоры и видеокарты, матрица
+        AᵀA собирается bincount'ом по парам столбцов строки. Память зависит от
+        числа измеренных компонентов, а не от числа замеров. Модель вырождена
+        (константу можно переносить между базой и вкладами), поэтому к диагонали
+        добавляется малая регуляризация: решение практически совпадает с lstsq
+        (минимальной нормы) по полной матрице.
+        """
+        groups, cpus, gpus = len(self.groups), len(self.cpu_ids), len(self.gpu_ids)
+        cpu_measured = np.bincount(cpu, minlength=cpus) > 0
+        gpu_measured = np.bincount(gpu, minlength=gpus) > 0
+        cpu_columns, gpu_columns = int(cpu_measured.sum()), int(gpu_measured.sum())
+        size = groups + cpu_columns + gpu_columns
+        columns = np.stack(
+            [
+                group,
+                groups + (np.cumsum(cpu_measured) - 1)[cpu],
+                groups + cpu_columns + (np.cumsum(gpu_measured) - 1)[gpu],
+            ]
+        ).reshape(3, -1)  # Номера единичных столбцов каждой строки.
+        log_avg = _log(fps[:, 1])
+        if len(group):
+            gram = sum(
+                np.bincount(first * size + second, minlength=size * size)
+                for first in columns
+                for second in columns
+            ).reshape(size, size).astype(float)
+            moments = sum(np.bincount(column, log_avg, size) for column in columns)
+            gram[np.diag_indices(size)] += RIDGE * max(gram.diagonal().mean(), 1.0)
+            coefficients = np.linalg.solve(gram, moments)
+        else:
+            coefficients = np.zeros(size)
+
+        cpu_coefficients = np.zeros(cpus)
+        cpu_coefficients[cpu_measured] = coefficients[groups:groups + cpu_columns]
+        gpu_coefficients = np.zeros(gpus)
+        gpu_coefficients[gpu_measured] = coefficients[groups + cpu_columns:]
+        self.base = coefficients[:groups]
+        self.cpu_effect = _effects_from_specs(cpu_coefficients, cpu_measured, cpu_features)
+        self.gpu_effect = _effects_from_specs(gpu_coefficients, gpu_measured, gpu_features)
+
+        self.group_sizes = np.bincount(group, minlength=groups)  # Число замеров в группе.
+        counts = np.maximum(self.group_sizes, 1)
+        self.min_ratio = np.bincount(group, _log(fps[:, 0]) - log_avg, groups) / counts
+        self.max_ratio = np.bincount(group, _log(fps[:, 2]) - log_avg, groups) / counts
+        residuals = log_avg - coefficients[columns].sum(axis=0)
+        self.error = np.sqrt(np.bincount(group, residuals ** 2, groups) / counts)  # СКО модели в группе (в логарифмах).
+
+        self.cpu_support = np.where(cpu_measured, SUPPORT_MEASURED, SUPPORT_FROM_SPECS)
+        self.gpu_support = np.where(gpu_measured, SUPPORT_MEASURED, SUPPORT_FROM_SPECS)
+        self.cpu_in_group = np.zeros((groups, cpus), dtype=bool)
+        self.cpu_in_group[group, cpu] = True
+        self.gpu_in_group = np.zeros((groups, gpus), dtype=bool)
+        self.gpu_in_group[group, gpu] = True
+
+    def _predict(self, group, cpu_ids, gpu_ids):
+        """Предсказание для массивов номеров групп, ID процессоров и видеокарт (одной формы)."""
+        shape = group.shape
+        if not len(self.groups):  # Замеров нет совсем.
+            nan = np.full(shape, np.nan)
+            return Prediction(nan, nan, nan, np.zeros(shape), np.zeros(shape, dtype=bool))
+        cpu, cpu_found = _positions(self.cpu_ids, cpu_ids)
+        gpu, gpu_found = _positions(self.gpu_ids, gpu_ids)
+        group = np.where(group >= 0, group, -1)
+        known = cpu_found & gpu_found & (self.group_sizes[group] > 0) & (group >= 0)  # Группы без замеров предсказать нельзя.
+        group = np.where(group >= 0, group, 0)  # Номер-заглушка для отсутствующих групп; результат маскируется.
+
+        log_avg = self.base[group] + self.cpu_effect[cpu] + self.gpu_effect[gpu]
+        fps = np.stack(
+            [
+                np.exp(log_avg + self.min_ratio[group]),
+                np.exp(log_avg),
+                np.exp(log_avg + self.max_ratio[group]),
+            ],
+            axis=-1,
+        )
+        confidence = (
+            np.where(self.cpu_in_group[group, cpu], SUPPORT_IN_GROUP, self.cpu_support[cpu])
+            * np.where(self.gpu_in_group[group, gpu], SUPPORT_IN_GROUP, self.gpu_support[gpu])
+            * np.exp(-self.error[group])
+            * ESTIMATE_FACTOR
+        )
+
+        measured = np.zeros(shape, dtype=bool)
+        if len(self.keys):
+            keys = self._keys(group, cpu, gpu)
+            positions, measured = _positions(self.keys, keys)
+            measured &= known
+            fps = np.where(measured[..., None], self.fps[positions], fps)
+        confidence = np.where(measured, 1.0, confidence)
+
+        fps = np.where(known[..., None], np.round(fps), np.nan)
+        return Prediction(
+            fps[..., 0], fps[..., 1], fps[..., 2], np.where(known, confidence, 0.0), measured
+        )
+
+    def predict(self, game_id, settings, cpu_ids, gpu_ids):
+        """
+        Предсказание для пар процессор/видеокарта одной игры и настроек.
+
+        cpu_ids и gpu_ids - скаляры или массивы, которые транслируются друг
+        на друга по правилам NumPy: например, один процессор и все видеокарты
+        каталога считаются одним вызовом без циклов в Python.
+        """
+        cpu_ids, gpu_ids = np.broadcast_arrays(
+            np.asarray(cpu_ids, dtype=np.int64), np.asarray(gpu_ids, dtype=np.int64)
+        )
+        group = np.full(cpu_ids.shape, self.groups.get((game_id, settings), -1), dtype=np.int64)
+        return self._predict(group, cpu_ids, gpu_ids)
+
+    def effects(self, cpu_ids, gpu_ids):
+        """
+        Вклады процессоров и видеокарт в логарифм FPS, общие для всех игр.
+
+        Возвращает (вклады CPU, вклады GPU) формы cpu_ids и gpu_ids; для неизвестных ID -inf.
+        """
+        cpu, cpu_found = _positions(self.cpu_ids, cpu_ids)
+        gpu, gpu_found = _positions(self.gpu_ids, gpu_ids)
+        if not len(self.cpu_ids) or not len(self.gpu_ids):
+            return np.full(cpu.shape, -np.inf), np.full(gpu.shape, -np.inf)
+        return (
+            np.where(cpu_found, self.cpu_effect[cpu], -np.inf),
+            np.where(gpu_found, self.gpu_effect[gpu], -np.inf),
+        )
+
+    def performance(self, cpu_ids, gpu_ids):
+        """
+        Относительная производительность пар без привязки к игре: exp(вклад CPU + вклад GPU).
+
+        Для неизвестных ID возвращает 0. Массивы транслируются, как в predict.
+        """
+        cpu_effect, gpu_effect = self.effects(cpu_ids, gpu_ids)
+        return np.exp(cpu_effect + gpu_effect)
+
+    def predict_groups(self, cpu_id, gpu_id):
+        """
+        Предсказание одной пары для всех игр и настроек с замерами одним вызовом.
+
+        Возвращает (список (game_id, settings), Prediction с массивами в том же порядке).
+        """
+        groups = list(self.groups)
+        count = len(groups)
+        prediction = self._predict(
+            np.arange(count, dtype=np.int64),
+            np.full(count, cpu_id, dtype=np.int64),
+            np.full(count, gpu_id, dtype=np.int64),
+        )
+        return groups, prediction
+
+
+class FPSPredictor:
+    """
+    Процессный кэш FPSModel.
+
+    Модель строится из всех замеров и характеристик процессоров и видеокарт
+    (три запроса) и перестраивается, когда меняется версия замеров или
+    компонентов в общем кэше.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._model = None
+        self._version = None
+
+    def _shared_version(self):
+        try:
+            return cache.get(FPS_DATA_VERSION_KEY, 0), components_changed_at()
+        except Exception:
+            return None  # Без Redis модель строится на каждый вызов.
+
+    def _build(self):
+        from components.models import CPU, GPU
+        from .models import FPSData
+
+        return FPSModel(
+            list(
+                FPSData.objects.values_list(
+                    'game_id', 'settings', 'cpu_id', 'gpu_id', 'min_fps', 'avg_fps', 'max_fps'
+                )
+            ),
+            list(CPU.objects.values_list('pk', 'frequency', 'cores', 'tdp')),
+            list(GPU.objects.values_list('pk', 'memory', 'frequency', 'tdp')),
+        )
+
+    def model(self):
+        """Текущая модель: перестраивается, если замеры или компоненты изменились."""
+        version = self._shared_version()
+        if version is None:
+            return self._build()
+        model = self._model  # Локальная ссылка: параллельный invalidate() может сбросить self._model.
+        if model is None or self._version != version:
+            with self._lock:
+                model = self._model
+                if model is None or self._version != version:
+                    model = self._build()
+                    self._model = model
+                    self._version = version
+        return model
+
+    def predict(self, game_id, settings, cpu_ids, gpu_ids):
+        """Пакетное предсказание (см. FPSModel.predict)."""
+        return self.model().predict(game_id, settings, cpu_ids, gpu_ids)
+
+    def predict_one(self, game_id, settings, cpu_id, gpu_id):
+        """Предсказание для одной пары: Prediction со скалярами или None, если данных нет."""
+        prediction = self.predict(game_id, settings, cpu_id, gpu_id)
+        if not prediction.confidence:
+            return None
+        return Prediction(
+            int(prediction.min_fps),
+            int(prediction.avg_fps),
+            int(prediction.max_fps),
+            round(float(prediction.confidence), 2),
+            bool(prediction.measured),
+        )
+
+    def pair_table(self, cpu_id, gpu_id):
+        """
+        Предсказания пары процессор/видеокарта для всех игр и настроек с замерами.
+
+        Возвращает список словарей (game_id, settings, min_fps, avg_fps, max_fps,
+        confidence, measured). Таблица считается одним векторным вызовом и
+        кэшируется в общем кэше по паре и версии замеров и компонентов.
+        """
+        version = self._shared_version()
+        key = None
+        if version is not None:
+            fps_version, components_version = version
+            key = f'fps_table:{fps_version}:{components_version!r}:{cpu_id}:{gpu_id}'
+        if key is not None:
+            try:
+                table = cache.get(key)
+            except Exception:
+                table = None
+            if table is not None:
+                return table
+
+        groups, prediction = self.model().predict_groups(cpu_id, gpu_id)
+        table = [
+            {
+                'game_id': game_id,
+                'settings': settings,
+                'min_fps': int(prediction.min_fps[index]),
+                'avg_fps': int(prediction.avg_fps[index]),
+                'max_fps': int(prediction.max_fps[index]),
+                'confidence': round(float(prediction.confidence[index]), 2),
+                'measured': bool(prediction.measured[index]),
+            }
+            for index, (game_id, settings) in enumerate(groups)
+            if prediction.confidence[index]
+        ]
+        if key is not None:
+            try:
+                cache.set(key, table, FPS_TABLE_CACHE_TIMEOUT)
+            except Exception:
+                pass
+        return table
+
+    def invalidate(self):
+        """Сбрасывает модель в текущем процессе и увеличивает общую версию замеров."""
+        with self._lock:
+            self._model = None
+        try:
+            cache.incr(FPS_DATA_VERSION_KEY)
+        except ValueError:
+            cache.set(FPS_DATA_VERSION_KEY, 1, None)  # Ключа еще нет.
+        except Exception:
+            pass  # Кэш недоступен - другие процессы узнают об изменениях после перезапуска.
+
+
+fps_predictor = FPSPredictor()  # Общий для процесса предсказатель FPS.
@@ -0,0 +1,13 @@
+# fps_data/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import FPSData
+from .prediction import fps_predictor
+
+
+@receiver(post_save, sender=FPSData)
+@receiver(post_delete, sender=FPSData)
+def invalidate_predictor_on_fps_change(sender, instance, **kwargs):
+    """Замеры изменились - модель предсказания перестроится при следующем обращении."""
+    fps_predictor.invalidate()
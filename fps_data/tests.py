@@ -1,3 +1,136 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from components.models import CPU, GPU, Manufacturer
+from games.models import Game
+from .models import FPSData
+from .prediction import FPSModel, FPSPredictor, Prediction, fps_predictor
+
+CPU_SPEED = {1: 1.0, 2: 1.5, 3: 2.0}  # Множители FPS процессоров.
+GPU_SPEED = {11: 1.0, 12: 2.0, 13: 3.0}  # Множители FPS видеокарт.
+
+
+def measurement(cpu_id, gpu_id, base=40):
+    """Замер (min, avg, max), строго мультипликативный по вкладам процессора и видеокарты."""
+    avg = base * CPU_SPEED[cpu_id] * GPU_SPEED[gpu_id]
+    return round(avg * 0.75), round(avg), round(avg * 1.25)
+
+
+class FPSModelTests(SimpleTestCase):
+    """Модель FPS: точные замеры, оценка неизмеренных пар и отсутствие данных."""
+
+    unmeasured = (3, 13)  # Пара без замера: ее оценивает модель.
+
+    def setUp(self):
+        rows = [
+            (1, 'high', cpu_id, gpu_id, *measurement(cpu_id, gpu_id))
+            for cpu_id in CPU_SPEED
+            for gpu_id in GPU_SPEED
+            if (cpu_id, gpu_id) != self.unmeasured
+        ]
+        self.model = FPSModel(
+            rows,
+            [(cpu_id, 3.5, 8, 65) for cpu_id in CPU_SPEED],
+            [(gpu_id, 8, 2.0, 200) for gpu_id in GPU_SPEED],
+        )
+
+    def test_measured_pair_returns_exact_values(self):
+        prediction = self.model.predict(1, 'high', 2, 12)
+        self.assertTrue(prediction.measured)
+        self.assertEqual(prediction.confidence, 1.0)
+        self.assertEqual(
+            (prediction.min_fps, prediction.avg_fps, prediction.max_fps), measurement(2, 12)
+        )
+
+    def test_unmeasured_pair_is_estimated(self):
+        prediction = self.model.predict(1, 'high', *self.unmeasured)
+        expected = measurement(*self.unmeasured)
+        self.assertFalse(prediction.measured)
+        self.assertTrue(0 < prediction.confidence < 1)
+        for value, exact in zip((prediction.min_fps, prediction.avg_fps, prediction.max_fps), expected):
+            self.assertAlmostEqual(float(value), exact, delta=exact * 0.02)
+
+    def test_vectorized_prediction_matches_single_calls(self):
+        batch = self.model.predict(1, 'high', np.array([[1], [3]]), np.array([[11, 12, 13]]))
+        self.assertEqual(batch.avg_fps.shape, (2, 3))
+        self.assertEqual(batch.avg_fps[1, 2], self.model.predict(1, 'high', 3, 13).avg_fps)
+        self.assertTrue(batch.measured[0, 0])
+        self.assertFalse(batch.measured[1, 2])
+
+    def test_unknown_components_cannot_be_predicted(self):
+        for cpu_id, gpu_id in ((99, 11), (1, 99)):
+            prediction = self.model.predict(1, 'high', cpu_id, gpu_id)
+            self.assertEqual(prediction.confidence, 0)
+            self.assertFalse(prediction.measured)
+            self.assertTrue(np.isnan(prediction.avg_fps))
+
+    def test_settings_without_data_cannot_be_predicted(self):
+        for game_id, settings in ((1, 'ultra'), (2, 'high')):
+            prediction = self.model.predict(game_id, settings, 1, 11)
+            self.assertEqual(prediction.confidence, 0)
+            self.assertTrue(np.isnan(prediction.avg_fps))
+
+    def test_empty_model(self):
+        model = FPSModel([], [(1, 3.5, 8, 65)], [(11, 8, 2.0, 200)])
+        self.assertEqual(model.predict(1, 'high', 1, 11).confidence, 0)
+
+
+class FPSPredictorTests(TestCase):
+    """predict_one по замерам из базы и кэш модели в процессе."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cpu_maker = Manufacturer.objects.create(name='AMD', component_type='cpu')
+        gpu_maker = Manufacturer.objects.create(name='NVIDIA', component_type='gpu')
+        cls.cpu = CPU.objects.create(
+            manufacturer=cpu_maker, model='Ryzen 5', cores=6, frequency=3.7, tdp=65, socket='AM4',
+            price=Decimal('150.00'),
+        )
+        cls.gpu = GPU.objects.create(
+            manufacturer=gpu_maker, model='RTX 4060', memory=8, frequency=2.5, tdp=115,
+            interface='PCIe x16', price=Decimal('300.00'),
+        )
+        cls.game = Game.objects.create(title='Cyberpunk 2077', genre='RPG')
+        FPSData.objects.create(
+            game=cls.game, cpu=cls.cpu, gpu=cls.gpu, settings='high', min_fps=45, avg_fps=60, max_fps=75
+        )
+
+    def setUp(self):
+        cache.clear()
+        fps_predictor.invalidate()
+
+    def test_predict_one_returns_measurement(self):
+        self.assertEqual(
+            fps_predictor.predict_one(self.game.pk, 'high', self.cpu.pk, self.gpu.pk),
+            Prediction(45, 60, 75, 1.0, True),
+        )
+
+    def test_predict_one_without_data(self):
+        self.assertIsNone(fps_predictor.predict_one(self.game.pk, 'low', self.cpu.pk, self.gpu.pk))
+        self.assertIsNone(fps_predictor.predict_one(self.game.pk, 'high', self.cpu.pk + 100, self.gpu.pk))
+        self.assertIsNone(fps_predictor.predict_one(self.game.pk, 'high', self.cpu.pk, self.gpu.pk + 100))
+
+    def test_model_survives_concurrent_invalidate(self):
+        predictor = RacingPredictor()
+        model = predictor.model()
+        predictor.racing = True
+        self.assertIs(predictor.model(), model)  # Модель сброшена после проверки - вызов все равно ее возвращает.
+
+
+class RacingPredictor(FPSPredictor):
+    """Предсказатель, у которого invalidate() другого потока срабатывает сразу после проверки версии."""
+
+    racing = False
+
+    @property
+    def _version(self):
+        if self.racing:
+            self._model = None
+        return self.__dict__.get('_stored_version')
+
+    @_version.setter
+    def _version(self, value):
+        self.__dict__['_stored_version'] = value
@@ -1,3 +1,100 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from builds.models import Build
+from components.models import CPU, GPU, Manufacturer
+from fps_data.models import FPSData
+from fps_data.prediction import fps_predictor
+from .models import Game
+
+
+class FPSTableTests(TestCase):
+    """JSON с FPS сборки или пары процессор/видеокарта во всех играх."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cpu_maker = Manufacturer.objects.create(name='AMD', component_type='cpu')
+        gpu_maker = Manufacturer.objects.create(name='NVIDIA', component_type='gpu')
+        cls.cpu = CPU.objects.create(
+            manufacturer=cpu_maker, model='Ryzen 5', cores=6, frequency=3.7, tdp=65, socket='AM4',
+            price=Decimal('150.00'),
+        )
+        cls.gpu = GPU.objects.create(
+            manufacturer=gpu_maker, model='RTX 4060', memory=8, frequency=2.5, tdp=115,
+            interface='PCIe x16', price=Decimal('300.00'),
+        )
+        cls.game = Game.objects.create(title='Cyberpunk 2077', genre='RPG')
+        cls.other_game = Game.objects.create(title='Alan Wake 2', genre='Horror')  # Без замеров.
+        for settings, fps in (('high', (45, 60, 75)), ('low', (90, 120, 150))):
+            FPSData.objects.create(
+                game=cls.game, cpu=cls.cpu, gpu=cls.gpu, settings=settings,
+                min_fps=fps[0], avg_fps=fps[1], max_fps=fps[2],
+            )
+        user = User.objects.create_user('builder', password='password')
+        cls.build = Build.objects.create(user=user, cpu=cls.cpu, gpu=cls.gpu)
+        cls.empty_build = Build.objects.create(user=user, cpu=cls.cpu)  # Без видеокарты.
+
+    def setUp(self):
+        cache.clear()
+        fps_predictor.invalidate()
+
+    def get(self, **params):
+        return self.client.get('/games/fps_table/', params)
+
+    def test_pair_table(self):
+        response = self.get(cpu=self.cpu.pk, gpu=self.gpu.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                'cpu': self.cpu.pk,
+                'gpu': self.gpu.pk,
+                'games': [
+                    {'id': self.other_game.pk, 'title': 'Alan Wake 2', 'presets': []},
+                    {
+                        'id': self.game.pk,
+                        'title': 'Cyberpunk 2077',
+                        'presets': [  # Пресеты от низких к ультра.
+                            {
+                                'settings': 'low', 'label': 'Низкие', 'min_fps': 90, 'avg_fps': 120,
+                                'max_fps': 150, 'confidence': 1.0, 'measured': True,
+                            },
+                            {
+                                'settings': 'high', 'label': 'Высокие', 'min_fps': 45, 'avg_fps': 60,
+                                'max_fps': 75, 'confidence': 1.0, 'measured': True,
+                            },
+                        ],
+                    },
+                ],
+            },
+        )
+
+    def test_build_table_matches_pair_table(self):
+        response = self.get(build=self.build.pk)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.get(cpu=self.cpu.pk, gpu=self.gpu.pk).json())
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.get().status_code, 400)
+        self.assertEqual(self.get(cpu=self.cpu.pk).status_code, 400)
+        self.assertEqual(self.get(cpu='abc', gpu=self.gpu.pk).status_code, 400)
+        self.assertEqual(self.get(build='abc').status_code, 400)
+        self.assertEqual(self.get(build=self.empty_build.pk).status_code, 400)
+        self.assertEqual(self.get(build=self.build.pk + 100).status_code, 404)
+        self.assertEqual(self.client.post('/games/fps_table/', {'build': self.build.pk}).status_code, 405)
+
+    def test_table_is_cached(self):
+        first = self.get(build=self.build.pk).json()
+        with self.assertNumQueries(2), mock.patch.object(fps_predictor, 'model') as model:
+            self.assertEqual(self.get(build=self.build.pk).json(), first)  # Сборка и список игр.
+        model.assert_not_called()  # Таблица пары - из кэша, модель не нужна.
+
+        FPSData.objects.create(
+            game=self.other_game, cpu=self.cpu, gpu=self.gpu, settings='ultra', min_fps=30, avg_fps=40, max_fps=50
+        )  # Новые замеры сбрасывают таблицу.
+        games = self.get(build=self.build.pk).json()['games']
+        self.assertEqual([preset['avg_fps'] for preset in games[0]['presets']], [40])
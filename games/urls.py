@@ -9,5 +9,6 @@ urlpatterns = [
     path('', views.game_list, name='game_list'),
     path('<int:pk>/', views.game_detail, name='game_detail'),
     path('predict_fps/', views.predict_fps, name='predict_fps'), #Добавляем предсказания для FPS
+    path('fps_table/', views.fps_table, name='fps_table'), # FPS сборки во всех играх (JSON)
     path('<int:pk>/', views.game_detail, name='game_detail'),
 ]
\ No newline at end of file
@@ -1,12 +1,16 @@
 # games/views.py
 from django.core.cache import cache  # noqa: F401
+from django.http import JsonResponse
 from django.shortcuts import (
     get_object_or_404,
     render,
 )
+from django.views.decorators.http import require_GET
 
+from builds.models import Build
 from components.models import CPU, GPU
 from fps_data.models import FPSData
+from fps_data.prediction import fps_predictor
 from .models import Game
 
 
@@ -45,20 +49,17 @@ def predict_fps(request):
             gpu = get_object_or_404(GPU, pk=gpu_id)
             game = get_object_or_404(Game, pk=game_id)
 
-            # Ищем FPS в базе данных для данной комбинации компонентов
-            fps_data = FPSData.objects.get(
-                game=game, cpu=cpu, gpu=gpu, settings=settings
-            )
-            predicted_fps = f"{fps_data.min_fps} - {fps_data.max_fps} FPS"
-
-        except FPSData.DoesNotExist:
-            predicted_fps = "Нет данных для этой конфигурации."  # Вывод FPS
-            context = {
-                'error_message': "Нет данных для этой конфигурации.",
-                'cpus': CPU.objects.all(),
-                'gpus': GPU.objects.all(),
-                'games': Game.objects.all(),
-            }  # Отправляем сообщение об ошибке
+            # Замер для комбинации или оценка по замерам похожих компонентов
+            prediction = fps_predictor.predict_one(game.pk, settings, cpu.pk, gpu.pk)
+            if prediction is None:
+                predicted_fps = "Нет данных для этой конфигурации."  # Вывод FPS
+            elif prediction.measured:
+                predicted_fps = f"{prediction.min_fps} - {prediction.max_fps} FPS"
+            else:
+                predicted_fps = (
+                    f"{prediction.min_fps} - {prediction.max_fps} FPS "
+                    f"(оценка, достоверность {prediction.confidence:.0%})"
+                )  # Комбинация не измерялась - значение рассчитано моделью.
 
         except ValueError as e:
             context = {
@@ -96,3 +97,62 @@ def predict_fps(request):
         games = Game.objects.all()
         context = {'cpus': cpus, 'gpus': gpus, 'games': games}
         return render(request, 'games/fps_form.html', context)
+
+
+def _fps_table_pair(request):
+    """
+    Пара (cpu_id, gpu_id) из GET параметров build или cpu и gpu.
+
+    Возвращает (пара, None) или (None, JsonResponse с ошибкой).
+    """
+    build_id = request.GET.get('build')
+    try:
+        if build_id:
+            pair = Build.objects.filter(pk=int(build_id)).values_list('cpu_id', 'gpu_id').first()
+            if pair is None:
+                return None, JsonResponse({'error': 'Сборка не найдена'}, status=404)
+        else:
+            pair = (int(request.GET['cpu']), int(request.GET['gpu']))
+    except (KeyError, TypeError, ValueError):
+        return None, JsonResponse({'error': 'Укажите build или cpu и gpu'}, status=400)
+    if None in pair:
+        return None, JsonResponse({'error': 'В сборке не выбраны процессор и видеокарта'}, status=400)
+    return pair, None
+
+
+@require_GET
+def fps_table(request):
+    """
+    JSON с FPS для всех игр и настроек графики для сборки или пары процессор/видеокарта.
+
+    Предсказания берутся из таблицы пары в кэше (fps_data.prediction), поэтому
+    запрос выполняет не больше одного обращения к базе на сборку и одного на список игр.
+    """
+    pair, error = _fps_table_pair(request)
+    if error is not None:
+        return error
+    cpu_id, gpu_id = pair
+    labels = dict(FPSData._meta.get_field('settings').choices)  # Код настроек -> название.
+    order = {code: index for index, code in enumerate(labels)}  # Пресеты от низких к ультра.
+    presets = {}
+    rows = sorted(
+        fps_predictor.pair_table(cpu_id, gpu_id),
+        key=lambda row: order.get(row['settings'], len(order)),
+    )
+    for row in rows:
+        presets.setdefault(row['game_id'], []).append(
+            {
+                'settings': row['settings'],
+                'label': labels.get(row['settings'], row['settings']),
+                'min_fps': row['min_fps'],
+                'avg_fps': row['avg_fps'],
+                'max_fps': row['max_fps'],
+                'confidence': row['confidence'],
+                'measured': row['measured'],
+            }
+        )
+    games = [
+        {'id': game_id, 'title': title, 'presets': presets.get(game_id, [])}
+        for game_id, title in Game.objects.order_by('title').values_list('pk', 'title')
+    ]
+    return JsonResponse({'cpu': cpu_id, 'gpu': gpu_id, 'games': games})
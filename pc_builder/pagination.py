@@ -0,0 +1,178 @@
+# pc_builder/pagination.py
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import (
+    EmptyPage,
+    PageNotAnInteger,
+    Paginator,
+)
+from django.db.models import Q
+from django.utils.functional import SimpleLazyObject
+
+CURSOR_PARAM = 'cursor'  # GET параметр с курсором; его наличие включает курсорную пагинацию.
+
+
+class KeysetPage:
+    """
+    Страница курсорной (keyset) пагинации.
+
+    Повторяет ту часть интерфейса Page, которая нужна шаблонам (итерация,
+    has_next/has_previous), но вместо номеров страниц хранит курсоры.
+    """
+
+    is_keyset = True  # Признак для шаблонов: вместо номеров страниц показываем ссылки «назад/вперёд».
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor  # Курсор следующей страницы или None.
+        self.previous_cursor = previous_cursor  # Курсор предыдущей страницы или None.
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Курсорная пагинация без COUNT(*) и OFFSET.
+
+    ordering - поля сортировки (как в order_by, с '-' для убывания). Поля должны
+    быть локальными и NOT NULL; первичный ключ добавляется в конец автоматически,
+    чтобы ключ был уникальным. Курсор - base64 от JSON со значениями ключа
+    граничной записи и направлением перехода.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.model = queryset.model
+        pk_names = ('pk', 'id', self.model._meta.pk.name)
+        pk_ordering = [name for name in ordering if name.lstrip('-') in pk_names]
+        ordering = [name for name in ordering if name.lstrip('-') not in pk_names]
+        if pk_ordering:  # Сохраняем направление, заданное для первичного ключа.
+            descending = pk_ordering[0].startswith('-')
+        else:  # Иначе первичный ключ сортируется так же, как первое поле.
+            descending = bool(ordering) and ordering[0].startswith('-')
+        ordering.append('-pk' if descending else 'pk')  # Первичный ключ всегда идет последним.
+        self.ordering = ordering
+        self.fields = [
+            self.model._meta.pk if name.lstrip('-') == 'pk'
+            else self.model._meta.get_field(name.lstrip('-'))
+            for name in ordering
+        ]  # Поля модели для каждого элемента сортировки.
+
+    def _key(self, obj):
+        """Значения ключа сортировки для записи."""
+        return [field.value_to_string(obj) for field in self.fields]
+
+    def _encode(self, obj, direction):
+        payload = json.dumps({'k': self._key(obj), 'd': direction}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def _decode(self, cursor):
+        """Возвращает (значения ключа, направление) или None, если курсор некорректен."""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            raw_values, direction = payload['k'], payload['d']
+            if direction not in ('n', 'p') or len(raw_values) != len(self.fields):
+                return None
+            values = [
+                field.to_python(value) for field, value in zip(self.fields, raw_values)
+            ]  # Приводим строки из курсора обратно к типам полей (Decimal, datetime, ...).
+        except (binascii.Error, ValueError, TypeError, KeyError, ValidationError):
+            return None  # Подделанный или устаревший курсор - открываем первую страницу.
+        return values, direction
+
+    def normalize_cursor(self, cursor):
+        """
+        Курсор в канонической записи или '' для первой страницы.
+
+        Некорректный курсор открывает первую страницу, поэтому и в ключах кэша
+        он совпадает с пустым: произвольные строки из запроса не создают новых записей.
+        """
+        decoded = self._decode(cursor) if cursor else None
+        if decoded is None:
+            return ''
+        values, direction = decoded
+        boundary = self.model(**{field.attname: value for field, value in zip(self.fields, values)})
+        return self._encode(boundary, direction)
+
+    def lazy_page(self, cursor):
+        """KeysetPage, запрос которой выполняется при первом обращении (например, при промахе кэша фрагмента)."""
+        return SimpleLazyObject(lambda: self.page(cursor))
+
+    def _seek(self, values, backwards):
+        """Условие «записи строго после ключа» в направлении обхода."""
+        condition = Q()
+        equal = Q()
+        for name, field, value in zip(self.ordering, self.fields, values):
+            descending = name.startswith('-') != backwards
+            comparison = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{field.attname}__{comparison}': value})
+            equal &= Q(**{field.attname: value})
+        return condition  # (a > x) OR (a = x AND b > y) OR ... для ключа (a, b, ...).
+
+    @staticmethod
+    def _reverse(name):
+        return name[1:] if name.startswith('-') else f'-{name}'
+
+    def page(self, cursor):
+        """Возвращает KeysetPage для курсора (пустой курсор - первая страница)."""
+        decoded = self._decode(cursor) if cursor else None
+        backwards = decoded is not None and decoded[1] == 'p'
+        queryset = self.queryset
+        if decoded is not None:
+            queryset = queryset.filter(self._seek(decoded[0], backwards))
+        ordering = [self._reverse(name) for name in self.ordering] if backwards else self.ordering
+        rows = list(queryset.order_by(*ordering)[: self.per_page + 1])  # Лишняя запись показывает, есть ли продолжение.
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if backwards:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or backwards:
+                next_cursor = self._encode(rows[-1], 'n')
+            if decoded is not None and (has_more or not backwards):
+                previous_cursor = self._encode(rows[0], 'p')
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+
+def paginate(request, queryset, per_page, ordering, keyset=False):
+    """
+    Разбивает queryset на страницы.
+
+    По умолчанию используется обычный Paginator (номер страницы в ?page=).
+    Если keyset=True или в запросе есть ?cursor=, используется KeysetPaginator
+    с сортировкой ordering: без COUNT(*) и с поиском границы по индексу вместо
+    OFFSET. keyset=True - для длинных списков, где номера страниц не нужны.
+    """
+    if keyset or CURSOR_PARAM in request.GET:
+        return KeysetPaginator(queryset, per_page, ordering).page(
+            request.GET.get(CURSOR_PARAM)
+        )
+
+    paginator = Paginator(queryset.order_by(*ordering), per_page)
+    page = request.GET.get('page')  # Получаем номер текущей страницы из GET запроса.
+    try:
+        return paginator.page(page)
+    except PageNotAnInteger:  # Номер страницы не указан или не является числом.
+        return paginator.page(1)
+    except EmptyPage:  # Номер страницы больше количества страниц.
+        return paginator.page(paginator.num_pages)
@@ -56,7 +56,6 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    'django.middleware.cache.UpdateCacheMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'debug_toolbar.middleware.DebugToolbarMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -67,8 +66,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'django.middleware.locale.LocaleMiddleware',
-    'django.middleware.cache.FetchFromCacheMiddleware',
-]
+]  # Кэширование страниц целиком отключено: компоненты кэшируются фрагментами (FRAGMENT_CACHE_SECONDS)
 
 ROOT_URLCONF = 'pc_builder.urls'
 
@@ -115,6 +113,8 @@ DATABASES = {
     }
 }
 
+BENCHMARK_DATABASE = False  # True только в настройках отдельной базы для замеров: seed_benchmark и run_benchmark пишут в базу по умолчанию.
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -224,6 +224,7 @@ CACHE_ENABLED = True  # Читаем из .env
 CACHE_MIDDLEWARE_ALIAS = "default"  # Используем кэш по умолчанию
 CACHE_MIDDLEWARE_SECONDS =0 # Кэшировать на 15 минут (в секундах)
 CACHE_MIDDLEWARE_KEY_PREFIX = ""  # Префикс для ключей кэша # Префикс для ключей кэшаючей кэша
+FRAGMENT_CACHE_SECONDS = 60 * 60 * 24  # Время жизни фрагментов карточек и страниц компонентов; ключи версионируются
 
 """
 Скрипт для создания базы данных MS SQL Server.
@@ -2,7 +2,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import Balance, Transaction  # Импортируем модели Balance и Transaction
+from .models import Balance, OrderNotification, OutgoingEmail, Transaction  # Импортируем модели Balance, Transaction, очередь писем и журнал уведомлений
 
 class BalanceAdmin(admin.ModelAdmin):
     list_display = ('user', 'balance', 'last_update')
@@ -13,6 +13,17 @@ class TransactionAdmin(admin.ModelAdmin):
     list_filter = ('transaction_type', 'timestamp')
     search_fields = ('user__username', 'user__email')
 
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'recipients')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+
+class OrderNotificationAdmin(admin.ModelAdmin):
+    list_display = ('order', 'status', 'created_at')
+    list_filter = ('status',)
+    raw_id_fields = ('order', 'email')
+
 # Define an inline admin descriptor for UserProfile model
 # which acts a bit like a singleton
 class UserAdmin(BaseUserAdmin):
@@ -30,3 +41,5 @@ admin.site.register(User, UserAdmin)
 
 admin.site.register(Balance, BalanceAdmin)  # Регистрируем модель Balance с настройками
 admin.site.register(Transaction, TransactionAdmin)  # Регистрируем модель Transaction с настройками
+admin.site.register(OutgoingEmail, OutgoingEmailAdmin)  # Регистрируем очередь исходящей почты
+admin.site.register(OrderNotification, OrderNotificationAdmin)  # Регистрируем журнал уведомлений о заказах
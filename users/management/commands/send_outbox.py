@@ -0,0 +1,20 @@
+# users/management/commands/send_outbox.py
+from django.core.management.base import BaseCommand
+
+from users.outbox import BATCH_SIZE, WORKER_INTERVAL, run_worker
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди исходящей почты (фоновый обработчик).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Один проход по очереди и выход.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Писем за один проход.')
+        parser.add_argument('--interval', type=float, default=WORKER_INTERVAL, help='Пауза при пустой очереди (секунды).')
+
+    def handle(self, *args, **options):
+        run_worker(
+            batch_size=options['batch_size'],
+            interval=options['interval'],
+            once=options['once'],
+        )
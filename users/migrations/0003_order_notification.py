@@ -0,0 +1,46 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def record_sent_notifications(apps, schema_editor):
+    """Заказы в статусах delivered/delivering уже получали письма со страницы профиля."""
+    Order = apps.get_model('builds', 'Order')
+    OrderNotification = apps.get_model('users', 'OrderNotification')
+    OrderNotification.objects.bulk_create(
+        [
+            OrderNotification(order_id=order_id, status=status)
+            for order_id, status in Order.objects.filter(
+                status__in=['delivered', 'delivering']
+            ).values_list('pk', 'status')
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('builds', '0020_remove_cartitem_price_alter_build_total_price'),
+        ('users', '0002_outgoing_email'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(max_length=50, verbose_name='Статус заказа')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Дата уведомления')),
+                ('email', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='users.outgoingemail', verbose_name='Письмо')),
+                ('order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='builds.order', verbose_name='Заказ')),
+            ],
+            options={
+                'verbose_name': 'Уведомление о заказе',
+                'verbose_name_plural': 'Уведомления о заказах',
+                'unique_together': {('order', 'status')},
+            },
+        ),
+        migrations.RunPython(record_sent_notifications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.12 on 2026-10-19 00:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_order_notification'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-timestamp'], name='users_transaction_user_idx'),
+        ),
+    ]
@@ -37,3 +37,54 @@ class Transaction(models.Model):
         verbose_name = "Транзакция"
         verbose_name_plural = "Транзакции"
         ordering = ['-timestamp']  # Сортировка по дате от новых к старым
+        indexes = [
+            models.Index(fields=['user', '-timestamp'], name='users_transaction_user_idx'),
+        ]  # История транзакций пользователя в профиле
+
+class OutgoingEmail(models.Model):
+    """Письмо в очереди исходящей почты (отправляется фоновым обработчиком)."""
+    STATUS_CHOICES = [
+        ('pending', 'Ожидает отправки'),
+        ('sent', 'Отправлено'),
+        ('failed', 'Ошибка отправки'),
+    ]
+
+    subject = models.CharField(max_length=255, verbose_name="Тема")
+    body = models.TextField(verbose_name="Текст письма")
+    html_body = models.TextField(blank=True, null=True, verbose_name="HTML версия")
+    from_email = models.CharField(max_length=255, verbose_name="Отправитель")
+    recipients = models.TextField(verbose_name="Получатели")  # Адреса получателей, по одному на строку
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Статус")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Попытки отправки")
+    next_attempt_at = models.DateTimeField(verbose_name="Следующая попытка")  # Время, не раньше которого письмо можно отправлять
+    last_error = models.TextField(blank=True, null=True, verbose_name="Последняя ошибка")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата создания")
+    sent_at = models.DateTimeField(blank=True, null=True, verbose_name="Дата отправки")
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipients.replace(chr(10), ', ')} ({self.get_status_display()})"
+
+    def recipient_list(self):
+        return [address for address in self.recipients.splitlines() if address]
+
+    class Meta:
+        verbose_name = "Исходящее письмо"
+        verbose_name_plural = "Исходящие письма"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='users_outbox_due_idx'),
+        ]  # Выборка писем, которые пора отправить
+
+class OrderNotification(models.Model):
+    """Запись журнала уведомлений: письмо о статусе заказа уже поставлено в очередь."""
+    order = models.ForeignKey('builds.Order', on_delete=models.CASCADE, related_name='notifications', verbose_name="Заказ")
+    status = models.CharField(max_length=50, verbose_name="Статус заказа")  # Статус, о котором уведомили покупателя
+    email = models.ForeignKey(OutgoingEmail, on_delete=models.SET_NULL, blank=True, null=True, verbose_name="Письмо")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Дата уведомления")
+
+    def __str__(self):
+        return f"Заказ #{self.order_id}: {self.status}"
+
+    class Meta:
+        verbose_name = "Уведомление о заказе"
+        verbose_name_plural = "Уведомления о заказах"
+        unique_together = ('order', 'status')  # Об одном статусе заказа уведомляем только один раз
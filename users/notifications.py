@@ -0,0 +1,28 @@
+# users/notifications.py
+from django.db import IntegrityError, transaction
+
+from .models import OrderNotification
+from .utils import send_order_status_email
+
+NOTIFY_STATUSES = ('delivered', 'delivering')  # Статусы заказа, о которых покупатель получает письмо
+
+
+def notify_order_status(order):
+    """
+    Уведомляет покупателя о текущем статусе заказа, если это еще не сделано.
+
+    Журнал OrderNotification уникален по (order, status), поэтому повторный вызов
+    для того же статуса (в том числе параллельный) письмо не отправляет.
+    Возвращает True, если письмо поставлено в очередь.
+    """
+    if order.status not in NOTIFY_STATUSES:
+        return False
+    try:
+        with transaction.atomic():  # Запись в журнал и письмо сохраняются вместе
+            notification = OrderNotification.objects.create(order=order, status=order.status)
+            notification.email = send_order_status_email(order)
+            if notification.email is not None:
+                notification.save(update_fields=['email'])
+    except IntegrityError:
+        return False  # Уведомление об этом статусе уже было
+    return True
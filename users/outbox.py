@@ -0,0 +1,142 @@
+# users/outbox.py
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 50  # Писем за один проход обработчика
+MAX_ATTEMPTS = 8  # После стольких неудачных попыток письмо помечается как failed
+RETRY_BASE_DELAY = 30  # Задержка перед первой повторной попыткой (секунды), дальше удваивается
+RETRY_MAX_DELAY = 60 * 60  # Максимальная задержка между попытками (секунды)
+WORKER_INTERVAL = 5  # Пауза обработчика, когда очередь пуста (секунды)
+CLAIM_TIMEOUT = timedelta(minutes=10)  # На это время взятые письма скрыты от других обработчиков
+
+
+def enqueue_email(subject, message, recipient_list, from_email=None, html_message=None):
+    """
+    Ставит письмо в очередь вместо отправки по SMTP внутри запроса.
+
+    Внутри transaction.atomic() письмо сохраняется вместе с транзакцией:
+    при откате оно не будет отправлено.
+    """
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=message,
+        html_body=html_message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        recipients='\n'.join(recipient_list),
+        next_attempt_at=timezone.now(),
+    )
+
+
+def retry_delay(attempts):
+    """Задержка перед следующей попыткой: экспоненциальный рост с ограничением сверху."""
+    return timedelta(seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY))
+
+
+def _build_message(email, connection):
+    message = EmailMultiAlternatives(
+        email.subject,
+        email.body,
+        email.from_email,
+        email.recipient_list(),
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, 'text/html')
+    return message
+
+
+def _claim_batch(batch_size):
+    """
+    Забирает пакет писем, которые пора отправить, в короткой транзакции.
+
+    Письма блокируются select_for_update(skip_locked=True), и их следующая попытка
+    откладывается на CLAIM_TIMEOUT: после фиксации другие обработчики их не выберут,
+    а письма упавшего обработчика снова станут доступны по истечении этого времени.
+    """
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at', 'pk')[:batch_size]
+        )
+        if batch:
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                next_attempt_at=timezone.now() + CLAIM_TIMEOUT
+            )
+    return batch
+
+
+def send_pending(batch_size=BATCH_SIZE):
+    """
+    Отправляет пакет писем, которые пора отправить, через одно SMTP соединение.
+
+    Пакет забирается в отдельной транзакции (_claim_batch), поэтому несколько
+    обработчиков не отправят одно письмо дважды, а SMTP не держит блокировки строк.
+    Результат каждого письма сохраняется сразу после отправки. Возвращает (отправлено, ошибок).
+    """
+    sent = failed = 0
+    batch = _claim_batch(batch_size)
+    if not batch:
+        return sent, failed
+
+    connection = get_connection()
+    try:
+        connection.open()  # Одно соединение на весь пакет
+    except Exception as e:
+        logger.warning(f"Не удалось подключиться к SMTP серверу: {e}")
+        for email in batch:
+            _schedule_retry(email, e)
+        return sent, len(batch)
+
+    try:
+        for email in batch:
+            try:
+                _build_message(email, connection).send()
+            except Exception as e:
+                logger.warning(f"Ошибка отправки письма #{email.pk}: {e}")
+                _schedule_retry(email, e)
+                failed += 1
+            else:
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.attempts += 1
+                email.last_error = None
+                email.save(update_fields=['status', 'sent_at', 'attempts', 'last_error'])
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
+
+
+def _schedule_retry(email, error):
+    """Откладывает письмо с экспоненциальной задержкой или помечает его как failed."""
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= MAX_ATTEMPTS:
+        email.status = 'failed'
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def run_worker(batch_size=BATCH_SIZE, interval=WORKER_INTERVAL, once=False):
+    """Обрабатывает очередь, пока не будет остановлен (или один проход при once=True)."""
+    while True:
+        close_old_connections()  # Долгий процесс: закрываем соединения с истекшим CONN_MAX_AGE и оборванные
+        sent, failed = send_pending(batch_size)
+        if sent or failed:
+            logger.info(f"Очередь писем: отправлено {sent}, ошибок {failed}")
+        if once:
+            return
+        if sent + failed < batch_size:
+            time.sleep(interval)  # Очередь разобрана - ждем новых писем
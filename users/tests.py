@@ -1,3 +1,155 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core import mail
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+
+from builds.models import Order
+from . import outbox
+from .models import OrderNotification, OutgoingEmail
+from .notifications import notify_order_status
+from .outbox import MAX_ATTEMPTS, enqueue_email, retry_delay, run_worker, send_pending
+
+
+def queue_emails(count):
+    return [enqueue_email(f'Письмо {index}', 'Текст', [f'user{index}@example.com']) for index in range(count)]
+
+
+class OutboxTests(TestCase):
+    """Очередь исходящей почты: отправка, повторные попытки и разбор пакетов несколькими обработчиками."""
+
+    def test_send_pending_marks_sent(self):
+        email, = queue_emails(1)
+        self.assertEqual(send_pending(), (1, 0))
+        self.assertEqual([message.to for message in mail.outbox], [['user0@example.com']])
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('sent', 1))
+        self.assertEqual(send_pending(), (0, 0))  # Повторно не отправляется.
+
+    def test_retry_delay_grows_to_limit(self):
+        self.assertEqual(
+            [retry_delay(attempts) for attempts in (1, 2, 3)],
+            [timedelta(seconds=30), timedelta(seconds=60), timedelta(seconds=120)],
+        )
+        self.assertEqual(retry_delay(20), timedelta(hours=1))
+
+    def test_failed_send_is_retried_with_backoff(self):
+        email, = queue_emails(1)
+        with mock.patch.object(outbox.EmailMultiAlternatives, 'send', side_effect=OSError('timeout')), \
+                self.assertLogs('users.outbox', 'WARNING'):
+            self.assertEqual(send_pending(), (0, 1))
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts, email.last_error), ('pending', 1, 'timeout'))
+            self.assertAlmostEqual(
+                email.next_attempt_at, timezone.now() + retry_delay(1), delta=timedelta(seconds=5)
+            )
+            self.assertEqual(send_pending(), (0, 0))  # Время следующей попытки еще не пришло.
+
+            for _ in range(MAX_ATTEMPTS - 1):
+                OutgoingEmail.objects.filter(pk=email.pk).update(next_attempt_at=timezone.now())
+                send_pending()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', MAX_ATTEMPTS))
+
+    def test_connection_error_retries_whole_batch(self):
+        queue_emails(2)
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=OSError('refused')), \
+                self.assertLogs('users.outbox', 'WARNING'):
+            self.assertEqual(send_pending(), (0, 2))
+        self.assertEqual(list(OutgoingEmail.objects.values_list('attempts', flat=True)), [1, 1])
+        self.assertEqual(mail.outbox, [])
+
+    def test_second_worker_skips_claimed_batch(self):
+        queue_emails(3)
+        results = []
+
+        def send_while_other_worker_runs(message):
+            if not results:
+                results.append(None)  # Второй обработчик запускается один раз - во время отправки первого пакета.
+                results[0] = send_pending()
+            mail.outbox.append(message)
+
+        with mock.patch.object(outbox.EmailMultiAlternatives, 'send', autospec=True,
+                               side_effect=send_while_other_worker_runs):
+            self.assertEqual(send_pending(batch_size=2), (2, 0))
+        self.assertEqual(results, [(1, 0)])  # Второму досталось только письмо вне пакета первого.
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(OutgoingEmail.objects.filter(status='sent').count(), 3)
+
+    def test_worker_refreshes_connections(self):
+        with mock.patch.object(outbox, 'close_old_connections') as close_old_connections:
+            run_worker(once=True)
+        close_old_connections.assert_called_once_with()
+
+
+class OrderNotificationTests(TestCase):
+    """Письмо о статусе заказа ставится в очередь один раз на статус."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('buyer', 'buyer@example.com', 'password')
+        cls.staff = User.objects.create_user('employee', 'employee@example.com', 'password', is_staff=True)
+        cls.order = Order.objects.create(
+            user=cls.user, email=cls.user.email, delivery_option='pickup', payment_method='cash',
+            total_amount=Decimal('250.00'), order_date=timezone.now(),
+        )
+
+    def set_status(self, status):
+        self.order.status = status
+        self.order.save()
+        return notify_order_status(self.order)
+
+    def test_same_status_queues_one_email(self):
+        self.assertTrue(self.set_status('delivered'))
+        self.assertFalse(self.set_status('delivered'))
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+        notification = OrderNotification.objects.get()
+        self.assertEqual((notification.status, notification.email.recipients), ('delivered', 'buyer@example.com'))
+
+    def test_new_status_queues_another_email(self):
+        self.assertTrue(self.set_status('delivering'))
+        self.assertTrue(self.set_status('delivered'))
+        self.assertFalse(self.set_status('delivering'))  # Возврат к прежнему статусу - письмо уже было.
+        self.assertEqual(
+            list(OrderNotification.objects.order_by('pk').values_list('status', flat=True)), ['delivering', 'delivered']
+        )
+        self.assertEqual(OutgoingEmail.objects.count(), 2)
+
+    def test_other_statuses_are_not_notified(self):
+        self.assertFalse(self.set_status('confirmed'))
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_employee_status_update_notifies_once(self):
+        self.client.force_login(self.staff)
+        url = f'/builds/employee/orders/{self.order.pk}/update/'
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, {'status': 'delivered'}).status_code, 302)
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+
+
+@skipUnlessDBFeature('has_select_for_update_skip_locked')
+class OutboxLockingTests(TransactionTestCase):
+    """Письма, заблокированные другим обработчиком, пропускаются, а не ждут снятия блокировки."""
+
+    def test_locked_rows_are_skipped(self):
+        locked, free = queue_emails(2)
+        results = []
+
+        def other_worker():
+            try:
+                results.append(send_pending())
+            finally:
+                connection.close()  # У потока свое соединение.
+
+        with transaction.atomic():
+            OutgoingEmail.objects.select_for_update().filter(pk=locked.pk).get()
+            worker = threading.Thread(target=other_worker)
+            worker.start()
+            worker.join(timeout=30)
+        self.assertEqual(results, [(1, 0)])
+        self.assertEqual([message.to for message in mail.outbox], [free.recipient_list()])
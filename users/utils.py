@@ -1,9 +1,15 @@
 # users/utils.py
 # users/utils.py
+import logging
+
 from django.conf import settings
-from django.core.mail import send_mail
 from django.template.loader import render_to_string
 
+from .outbox import enqueue_email
+
+logger = logging.getLogger(__name__)
+
+
 def send_order_status_email(order):
     """Отправляет email уведомление об изменении статуса заказа."""
     try:
@@ -31,16 +37,15 @@ def send_order_status_email(order):
                 f"Спасибо за ваш заказ!"
             )
 
-        send_mail(
+        return enqueue_email(
             subject,
             message,
-            settings.DEFAULT_FROM_EMAIL,
             [order.email],
-            fail_silently=False,
-        )
-        print(f"DEBUG: Email sent to {order.email} for order #{order.pk}, status: {order.status}")
-    except Exception as e:
-        print(f"DEBUG: Error sending email to {order.email} for order #{order.pk}: {e}")
+            from_email=settings.DEFAULT_FROM_EMAIL,
+        )  # Письмо отправит обработчик очереди (manage.py send_outbox)
+    except Exception:
+        logger.exception(f"Не удалось поставить в очередь письмо для {order.email} о заказе #{order.pk}")
+        return None
 
 def send_registration_email(user):
     """Отправляет письмо с информацией о регистрации."""
@@ -51,7 +56,7 @@ def send_registration_email(user):
     from_email = settings.DEFAULT_FROM_EMAIL
     to_email = [user.email]
 
-    send_mail(subject, message, from_email, to_email, html_message=html_message)
+    enqueue_email(subject, message, to_email, from_email=from_email, html_message=html_message)
 
 def send_password_reset_email(user, new_password):
     """Отправляет письмо с новым паролем."""
@@ -62,4 +67,4 @@ def send_password_reset_email(user, new_password):
     from_email = settings.DEFAULT_FROM_EMAIL
     to_email = [user.email]
 
-    send_mail(subject, message, from_email, to_email, html_message=html_message)
+    enqueue_email(subject, message, to_email, from_email=from_email, html_message=html_message)
@@ -5,18 +5,18 @@ from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404, redirect, render
 from django.db import transaction
 from django.conf import settings
-from django.core.mail import send_mail
 import secrets
 import string
 import random
 from .forms import CustomUserCreationForm, TopUpBalanceForm, ConfirmTopUpForm
 from .models import Balance, Transaction
+from .outbox import enqueue_email
 from .utils import (
     send_registration_email,
     send_password_reset_email,
-    send_order_status_email,
 )
-from builds.models import Build, CartItem, Order, OrderItem, ReturnRequest
+from builds.cart import load_cart
+from builds.models import Build, Order, OrderItem, ReturnRequest
 from decimal import Decimal
 from django.db.models import Q
 from .forms import PasswordResetForm 
@@ -25,18 +25,20 @@ from .forms import PasswordResetForm
 def profile(request):
     """Отображает профиль пользователя, его сборки, корзину и заказы."""
     user = request.user
-    builds = Build.objects.filter(user=user)
-    cart_items = CartItem.objects.filter(user=user)
-    orders = Order.objects.filter(user=user).order_by('-order_date')
-    return_requests = ReturnRequest.objects.filter(user=user)
+    builds = Build.objects.filter(user=user).select_related('cpu__manufacturer')
+    cart_items = load_cart(user).items  # Корзина со всеми товарами (расчет кэшируется)
+    orders = (
+        Order.objects.filter(user=user)
+        .order_by('-order_date')
+        .prefetch_related('orderitem_set__returnrequest_set')
+    )  # Позиции заказов и запросы на возврат загружаются двумя запросами на всю страницу
+    return_requests = ReturnRequest.objects.filter(user=user).select_related('order_item')
 
     balance, created = Balance.objects.get_or_create(user=user)
     transactions = Transaction.objects.filter(user=user).order_by('-timestamp')
 
-    for order in orders:
-        if order.status in ['delivered', 'delivering']:
-            send_order_status_email(order)
-
+    # Страница профиля только читает данные: уведомления о статусе заказа
+    # отправляются при смене статуса (users.notifications.notify_order_status).
     context = {
         'user': user,
         'builds': builds,
@@ -168,9 +170,7 @@ def top_up_balance(request):
             request.session['user_id'] = request.user.id
 
             print(f"Код подтверждения: {confirmation_code}")
-            print("Собираюсь отправить email...")
             send_confirmation_email(email, amount, confirmation_code)
-            print("Email отправлен (или должна была быть отправка)")
 
             messages.info(request, "На вашу электронную почту отправлен код подтверждения. Пожалуйста, введите его.")
             return redirect('users:confirm_top_up')
@@ -234,10 +234,8 @@ def confirm_top_up(request):
     
 def send_confirmation_email(user_email, amount, confirmation_code):
     """Отправляет email с кодом подтверждения."""
-    print(f"send_confirmation_email вызвана с user_email={user_email}, amount={amount}, confirmation_code={confirmation_code}")
     subject = 'Подтверждение пополнения баланса'
     message = f'Для подтверждения пополнения баланса на сумму {amount}, пожалуйста, введите следующий код: {confirmation_code}'
     email_from = settings.EMAIL_HOST_USER
     recipient_list = [user_email]
-    send_mail(subject, message, email_from, recipient_list)
-    print("Письмо отправлено (или должна была быть отправка)")
+    enqueue_email(subject, message, recipient_list, from_email=email_from)  # Письмо отправит обработчик очереди